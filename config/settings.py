@@ -14,6 +14,18 @@ SYNC_FOLDER_PATH = os.getenv("SYNC_FOLDER_PATH", "")
 # Processing Configuration
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
+# OCR engine: "tesseract" (default, CPU) or "paddle" (PaddleOCR, uses GPU when available)
+OCR_ENGINE = os.getenv("OCR_ENGINE", "tesseract")
+
+# OCR result cache keyed by PDF content hash. Off unless set: cached text holds client
+# names and case IDs, so the directory should be one only this service can read
+OCR_CACHE_DIR = os.path.expanduser(os.getenv("OCR_CACHE_DIR", ""))
+
+# Pre-OCR filter: PDFs whose filename matches this regex (case-insensitive), or that are
+# larger than SKIP_MAX_FILE_MB, are ignored without text extraction. Empty / 0 disables.
+SKIP_FILENAME_PATTERN = os.getenv("SKIP_FILENAME_PATTERN", "")
+SKIP_MAX_FILE_MB = float(os.getenv("SKIP_MAX_FILE_MB", "0"))
+
 # Document Processing Patterns
 AR_ACK_SIGNATURE = "According to our records, you have been designated as the authorized representative in the above case. As the authorized representative, you have the ability to receive correspondence, submit additional evidence, argue factual or legal issues and exercise claimant rights pertaining to the above claim."
 
@@ -0,0 +1,22 @@
+"""
+Root pytest configuration: keeps log output from test runs out of the project's logs/ directory
+"""
+
+import os
+
+import pytest
+
+from src.logger import LOGS_DIR_ENV
+
+
+@pytest.fixture(scope="session", autouse=True)
+def test_logs_dir(tmp_path_factory):
+    """Point every SWNALogger, LogAnalyzer and LogRotator default at a temporary logs directory."""
+    logs_dir = str(tmp_path_factory.mktemp("logs"))
+    original = os.environ.get(LOGS_DIR_ENV)
+    os.environ[LOGS_DIR_ENV] = logs_dir
+    yield logs_dir
+    if original is None:
+        os.environ.pop(LOGS_DIR_ENV, None)
+    else:
+        os.environ[LOGS_DIR_ENV] = original
@@ -4,21 +4,23 @@ SWNA AR Acknowledgment Automation Service
 Main entry point for the automated document processing system.
 """
 
+import argparse
 import sys
 import signal
 import time
 from config.settings import validate_config, LOG_LEVEL
 from src.logger import SWNALogger
 from src.folder_monitor import FolderMonitor
-from src.processing_pipeline import ProcessingPipeline
+from src.processing_pipeline import ProcessingPipeline, EXTRACTION_WORKERS
 
 class SWNAAutomationService:
     """Main service class for SWNA automation."""
     
-    def __init__(self):
+    def __init__(self, extraction_workers=EXTRACTION_WORKERS):
         self.logger = SWNALogger(LOG_LEVEL)
-        self.pipeline = ProcessingPipeline(self.logger)
-        self.folder_monitor = FolderMonitor(self.pipeline.process_file, self.logger)
+        self.pipeline = ProcessingPipeline(self.logger, extraction_workers=extraction_workers)
+        self.folder_monitor = FolderMonitor(self.pipeline.process_file, self.logger,
+                                            batch_callback=self.pipeline.process_files)
         self.running = False
     
     def start(self):
@@ -70,6 +72,7 @@ class SWNAAutomationService:
         
         # Stop folder monitoring
         self.folder_monitor.stop_monitoring()
+        self.pipeline.shutdown()
         
         self.running = False
         self.logger.log_shutdown()
@@ -81,11 +84,16 @@ class SWNAAutomationService:
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="SWNA AR Acknowledgment Automation Service")
+    parser.add_argument("--workers", type=int, default=EXTRACTION_WORKERS,
+                        help=f"Processes used to extract text from files found at startup (default: {EXTRACTION_WORKERS})")
+    args = parser.parse_args()
+    
     print("SWNA AR Acknowledgment Automation Service")
     print("=" * 50)
     
     # Create and start service
-    service = SWNAAutomationService()
+    service = SWNAAutomationService(extraction_workers=args.workers)
     
     try:
         success = service.start()
@@ -13,6 +13,7 @@ setup(
         "pytesseract>=0.3.10",
         "Pillow>=10.0.0",
         "pdf2image>=1.16.3",
+        "pypdfium2>=4.0.0",
     ],
     python_requires=">=3.8",
     entry_points={
@@ -1,7 +1,26 @@
+import threading
+import time
 from pyairtable import Table
-from datetime import datetime
 from config.settings import AIRTABLE_PAT, AIRTABLE_BASE_ID, CLIENTS_TABLE_NAME
 from src.logger import SWNALogger
+from src.file_manager import today_str
+
+AIRTABLE_LOOKUP_BATCH_SIZE = 10  # Client names per batched Airtable search (keeps formulas short)
+AIRTABLE_UPDATE_BATCH_SIZE = 10  # Records per Airtable update request (API maximum)
+AIRTABLE_UPDATE_BATCH_WAIT = 0.05  # Seconds AirtableUpdateBatcher waits for more updates to join a request
+
+# Today's "Rcvd AR Ack" Log entry, rebuilt only when the date string changes
+_log_entry_cache = (None, None)  # (date, entry), rebound as a whole so worker threads read a matching pair
+
+def ar_ack_log_entry():
+    """Return the Log line recorded for an AR Ack filed today."""
+    global _log_entry_cache
+    current_date = today_str()
+    cached_date, entry = _log_entry_cache
+    if cached_date != current_date:
+        entry = f"Rcvd AR Ack. Filed Away. {current_date} AI"
+        _log_entry_cache = (current_date, entry)
+    return entry
 
 class AirtableClient:
     """Handle all Airtable operations for client matching and record updates."""
@@ -50,9 +69,52 @@ class AirtableClient:
             self.logger.error(f"Airtable client search failed: {str(e)}")
             return None
     
-    def update_client_record(self, record_id, case_id):
+    def find_clients_by_names(self, client_names_formatted):
+        """
+        Find several client records with one Airtable search per batch of names,
+        using the same exact-then-prefix matching as find_client_by_name.
+        Returns {name: record} for names with exactly one match; other names are
+        left out so callers can fall back to find_client_by_name for them.
+        """
+        found = {}
+        try:
+            names = list(dict.fromkeys(client_names_formatted))
+            self.logger.info(f"Searching Airtable for {len(names)} clients")
+            
+            for start in range(0, len(names), AIRTABLE_LOOKUP_BATCH_SIZE):
+                batch = names[start:start + AIRTABLE_LOOKUP_BATCH_SIZE]
+                
+                exact_formula = ", ".join(f"{{Name}} = '{name}'" for name in batch)
+                records = self.table.all(formula=f"OR({exact_formula})")
+                matches = {name: [r for r in records if r.get('fields', {}).get('Name') == name]
+                           for name in batch}
+                
+                # Prefix match (names with an SSN suffix) only for names without an exact match
+                missing = [name for name in batch if not matches[name]]
+                if missing:
+                    prefix_formula = ", ".join(f"LEFT({{Name}}, {len(name)}) = '{name}'" for name in missing)
+                    records = self.table.all(formula=f"OR({prefix_formula})")
+                    for name in missing:
+                        matches[name] = [r for r in records
+                                         if r.get('fields', {}).get('Name', '').startswith(name)]
+                
+                for name in batch:
+                    if len(matches[name]) == 1:
+                        found[name] = matches[name][0]
+                        self.logger.log_client_matched(name, found[name]['id'])
+            
+            return found
+            
+        except Exception as e:
+            self.logger.error(f"Airtable batch client search failed: {str(e)}")
+            return found
+    
+    def update_client_record(self, record_id, case_id, before_image=None):
         """
         Update client record with Case ID and add log entry.
+        If before_image is a dict, it is filled with the record's Case ID and Log
+        as read just before the update, and the 'Log entry' line the update
+        prepended, for revert_client_record_update.
         Returns True if successful, False otherwise.
         """
         try:
@@ -62,33 +124,9 @@ class AirtableClient:
             # Get current record to check existing data
             current_record = self.table.get(record_id)
             current_fields = current_record.get('fields', {})
-            
-            # Prepare update data
-            current_date = datetime.now().strftime("%m.%d.%y")
-            log_entry = f"Rcvd AR Ack. Filed Away. {current_date} AI"
-            
-            # Get existing log content
-            existing_log = current_fields.get('Log', '')
-            
-            # Prepend new log entry to the beginning
-            if existing_log:
-                new_log = f"{log_entry}\n{existing_log}"
-            else:
-                new_log = log_entry
-            
-            # Check if Case ID already exists and matches
-            existing_case_id = current_fields.get('Case ID', '')
-            if existing_case_id == case_id:
-                # Case ID is correct, but still update Log field
-                update_data = {'Log': new_log}
-                self.logger.info(f"Case ID {case_id} already correct for record {record_id} - updating Log only")
-            else:
-                # Case ID needs updating, update both fields
-                update_data = {
-                    'Case ID': case_id,
-                    'Log': new_log
-                }
-                self.logger.info(f"Updating both Case ID and Log for record {record_id}")
+            update_data = self._build_update_fields(record_id, case_id, current_fields)
+            if before_image is not None:
+                self._fill_before_image(before_image, current_fields, update_data)
             
             # Log what will be updated
             self.logger.info(f"Updating Airtable record {record_id} with: {update_data}")
@@ -103,6 +141,121 @@ class AirtableClient:
             self.logger.error(f"Airtable record update failed for {record_id}: {str(e)}")
             return False
     
+    @staticmethod
+    def _fill_before_image(before_image, current_fields, update_data):
+        before_image['Case ID'] = current_fields.get('Case ID')
+        before_image['Log'] = current_fields.get('Log')
+        before_image['Log entry'] = update_data['Log'].split('\n', 1)[0]
+    
+    def _build_update_fields(self, record_id, case_id, current_fields):
+        """Fields to write for a received AR Ack: the Case ID if it changed, and the Log with today's entry prepended."""
+        # Prepare update data
+        log_entry = ar_ack_log_entry()
+        
+        # Get existing log content
+        existing_log = current_fields.get('Log', '')
+        
+        # Prepend new log entry to the beginning
+        if existing_log:
+            new_log = f"{log_entry}\n{existing_log}"
+        else:
+            new_log = log_entry
+        
+        # Check if Case ID already exists and matches
+        existing_case_id = current_fields.get('Case ID', '')
+        if existing_case_id == case_id:
+            # Case ID is correct, but still update Log field
+            self.logger.info(f"Case ID {case_id} already correct for record {record_id} - updating Log only")
+            return {'Log': new_log}
+        
+        # Case ID needs updating, update both fields
+        self.logger.info(f"Updating both Case ID and Log for record {record_id}")
+        return {
+            'Case ID': case_id,
+            'Log': new_log
+        }
+    
+    def update_client_records(self, updates):
+        """
+        Update several client records with one Airtable read and one write per 10 records.
+        updates is a list of (record_id, case_id, before_image) as for update_client_record,
+        with distinct record ids (two updates to one record would overwrite each other's Log).
+        Returns a list of True/False, one per update.
+        """
+        try:
+            record_ids = [record_id for record_id, _, _ in updates]
+            if len(set(record_ids)) != len(record_ids):
+                raise ValueError("Duplicate record ids in one batched update")
+            self.logger.info(f"Getting {len(record_ids)} current records")
+            
+            ids_formula = ", ".join(f"RECORD_ID() = '{record_id}'" for record_id in record_ids)
+            current = {record['id']: record.get('fields', {})
+                       for record in self.table.all(formula=f"OR({ids_formula})")}
+            
+            results = [False] * len(updates)
+            batch = []
+            for i, (record_id, case_id, before_image) in enumerate(updates):
+                current_fields = current.get(record_id)
+                if current_fields is None:
+                    self.logger.error(f"Airtable record not found for update: {record_id}")
+                    continue
+                update_data = self._build_update_fields(record_id, case_id, current_fields)
+                if before_image is not None:
+                    self._fill_before_image(before_image, current_fields, update_data)
+                self.logger.info(f"Updating Airtable record {record_id} with: {update_data}")
+                batch.append((i, {'id': record_id, 'fields': update_data}))
+            
+            for start in range(0, len(batch), AIRTABLE_UPDATE_BATCH_SIZE):
+                chunk = batch[start:start + AIRTABLE_UPDATE_BATCH_SIZE]
+                self.table.batch_update([record for _, record in chunk])
+                for i, record in chunk:
+                    results[i] = True
+                    self.logger.log_airtable_updated(record['id'], updates[i][1])
+            
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Airtable batch record update failed: {str(e)}")
+            return [False] * len(updates)
+    
+    def revert_client_record_update(self, record_id, case_id, before_image):
+        """
+        Undo one update_client_record call (compensating a rolled-back operation).
+        Only this run's change is removed: its line is dropped from the Log, and the
+        Case ID is reset only while it still holds the value this run wrote, so edits
+        made to the record since then are kept. Returns True if successful, False otherwise.
+        """
+        try:
+            current_fields = self.table.get(record_id).get('fields', {})
+            restore = {}
+            
+            previous_case_id = before_image.get('Case ID')
+            if previous_case_id != case_id:
+                if current_fields.get('Case ID') == case_id:
+                    restore['Case ID'] = previous_case_id
+                else:
+                    self.logger.warning(f"Case ID of record {record_id} changed since the update - leaving it as is")
+            
+            log_lines = (current_fields.get('Log') or '').split('\n')
+            log_entry = before_image.get('Log entry')
+            if log_entry in log_lines:
+                log_lines.remove(log_entry)
+                restore['Log'] = '\n'.join(log_lines)
+            else:
+                self.logger.warning(f"Log of record {record_id} no longer has the entry '{log_entry}' - leaving it as is")
+            
+            if not restore:
+                self.logger.warning(f"Nothing of the update left to restore on record {record_id}")
+                return True
+            
+            self.logger.info(f"Restoring Airtable record {record_id} fields: {list(restore)}")
+            self.table.update(record_id, restore)
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Airtable record restore failed for {record_id}: {str(e)}")
+            return False
+    
     def validate_client_match(self, extracted_client_name, airtable_record):
         """
         Validate that the extracted client name matches the Airtable record.
@@ -152,4 +305,76 @@ class AirtableClient:
                 
         except Exception as e:
             self.logger.error(f"Client processing failed: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+
+class _PendingUpdate:
+    __slots__ = ("record_id", "case_id", "before_image", "result", "done")
+    
+    def __init__(self, record_id, case_id, before_image):
+        self.record_id = record_id
+        self.case_id = case_id
+        self.before_image = before_image
+        self.result = False
+        self.done = False
+
+class AirtableUpdateBatcher:
+    """
+    Coalesces update_client_record calls made at about the same time from several
+    threads into AirtableClient.update_client_records requests of up to 10 records.
+    Each caller still blocks until its own record is written and gets its own result.
+    """
+    
+    def __init__(self, airtable_client, wait=AIRTABLE_UPDATE_BATCH_WAIT):
+        self.airtable_client = airtable_client
+        self.wait = wait
+        self._cv = threading.Condition()
+        self._pending = []
+        self._leading = False  # A caller is collecting and sending the next request
+    
+    def update_client_record(self, record_id, case_id, before_image=None):
+        """Queue one update, then either send a batch (first caller) or wait for it."""
+        item = _PendingUpdate(record_id, case_id, before_image)
+        with self._cv:
+            self._pending.append(item)
+            self._cv.notify_all()
+            
+            while not item.done:
+                if self._leading:
+                    self._cv.wait()
+                    continue
+                
+                self._leading = True
+                deadline = time.monotonic() + self.wait
+                while len(self._pending) < AIRTABLE_UPDATE_BATCH_SIZE:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cv.wait(remaining)
+                
+                # One record per request: a second update to it must see the first one's Log
+                batch, ids = [], set()
+                for pending in self._pending:
+                    if len(batch) == AIRTABLE_UPDATE_BATCH_SIZE:
+                        break
+                    if pending.record_id not in ids:
+                        ids.add(pending.record_id)
+                        batch.append(pending)
+                self._pending = [pending for pending in self._pending if pending not in batch]
+                
+                self._cv.release()
+                try:
+                    results = self.airtable_client.update_client_records(
+                        [(pending.record_id, pending.case_id, pending.before_image) for pending in batch])
+                except Exception:
+                    # Never leave the other callers waiting on a request that will not finish
+                    results = [False] * len(batch)
+                finally:
+                    self._cv.acquire()
+                
+                for pending, success in zip(batch, results):
+                    pending.result = success
+                    pending.done = True
+                self._leading = False
+                self._cv.notify_all()
+        
+        return item.result
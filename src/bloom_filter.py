@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Minimal Bloom filter for SWNA Automation log archives
+Lets queries skip archived log files that cannot contain a given key.
+"""
+
+import hashlib
+import math
+import struct
+
+_MAGIC = b"SWBF"
+_HEADER = struct.Struct("<4sII")  # magic, bit count, hash count
+
+class BloomFilter:
+    """Fixed-size Bloom filter using Kirsch-Mitzenmacher double hashing over one blake2b digest."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        num_bits = int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_bits = max(num_bits, 8)
+        self.num_hashes = max(int(round(self.num_bits / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str):
+        """Add a key to the filter."""
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        """False means definitely absent; True means probably present."""
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def save(self, file_path: str):
+        """Write the filter to disk."""
+        with open(file_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self.num_bits, self.num_hashes))
+            f.write(self.bits)
+
+    @classmethod
+    def load(cls, file_path: str) -> "BloomFilter":
+        """Read a filter written by save(). Raises ValueError if the file is not a filter."""
+        with open(file_path, "rb") as f:
+            data = f.read()
+
+        if len(data) < _HEADER.size:
+            raise ValueError(f"Not a Bloom filter file: {file_path}")
+        magic, num_bits, num_hashes = _HEADER.unpack_from(data)
+        if (magic != _MAGIC or num_bits == 0 or num_hashes == 0
+                or len(data) - _HEADER.size != (num_bits + 7) // 8):
+            raise ValueError(f"Not a Bloom filter file: {file_path}")
+
+        bloom = cls.__new__(cls)
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.bits = bytearray(data[_HEADER.size:])
+        return bloom
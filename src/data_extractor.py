@@ -3,6 +3,24 @@ from config.settings import CASE_ID_PATTERN, CLIENT_NAME_PATTERN
 from src.logger import SWNALogger
 from src.document_classifier import DocumentType
 
+# Compiled once at import so the first document does not pay for it
+_CASE_ID_RE = re.compile(CASE_ID_PATTERN, re.IGNORECASE)
+_CLIENT_NAME_RE = re.compile(CLIENT_NAME_PATTERN, re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+_COMPANY_SUFFIX_RE = re.compile(r'\s+(LLC|INC|CORP|LTD)\.?$', re.IGNORECASE)
+
+# Common company/address patterns that indicate the client name has ended
+_NAME_STOP_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\bTYLER\b',
+    r'\bBAILEY\b',
+    r'\bSOUTHWEST\b',
+    r'\bNUCLEAR\b',
+    r'\bADVOCATES\b',
+    r'\b\d{2,5}\s+[A-Z]',  # Address numbers like "39 CRESCENT"
+    r'\b[A-Z]{2}\s+\d{5}\b',  # State + ZIP like "NV 89002"
+    r'\b\d{5}$',  # ZIP codes at end
+)]
+
 class DataExtractor:
     """Extract Case ID and Client Name from various document types."""
     
@@ -18,7 +36,7 @@ class DataExtractor:
             return None
         
         try:
-            match = re.search(CASE_ID_PATTERN, text, re.IGNORECASE)
+            match = _CASE_ID_RE.search(text)
             if match:
                 case_id = match.group(1).strip()
                 # Validate that it's numeric only
@@ -44,37 +62,26 @@ class DataExtractor:
             return None
         
         try:
-            match = re.search(CLIENT_NAME_PATTERN, text, re.IGNORECASE)
+            match = _CLIENT_NAME_RE.search(text)
             if match:
                 full_extracted = match.group(1).strip()
                 self.logger.debug(f"[NAME_EXTRACT] Full extracted text: '{full_extracted}'")
                 
                 # Clean up the name (remove extra spaces, normalize)
-                client_name = re.sub(r'\s+', ' ', full_extracted)
+                client_name = _WHITESPACE_RE.sub(' ', full_extracted)
                 
                 # Stop at the first occurrence of common company/address patterns that indicate the name has ended
-                stop_patterns = [
-                    r'\bTYLER\b',
-                    r'\bBAILEY\b', 
-                    r'\bSOUTHWEST\b',
-                    r'\bNUCLEAR\b',
-                    r'\bADVOCATES\b',
-                    r'\b\d{2,5}\s+[A-Z]',  # Address numbers like "39 CRESCENT"
-                    r'\b[A-Z]{2}\s+\d{5}\b',  # State + ZIP like "NV 89002"
-                    r'\b\d{5}$',  # ZIP codes at end
-                ]
-                
                 original_name = client_name
-                for pattern in stop_patterns:
-                    match_result = re.search(pattern, client_name, re.IGNORECASE)
+                for pattern in _NAME_STOP_PATTERNS:
+                    match_result = pattern.search(client_name)
                     if match_result:
                         # Take everything before the matched pattern
                         client_name = client_name[:match_result.start()].strip()
-                        self.logger.debug(f"[NAME_EXTRACT] Stopped at pattern '{pattern}': '{original_name}' -> '{client_name}'")
+                        self.logger.debug(f"[NAME_EXTRACT] Stopped at pattern '{pattern.pattern}': '{original_name}' -> '{client_name}'")
                         break
                 
                 # Additional cleanup: remove common prefixes/suffixes that might slip through
-                client_name = re.sub(r'\s+(LLC|INC|CORP|LTD)\.?$', '', client_name, flags=re.IGNORECASE).strip()
+                client_name = _COMPANY_SUFFIX_RE.sub('', client_name).strip()
                 
                 self.logger.debug(f"[NAME_EXTRACT] Final cleaned name: '{client_name}'")
                 
@@ -5,10 +5,83 @@ Identifies document types based on OCR text content and extracts relevant data.
 """
 
 import re
+import threading
 from enum import Enum
 from typing import Dict, Any, Tuple, Optional
 from dataclasses import dataclass
 
+try:
+    # Optional SIMD multi-literal scanner used to skip classifiers that cannot match
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Junk-text thresholds - OCR output below these is not worth running the classifier chain on
+MIN_CLASSIFIABLE_CHARS = 50
+MIN_ALPHA_CHARS = 30        # Letters required within the first ALPHA_SAMPLE_CHARS characters
+ALPHA_SAMPLE_CHARS = 200
+
+# Indicator phrases (lowercase) - any one match triggers the corresponding classifier's secondary checks
+_AR_INDICATORS = (
+    'acknowledgment',
+    'ar ack',
+    'received your claim',
+    'claim has been received',
+)
+_CLAIM_INDICATORS = (
+    'claim acknowledgment',
+    'acknowledge receipt of your claim',
+    'claim has been received',
+    'received your claim for benefits',
+)
+_OBJECTION_INDICATORS = (
+    'letter of objection',
+    'object to the district office',
+    'recommended decision of denial',
+    'objections will be carefully considered',
+)
+_EE11A_INDICATORS = (
+    'ee-11a',
+    'ee 11a',
+    'part e',
+    'whole body impairment',
+    'physician must be certified',
+)
+_IH_INDICATORS = (
+    'industrial hygienist',
+    'industrial hygiene',
+    'exposure levels',
+    'toxins',
+)
+
+# Gate literals per classifier method - a method can only return a result when at
+# least one of its literals occurs in the lowercased text (empty = never matches)
+_CLASSIFIER_GATES = {
+    '_classify_ar_ack': _AR_INDICATORS,
+    '_classify_claim_ack': _CLAIM_INDICATORS,
+    '_classify_withdraw_ack': ('withdrawing your claim',),
+    '_classify_address_change_ack': ('change of address request',),
+    '_classify_objection_rd_deny_ack': _OBJECTION_INDICATORS,
+    '_classify_remand_order': ('remand order',),
+    '_classify_en16': ('en-16', 'en 16'),
+    '_classify_ee11a': ('part e',),
+    '_classify_wh_rfi': ('work history',),
+    '_classify_ih_notice': _IH_INDICATORS,
+    '_classify_rfi_post_ih': ('industrial hygiene',),
+    '_classify_rd_decisions': ('recommended decision',),
+    '_classify_fd_decisions': ('final decision',),
+    '_classify_impairment_docs': ('impairment evaluation', 'received notification', 'final notice',
+                                  'schedule your impairment appt', 'deferral status'),
+    '_classify_ir_docs': (),
+    '_classify_dr_ir_report': ('impairment',),
+    '_classify_en20_rejection': ('en-20',),
+    '_classify_wl': ('wage loss', 'wl'),
+    '_classify_orau': ('orau', 'dose reconstruction'),
+    '_classify_niosh_waiver': ('niosh',),
+    '_classify_dme_hhc': ('durable medical equipment', 'dme', 'home healthcare', 'hhc'),
+    '_classify_lmn_request': ('letter of medical necessity', 'lmn'),
+}
+
 class DocumentType(Enum):
     """Enumeration of all document types that can be processed."""
     # Keep AR_ACK first for backward compatibility
@@ -66,24 +139,121 @@ class DocumentClassifier:
         
         # Compile regex patterns for efficiency
         self._compile_patterns()
+        
+        # Classification methods in order of specificity (built once, reused per document)
+        self._classification_methods = (
+            self._classify_ar_ack,
+            self._classify_claim_ack,
+            self._classify_withdraw_ack,
+            self._classify_address_change_ack,
+            self._classify_objection_rd_deny_ack,
+            self._classify_remand_order,
+            self._classify_en16,
+            self._classify_ee11a,
+            self._classify_wh_rfi,
+            self._classify_ih_notice,
+            self._classify_rfi_post_ih,
+            self._classify_rd_decisions,
+            self._classify_fd_decisions,
+            self._classify_impairment_docs,
+            self._classify_ir_docs,
+            self._classify_dr_ir_report,
+            self._classify_en20_rejection,
+            self._classify_wl,
+            self._classify_orau,
+            self._classify_niosh_waiver,
+            self._classify_dme_hhc,
+            self._classify_lmn_request,
+        )
+        self._method_gates = tuple(frozenset(_CLASSIFIER_GATES[method.__name__])
+                                   for method in self._classification_methods)
+        
+        # Single-pass literal scanner (None when hyperscan is not installed)
+        self._gate_literals, self._gate_database = self._compile_gate_database()
+        # A Hyperscan scratch serves one scan at a time, so each thread scans with its own
+        self._gate_scratch = threading.local()
     
     def _compile_patterns(self):
         """Compile regex patterns for document classification."""
+        # OCR artifact cleanup pattern
+        self.junk_pattern = re.compile(r'[^\w\s\.\-\$\%\(\)\,\:]')
+        
+        # Patterns below run against the pre-lowercased text, so they are
+        # written in lowercase and compiled case-sensitively
+        
         # Money patterns
-        self.money_pattern = re.compile(r'\$(\d{1,3})k', re.IGNORECASE)
-        self.money_range_pattern = re.compile(r'\$(\d{1,3}),?(\d{3})', re.IGNORECASE)
+        self.money_pattern = re.compile(r'\$(\d{1,3})k')
+        self.money_range_pattern = re.compile(r'\$(\d{1,3}),?(\d{3})')
         
         # Percentage patterns
-        self.percentage_pattern = re.compile(r'(\d{1,3})%', re.IGNORECASE)
+        self.percentage_pattern = re.compile(r'(\d{1,3})%')
         
         # Case ID patterns
-        self.case_id_pattern = re.compile(r'case.{0,5}(\d{8})', re.IGNORECASE)
+        self.case_id_pattern = re.compile(r'case.{0,5}(\d{8})')
         
-        # Doctor name patterns
+        # Medical condition patterns
+        self.condition_pattern = re.compile(r'\b(copd|osa|bcc|pf|asbestosis|mesothelioma|lung cancer)\b')
+        
+        # Doctor name patterns - runs on the original text because the
+        # captured name is used verbatim in generated filenames
         self.doctor_pattern = re.compile(r'Dr\.?\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)', re.IGNORECASE)
         
-        # Medical condition patterns
-        self.condition_pattern = re.compile(r'\b(COPD|OSA|BCC|PF|asbestosis|mesothelioma|lung cancer)\b', re.IGNORECASE)
+        # Indicator alternations - one regex scan instead of a Python-level any() per phrase.
+        # Two-phrase checks (withdraw, address change, remand, NIOSH) intentionally stay as
+        # short-circuited `in` tests: a combined lookahead regex measured 10-20x slower.
+        self.ar_indicator_pattern = self._compile_indicators(_AR_INDICATORS)
+        self.claim_indicator_pattern = self._compile_indicators(_CLAIM_INDICATORS)
+        self.objection_indicator_pattern = self._compile_indicators(_OBJECTION_INDICATORS)
+        self.ee11a_indicator_pattern = self._compile_indicators(_EE11A_INDICATORS)
+        self.ih_indicator_pattern = self._compile_indicators(_IH_INDICATORS)
+    
+    def _compile_gate_database(self):
+        """
+        Compile every classifier gate literal into one Hyperscan database.
+        Returns (literals, database) or (None, None) if Hyperscan is unavailable.
+        """
+        if hyperscan is None:
+            return None, None
+        
+        literals = sorted({literal for gate in _CLASSIFIER_GATES.values() for literal in gate})
+        try:
+            database = hyperscan.Database()
+            database.compile(
+                expressions=[re.escape(literal).encode('utf-8') for literal in literals],
+                ids=list(range(len(literals))),
+                elements=len(literals),
+                flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(literals),
+            )
+            return literals, database
+        except Exception as e:
+            if self.logger:
+                self.logger.debug(f"Hyperscan database compile failed, using full classifier chain: {str(e)}")
+            return None, None
+    
+    def _scan_gate_literals(self, text_lower: str) -> Optional[frozenset]:
+        """Return the set of gate literals present in the text, or None if no scanner is available."""
+        if self._gate_database is None:
+            return None
+        
+        hits = set()
+        
+        def on_match(literal_id, start, end, flags, context):
+            hits.add(self._gate_literals[literal_id])
+        
+        self._gate_database.scan(text_lower.encode('utf-8'), match_event_handler=on_match,
+                                 scratch=self._thread_gate_scratch())
+        return frozenset(hits)
+    
+    def _thread_gate_scratch(self):
+        """This thread's Hyperscan scratch for the gate database, allocated on first use."""
+        scratch = getattr(self._gate_scratch, 'scratch', None)
+        if scratch is None:
+            scratch = self._gate_scratch.scratch = hyperscan.Scratch(self._gate_database)
+        return scratch
+    
+    def _compile_indicators(self, indicators):
+        """Compile a list of literal indicator phrases into a single alternation regex."""
+        return re.compile('|'.join(map(re.escape, indicators)))
     
     def classify_document(self, text: str) -> DocumentClassificationResult:
         """
@@ -97,35 +267,22 @@ class DocumentClassifier:
         
         # Clean and normalize text for better matching
         text_clean = self._clean_text(text)
+        
+        # Bail out early on garbage OCR output (blank scans, noise, stray marks)
+        if self._is_junk_text(text_clean):
+            return DocumentClassificationResult(
+                DocumentType.UNKNOWN, 0.0, {}, "Text too short or not enough letters to classify"
+            )
+        
         text_lower = text_clean.lower()
         
-        # Try to classify document (in order of specificity)
-        classification_methods = [
-            self._classify_ar_ack,
-            self._classify_claim_ack,
-            self._classify_withdraw_ack,
-            self._classify_address_change_ack,
-            self._classify_objection_rd_deny_ack,
-            self._classify_remand_order,
-            self._classify_en16,
-            self._classify_ee11a,
-            self._classify_wh_rfi,
-            self._classify_ih_notice,
-            self._classify_rfi_post_ih,
-            self._classify_rd_decisions,
-            self._classify_fd_decisions,
-            self._classify_impairment_docs,
-            self._classify_ir_docs,
-            self._classify_dr_ir_report,
-            self._classify_en20_rejection,
-            self._classify_wl,
-            self._classify_orau,
-            self._classify_niosh_waiver,
-            self._classify_dme_hhc,
-            self._classify_lmn_request,
-        ]
+        # One scan for every gate literal; classifiers whose gate did not fire are skipped
+        gate_hits = self._scan_gate_literals(text_lower)
         
-        for method in classification_methods:
+        # Try to classify document (in order of specificity)
+        for method, gate in zip(self._classification_methods, self._method_gates):
+            if gate_hits is not None and gate.isdisjoint(gate_hits):
+                continue
             result = method(text_clean, text_lower)
             if result and result.document_type != DocumentType.UNKNOWN:
                 return result
@@ -135,30 +292,38 @@ class DocumentClassifier:
             DocumentType.UNKNOWN, 0.0, {}, "No matching patterns found"
         )
     
+    def _is_junk_text(self, text_clean: str) -> bool:
+        """Check whether cleaned text is too short or too non-alphabetic to classify."""
+        if len(text_clean) < MIN_CLASSIFIABLE_CHARS:
+            return True
+        
+        alpha_count = sum(1 for c in text_clean[:ALPHA_SAMPLE_CHARS] if c.isalpha())
+        return alpha_count < MIN_ALPHA_CHARS
+    
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text for better pattern matching."""
         # Remove extra whitespace and normalize line breaks
-        text = re.sub(r'\s+', ' ', text)
+        text = " ".join(text.split())
         # Remove common OCR artifacts
-        text = re.sub(r'[^\w\s\.\-\$\%\(\)\,\:]', ' ', text)
+        text = self.junk_pattern.sub(' ', text)
         return text.strip()
     
-    def _extract_common_data(self, text: str) -> Dict[str, Any]:
+    def _extract_common_data(self, text: str, text_lower: str) -> Dict[str, Any]:
         """Extract commonly needed data from text."""
         data = {}
         
         # Extract case ID
-        case_match = self.case_id_pattern.search(text)
+        case_match = self.case_id_pattern.search(text_lower)
         if case_match:
             data['case_id'] = case_match.group(1)
         
         # Extract monetary amounts
-        money_matches = self.money_pattern.findall(text)
+        money_matches = self.money_pattern.findall(text_lower)
         if money_matches:
             data['amounts'] = [f"${amount}k" for amount in money_matches]
         
         # Extract percentages
-        percentage_matches = self.percentage_pattern.findall(text)
+        percentage_matches = self.percentage_pattern.findall(text_lower)
         if percentage_matches:
             data['percentages'] = [f"{pct}%" for pct in percentage_matches]
         
@@ -168,7 +333,7 @@ class DocumentClassifier:
             data['doctors'] = doctor_matches
         
         # Extract medical conditions
-        condition_matches = self.condition_pattern.findall(text)
+        condition_matches = self.condition_pattern.findall(text_lower)
         if condition_matches:
             data['conditions'] = [cond.upper() for cond in condition_matches]
         
@@ -176,16 +341,9 @@ class DocumentClassifier:
     
     def _classify_ar_ack(self, text: str, text_lower: str) -> Optional[DocumentClassificationResult]:
         """Classify AR acknowledgment documents."""
-        ar_indicators = [
-            'acknowledgment',
-            'ar ack',
-            'received your claim',
-            'claim has been received'
-        ]
-        
-        if any(indicator in text_lower for indicator in ar_indicators):
+        if self.ar_indicator_pattern.search(text_lower):
             if 'asbestos' in text_lower or 'exposure' in text_lower:
-                data = self._extract_common_data(text)
+                data = self._extract_common_data(text, text_lower)
                 return DocumentClassificationResult(
                     DocumentType.AR_ACK, 0.9, data, "AR acknowledgment patterns found"
                 )
@@ -194,17 +352,10 @@ class DocumentClassifier:
     
     def _classify_claim_ack(self, text: str, text_lower: str) -> Optional[DocumentClassificationResult]:
         """Classify claim acknowledgment documents."""
-        claim_indicators = [
-            'claim acknowledgment',
-            'acknowledge receipt of your claim',
-            'claim has been received',
-            'received your claim for benefits'
-        ]
-        
-        if any(indicator in text_lower for indicator in claim_indicators):
+        if self.claim_indicator_pattern.search(text_lower):
             # Distinguish from AR Ack by looking for specific claim language
             if 'claim for benefits' in text_lower or 'claim acknowledgment' in text_lower:
-                data = self._extract_common_data(text)
+                data = self._extract_common_data(text, text_lower)
                 return DocumentClassificationResult(
                     DocumentType.CLAIM_ACK, 0.9, data, "Claim acknowledgment patterns found"
                 )
@@ -214,7 +365,7 @@ class DocumentClassifier:
     def _classify_withdraw_ack(self, text: str, text_lower: str) -> Optional[DocumentClassificationResult]:
         """Classify withdrawal acknowledgment documents."""
         if 'withdrawing your claim' in text_lower and 'acknowledging that withdrawal' in text_lower:
-            data = self._extract_common_data(text)
+            data = self._extract_common_data(text, text_lower)
             return DocumentClassificationResult(
                 DocumentType.WITHDRAW_ACK, 0.95, data, "Withdrawal acknowledgment language found"
             )
@@ -224,7 +375,7 @@ class DocumentClassifier:
     def _classify_address_change_ack(self, text: str, text_lower: str) -> Optional[DocumentClassificationResult]:
         """Classify address change acknowledgment documents."""
         if 'change of address request' in text_lower and 'acknowledge receipt' in text_lower:
-            data = self._extract_common_data(text)
+            data = self._extract_common_data(text, text_lower)
             return DocumentClassificationResult(
                 DocumentType.ADDRESS_CHANGE_ACK, 0.95, data, "Address change acknowledgment found"
             )
@@ -233,16 +384,9 @@ class DocumentClassifier:
     
     def _classify_objection_rd_deny_ack(self, text: str, text_lower: str) -> Optional[DocumentClassificationResult]:
         """Classify objection to RD denial acknowledgment documents."""
-        objection_indicators = [
-            'letter of objection',
-            'object to the district office',
-            'recommended decision of denial',
-            'objections will be carefully considered'
-        ]
-        
-        if any(indicator in text_lower for indicator in objection_indicators):
+        if self.objection_indicator_pattern.search(text_lower):
             if 'received within 20 days' in text_lower:
-                data = self._extract_common_data(text)
+                data = self._extract_common_data(text, text_lower)
                 return DocumentClassificationResult(
                     DocumentType.OBJECTION_RD_DENY_ACK, 0.9, data, "Objection to RD denial patterns found"
                 )
@@ -252,7 +396,7 @@ class DocumentClassifier:
     def _classify_remand_order(self, text: str, text_lower: str) -> Optional[DocumentClassificationResult]:
         """Classify remand order documents."""
         if 'remand order' in text_lower and 'file is being returned' in text_lower:
-            data = self._extract_common_data(text)
+            data = self._extract_common_data(text, text_lower)
             return DocumentClassificationResult(
                 DocumentType.REMAND_ORDER, 0.95, data, "Remand order language found"
             )
@@ -262,7 +406,7 @@ class DocumentClassifier:
     def _classify_en16(self, text: str, text_lower: str) -> Optional[DocumentClassificationResult]:
         """Classify EN-16 form documents."""
         if 'en-16' in text_lower or 'en 16' in text_lower:
-            data = self._extract_common_data(text)
+            data = self._extract_common_data(text, text_lower)
             return DocumentClassificationResult(
                 DocumentType.EN16, 0.95, data, "EN-16 form identifier found"
             )
@@ -271,17 +415,9 @@ class DocumentClassifier:
     
     def _classify_ee11a(self, text: str, text_lower: str) -> Optional[DocumentClassificationResult]:
         """Classify EE-11A form documents."""
-        ee11a_indicators = [
-            'ee-11a',
-            'ee 11a',
-            'part e',
-            'whole body impairment',
-            'physician must be certified'
-        ]
-        
-        if any(indicator in text_lower for indicator in ee11a_indicators):
+        if self.ee11a_indicator_pattern.search(text_lower):
             if 'impairment' in text_lower and 'part e' in text_lower:
-                data = self._extract_common_data(text)
+                data = self._extract_common_data(text, text_lower)
                 return DocumentClassificationResult(
                     DocumentType.EE11A, 0.9, data, "EE-11A form patterns found"
                 )
@@ -290,14 +426,8 @@ class DocumentClassifier:
     
     def _classify_wh_rfi(self, text: str, text_lower: str) -> Optional[DocumentClassificationResult]:
         """Classify work history RFI documents."""
-        wh_indicators = [
-            'work history',
-            'employment history',
-            'request for information'
-        ]
-        
         if 'work history' in text_lower and 'request' in text_lower:
-            data = self._extract_common_data(text)
+            data = self._extract_common_data(text, text_lower)
             return DocumentClassificationResult(
                 DocumentType.WH_RFI, 0.85, data, "Work history RFI patterns found"
             )
@@ -306,16 +436,9 @@ class DocumentClassifier:
     
     def _classify_ih_notice(self, text: str, text_lower: str) -> Optional[DocumentClassificationResult]:
         """Classify industrial hygienist notice documents."""
-        ih_indicators = [
-            'industrial hygienist',
-            'industrial hygiene',
-            'exposure levels',
-            'toxins'
-        ]
-        
-        if any(indicator in text_lower for indicator in ih_indicators):
+        if self.ih_indicator_pattern.search(text_lower):
             if 'work history' in text_lower and 'verified' in text_lower:
-                data = self._extract_common_data(text)
+                data = self._extract_common_data(text, text_lower)
                 return DocumentClassificationResult(
                     DocumentType.IH_NOTICE, 0.85, data, "Industrial hygienist notice patterns found"
                 )
@@ -326,7 +449,7 @@ class DocumentClassifier:
         """Classify RFI post-IH documents."""
         if 'industrial hygiene' in text_lower and 'request for information' in text_lower:
             if 'dr.' in text_lower or 'doctor' in text_lower:
-                data = self._extract_common_data(text)
+                data = self._extract_common_data(text, text_lower)
                 return DocumentClassificationResult(
                     DocumentType.RFI_POST_IH, 0.85, data, "RFI post-IH patterns found"
                 )
@@ -338,7 +461,7 @@ class DocumentClassifier:
         if 'recommended decision' not in text_lower:
             return None
         
-        data = self._extract_common_data(text)
+        data = self._extract_common_data(text, text_lower)
         
         # Check for denial
         if 'denial' in text_lower or 'deny' in text_lower:
@@ -372,7 +495,7 @@ class DocumentClassifier:
         if 'final decision' not in text_lower:
             return None
         
-        data = self._extract_common_data(text)
+        data = self._extract_common_data(text, text_lower)
         
         # Check for denial
         if 'denial' in text_lower or 'deny' in text_lower:
@@ -415,7 +538,7 @@ class DocumentClassifier:
     
     def _classify_impairment_docs(self, text: str, text_lower: str) -> Optional[DocumentClassificationResult]:
         """Classify impairment-related documents."""
-        data = self._extract_common_data(text)
+        data = self._extract_common_data(text, text_lower)
         
         # Impairment Authorization
         if 'impairment evaluation' in text_lower and 'identified you' in text_lower:
@@ -464,7 +587,7 @@ class DocumentClassifier:
     
     def _classify_dr_ir_report(self, text: str, text_lower: str) -> Optional[DocumentClassificationResult]:
         """Classify doctor IR report documents."""
-        data = self._extract_common_data(text)
+        data = self._extract_common_data(text, text_lower)
         
         # Look for doctor name + percentage + impairment context
         doctors = data.get('doctors', [])
@@ -484,7 +607,7 @@ class DocumentClassifier:
     def _classify_en20_rejection(self, text: str, text_lower: str) -> Optional[DocumentClassificationResult]:
         """Classify EN-20 rejection documents."""
         if 'en-20' in text_lower and ('rejection' in text_lower or 'errors' in text_lower):
-            data = self._extract_common_data(text)
+            data = self._extract_common_data(text, text_lower)
             return DocumentClassificationResult(
                 DocumentType.EN20_REJECTION, 0.9, data, "EN-20 rejection patterns found"
             )
@@ -495,7 +618,7 @@ class DocumentClassifier:
         """Classify wage loss documents."""
         if 'wage loss' in text_lower or 'wl' in text_lower:
             if 'benefits' in text_lower or 'request' in text_lower:
-                data = self._extract_common_data(text)
+                data = self._extract_common_data(text, text_lower)
                 return DocumentClassificationResult(
                     DocumentType.WL, 0.85, data, "Wage loss patterns found"
                 )
@@ -506,7 +629,7 @@ class DocumentClassifier:
         """Classify ORAU documents."""
         if 'orau' in text_lower or 'dose reconstruction' in text_lower:
             if 'radiation' in text_lower or 'monitoring' in text_lower:
-                data = self._extract_common_data(text)
+                data = self._extract_common_data(text, text_lower)
                 return DocumentClassificationResult(
                     DocumentType.ORAU, 0.9, data, "ORAU document patterns found"
                 )
@@ -516,7 +639,7 @@ class DocumentClassifier:
     def _classify_niosh_waiver(self, text: str, text_lower: str) -> Optional[DocumentClassificationResult]:
         """Classify NIOSH waiver documents."""
         if 'niosh' in text_lower and 'waiver' in text_lower:
-            data = self._extract_common_data(text)
+            data = self._extract_common_data(text, text_lower)
             return DocumentClassificationResult(
                 DocumentType.NIOSH_WAIVER, 0.95, data, "NIOSH waiver patterns found"
             )
@@ -525,7 +648,7 @@ class DocumentClassifier:
     
     def _classify_dme_hhc(self, text: str, text_lower: str) -> Optional[DocumentClassificationResult]:
         """Classify DME and HHC documents."""
-        data = self._extract_common_data(text)
+        data = self._extract_common_data(text, text_lower)
         
         if 'durable medical equipment' in text_lower or 'dme' in text_lower:
             if 'denial' in text_lower or 'deny' in text_lower:
@@ -545,7 +668,7 @@ class DocumentClassifier:
         """Classify Letter of Medical Necessity request documents."""
         if 'letter of medical necessity' in text_lower or 'lmn' in text_lower:
             if 'request' in text_lower:
-                data = self._extract_common_data(text)
+                data = self._extract_common_data(text, text_lower)
                 return DocumentClassificationResult(
                     DocumentType.LMN_REQUEST, 0.9, data, "LMN request patterns found"
                 )
@@ -1,33 +1,211 @@
 import pytesseract
-from pdf2image import convert_from_path
 from PIL import Image
+import hashlib
 import os
-from config.settings import AR_ACK_SIGNATURE
+from collections import OrderedDict
+
+try:
+    # In-process libtesseract bindings - keeps the OCR model loaded between pages
+    from tesserocr import PyTessBaseAPI, PSM
+except ImportError:
+    PyTessBaseAPI = None
+
+try:
+    # Optional GPU OCR engine, selected with OCR_ENGINE=paddle
+    from paddleocr import PaddleOCR
+    import numpy as np
+except ImportError:
+    PaddleOCR = None
+
+try:
+    # In-process PDFium renderer - avoids a pdftoppm subprocess per document
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+    from pdf2image import convert_from_path
+from config.settings import AR_ACK_SIGNATURE, OCR_CACHE_DIR, OCR_ENGINE
 from src.logger import SWNALogger
 
+# OCR rendering settings
+OCR_DPI = 300
+OCR_MAX_PAGES = 3  # Limit to first 3 pages for speed
+MIN_TEXT_LAYER_CHARS = 100  # Embedded text shorter than this is treated as absent
+OCR_DIGEST_MEMO_SIZE = 256  # Content hashes remembered for unchanged files (retries skip re-hashing)
+
+# AR Ack signature with whitespace normalized, and its first 10 words for debug hints
+_CLEAN_AR_ACK_SIGNATURE = " ".join(AR_ACK_SIGNATURE.split())
+_PARTIAL_AR_ACK_SIGNATURE = " ".join(_CLEAN_AR_ACK_SIGNATURE.split()[:10])
+
 class DocumentProcessor:
     """Handle PDF text extraction and AR Ack document identification."""
     
     def __init__(self, logger=None):
         self.logger = logger or SWNALogger()
+        self._tess_api = None  # Created on first OCR call when tesserocr is installed
+        self._paddle_ocr = None  # Created on first OCR call when OCR_ENGINE=paddle
+        # (path, inode, size, mtime_ns) -> OCR cache path, so a retried file is not hashed again
+        self._cache_path_memo = OrderedDict()
+        
+        self.use_paddle = OCR_ENGINE.lower() == "paddle"
+        if self.use_paddle and PaddleOCR is None:
+            self.logger.error("OCR_ENGINE=paddle but paddleocr is not installed - falling back to Tesseract")
+            self.use_paddle = False
+    
+    def warmup(self):
+        """
+        Load the OCR engine now instead of on the first scanned page, so the first
+        document does not pay the model load. Failures are left for the real OCR call.
+        """
+        try:
+            if self.use_paddle:
+                if self._paddle_ocr is None:
+                    self._paddle_ocr = PaddleOCR(use_angle_cls=False, lang='en', use_gpu=True, show_log=False)
+            elif PyTessBaseAPI is not None and self._tess_api is None:
+                self._tess_api = PyTessBaseAPI(psm=PSM.SINGLE_BLOCK)
+        except Exception as e:
+            self.logger.debug(f"[OCR] Engine warmup failed: {str(e)}")
     
     def extract_text_from_pdf(self, pdf_path):
         """
         Extract text from scanned PDF using OCR.
         Returns extracted text string or None if extraction fails.
         """
-        # All files are scanned images - go directly to OCR
+        # Reuse OCR output for identical file contents (retries, re-scans)
+        cache_path = self._get_ocr_cache_path(pdf_path)
+        cached_text = self._read_ocr_cache(cache_path)
+        if cached_text:
+            self.logger.debug(f"[OCR] Using cached OCR text ({len(cached_text)} characters): {pdf_path}")
+            return cached_text
+        
+        # Some scans already carry an embedded text layer - use it and skip OCR
+        text = self._extract_text_layer(pdf_path)
+        if text:
+            self.logger.debug(f"[OCR] Using embedded text layer ({len(text)} characters), skipping OCR: {pdf_path}")
+            return text
+        
+        # No usable text layer - rasterize and OCR
         self.logger.debug(f"[OCR] Processing scanned PDF with OCR: {pdf_path}")
         try:
             text = self._extract_with_ocr(pdf_path)
             if text and len(text.strip()) > 0:
                 self.logger.debug(f"[OCR] OCR extracted {len(text)} characters")
+                self._write_ocr_cache(cache_path, text)
                 return text
         except Exception as e:
             self.logger.debug(f"OCR extraction failed for {pdf_path}: {str(e)}")
         
         return None
     
+    def _extract_text_layer(self, pdf_path):
+        """
+        Read the embedded text layer from the first OCR_MAX_PAGES pages.
+        Returns the text if it is long enough to classify, otherwise None.
+        """
+        if pdfium is None:
+            return None
+        
+        try:
+            page_texts = []
+            pdf = pdfium.PdfDocument(pdf_path)
+            try:
+                for i in range(min(OCR_MAX_PAGES, len(pdf))):
+                    page = pdf[i]
+                    textpage = page.get_textpage()
+                    try:
+                        page_texts.append(textpage.get_text_range())
+                    finally:
+                        textpage.close()
+                        page.close()
+            finally:
+                pdf.close()
+            
+            text = "\n".join(page_texts)
+            if len(text.strip()) > MIN_TEXT_LAYER_CHARS:
+                return text
+            
+            self.logger.debug(f"[OCR] No usable text layer in {pdf_path} ({len(text.strip())} characters)")
+            
+        except Exception as e:
+            self.logger.debug(f"[OCR] Text layer probe failed for {pdf_path}: {str(e)}")
+        
+        return None
+    
+    def _get_ocr_cache_path(self, pdf_path):
+        """
+        Build the OCR cache file path from the SHA-256 of the PDF contents.
+        The hash is reused while the file's inode, size and mtime are unchanged.
+        Returns None if caching is disabled or the file cannot be read.
+        """
+        if not OCR_CACHE_DIR:
+            return None
+        
+        try:
+            with open(pdf_path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                memo_key = (pdf_path, st.st_ino, st.st_size, st.st_mtime_ns)
+                cache_path = self._cache_path_memo.get(memo_key)
+                if cache_path is not None:
+                    self._cache_path_memo.move_to_end(memo_key)
+                    return cache_path
+                
+                # Hash through one reused buffer rather than a new bytes object per chunk
+                digest = hashlib.sha256()
+                buffer = bytearray(1024 * 1024)
+                view = memoryview(buffer)
+                while True:
+                    size = f.readinto(buffer)
+                    if not size:
+                        break
+                    digest.update(view[:size])
+            
+            cache_path = os.path.join(OCR_CACHE_DIR, f"{digest.hexdigest()}.txt")
+            self._cache_path_memo[memo_key] = cache_path
+            if len(self._cache_path_memo) > OCR_DIGEST_MEMO_SIZE:
+                self._cache_path_memo.popitem(last=False)
+            return cache_path
+        except Exception as e:
+            self.logger.debug(f"[OCR] Could not hash {pdf_path} for cache lookup: {str(e)}")
+            return None
+    
+    def _read_ocr_cache(self, cache_path):
+        """Return cached OCR text, or None on a cache miss."""
+        if not cache_path:
+            return None
+        
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except UnicodeDecodeError as e:
+            # Corrupt entry: drop it so the next OCR run replaces it
+            self.logger.debug(f"[OCR] Discarding corrupt OCR cache entry {cache_path}: {str(e)}")
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+            return None
+        except Exception as e:
+            self.logger.debug(f"[OCR] Failed to read OCR cache {cache_path}: {str(e)}")
+            return None
+    
+    def _write_ocr_cache(self, cache_path, text):
+        """Store OCR text in the cache, writing atomically so readers never see partial files."""
+        if not cache_path:
+            return
+        
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(cache_path), mode=0o700, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(temp_path, cache_path)
+        except Exception as e:
+            self.logger.debug(f"[OCR] Failed to write OCR cache {cache_path}: {str(e)}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
     
     def _extract_with_ocr(self, pdf_path):
         """Extract text using OCR (Tesseract) for scanned PDFs."""
@@ -37,24 +215,30 @@ class DocumentProcessor:
             self.logger.debug(f"[OCR] Converting PDF to images: {pdf_path}")
             
             # Convert PDF pages to images
-            images = convert_from_path(pdf_path, dpi=300, first_page=1, last_page=3)  # Limit to first 3 pages for speed
+            images = self._render_pages(pdf_path)
+            
+            if images and self.use_paddle:
+                self.logger.debug(f"[OCR] Processing {len(images)} pages with PaddleOCR")
+                text = self._ocr_pages_with_paddle(images)
+                self.logger.debug(f"[OCR] Total OCR text extracted: {len(text)} characters")
+                return text
             
             self.logger.debug(f"[OCR] Processing {len(images)} pages with Tesseract")
             
-            for i, image in enumerate(images):
+            if images:
                 try:
-                    # Use Tesseract to extract text from image
-                    page_text = pytesseract.image_to_string(image, config='--psm 6')
+                    # Tile all pages into one image so Tesseract is invoked once per document
+                    page_text = self._ocr_image(self._tile_pages(images))
                     
                     if page_text and page_text.strip():
-                        text += page_text + "\n"
-                        self.logger.debug(f"[OCR] Page {i+1}: extracted {len(page_text)} characters")
+                        text = page_text + "\n"
+                        self.logger.debug(f"[OCR] Tiled {len(images)} pages: extracted {len(page_text)} characters")
                     else:
-                        self.logger.debug(f"[OCR] Page {i+1}: no text extracted")
+                        self.logger.debug("[OCR] Tiled pages: no text extracted")
                         
                 except Exception as e:
-                    self.logger.debug(f"[OCR] Failed to process page {i+1}: {str(e)}")
-                    continue
+                    self.logger.debug(f"[OCR] Tiled OCR failed, falling back to per-page OCR: {str(e)}")
+                    text = self._ocr_pages_individually(images)
             
             self.logger.debug(f"[OCR] Total OCR text extracted: {len(text)} characters")
             return text
@@ -63,6 +247,95 @@ class DocumentProcessor:
             self.logger.error(f"[OCR] OCR processing failed: {str(e)}")
             raise
     
+    def _ocr_image(self, image):
+        """
+        Run Tesseract on a single image.
+        Uses a resident tesserocr API when available, otherwise the pytesseract subprocess.
+        """
+        if PyTessBaseAPI is None:
+            return pytesseract.image_to_string(image, config='--psm 6')
+        
+        if self._tess_api is None:
+            self._tess_api = PyTessBaseAPI(psm=PSM.SINGLE_BLOCK)
+        
+        self._tess_api.SetImage(image)
+        return self._tess_api.GetUTF8Text()
+    
+    def _ocr_pages_with_paddle(self, images):
+        """Run PaddleOCR (GPU when available) on each page and join the detected text lines."""
+        if self._paddle_ocr is None:
+            self._paddle_ocr = PaddleOCR(use_angle_cls=False, lang='en', use_gpu=True, show_log=False)
+        
+        text = ""
+        for i, image in enumerate(images):
+            result = self._paddle_ocr.ocr(np.array(image.convert('RGB')), cls=False)
+            lines = [line[1][0] for page in (result or []) if page for line in page]
+            
+            if lines:
+                text += "\n".join(lines) + "\n"
+                self.logger.debug(f"[OCR] Page {i+1}: PaddleOCR detected {len(lines)} lines")
+            else:
+                self.logger.debug(f"[OCR] Page {i+1}: no text extracted")
+        
+        return text
+    
+    def _ocr_pages_individually(self, images):
+        """Run Tesseract on each page image separately, skipping pages that fail."""
+        text = ""
+        
+        for i, image in enumerate(images):
+            try:
+                page_text = self._ocr_image(image)
+                
+                if page_text and page_text.strip():
+                    text += page_text + "\n"
+                    self.logger.debug(f"[OCR] Page {i+1}: extracted {len(page_text)} characters")
+                else:
+                    self.logger.debug(f"[OCR] Page {i+1}: no text extracted")
+                    
+            except Exception as e:
+                self.logger.debug(f"[OCR] Failed to process page {i+1}: {str(e)}")
+                continue
+        
+        return text
+    
+    def _tile_pages(self, images):
+        """Stack page images vertically into a single grayscale image."""
+        if len(images) == 1:
+            return images[0]
+        
+        pages = [image.convert('L') for image in images]
+        combined = Image.new('L', (max(page.width for page in pages), sum(page.height for page in pages)), 255)
+        
+        y_offset = 0
+        for page in pages:
+            combined.paste(page, (0, y_offset))
+            y_offset += page.height
+        
+        return combined
+    
+    def _render_pages(self, pdf_path):
+        """
+        Rasterize the first OCR_MAX_PAGES pages of a PDF into PIL images.
+        Uses pypdfium2 in-process when available, otherwise pdf2image.
+        """
+        if pdfium is None:
+            return convert_from_path(pdf_path, dpi=OCR_DPI, first_page=1, last_page=OCR_MAX_PAGES)
+        
+        images = []
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            for i in range(min(OCR_MAX_PAGES, len(pdf))):
+                page = pdf[i]
+                try:
+                    images.append(page.render(scale=OCR_DPI / 72, grayscale=True).to_pil())
+                finally:
+                    page.close()
+        finally:
+            pdf.close()
+        
+        return images
+    
     def is_ar_acknowledgment(self, text):
         """
         Check if the document is an AR Acknowledgment letter.
@@ -74,25 +347,22 @@ class DocumentProcessor:
         
         # Clean text for comparison (remove extra whitespace, normalize)
         clean_text = " ".join(text.split())
-        clean_signature = " ".join(AR_ACK_SIGNATURE.split())
         
-        self.logger.debug(f"[DEBUG] Looking for signature text (length: {len(clean_signature)})")
-        self.logger.debug(f"[DEBUG] Signature starts with: '{clean_signature[:100]}...'")
+        self.logger.debug("[DEBUG] Looking for signature text (length: %d)", len(_CLEAN_AR_ACK_SIGNATURE))
+        self.logger.debug("[DEBUG] Signature starts with: '%.100s...'", _CLEAN_AR_ACK_SIGNATURE)
         
         # Check if signature text exists in document
-        found = clean_signature in clean_text
+        found = _CLEAN_AR_ACK_SIGNATURE in clean_text
         
         if found:
             self.logger.debug("[DEBUG] ✅ AR Ack signature text FOUND!")
         else:
             self.logger.debug("[DEBUG] ❌ AR Ack signature text NOT found")
             # Look for partial matches to help debug
-            signature_words = clean_signature.split()[:10]  # First 10 words
-            partial_signature = " ".join(signature_words)
-            if partial_signature in clean_text:
-                self.logger.debug(f"[DEBUG] 🔍 Found partial match: '{partial_signature}'")
+            if _PARTIAL_AR_ACK_SIGNATURE in clean_text:
+                self.logger.debug("[DEBUG] 🔍 Found partial match: '%s'", _PARTIAL_AR_ACK_SIGNATURE)
             else:
-                self.logger.debug(f"[DEBUG] 🔍 Even partial signature not found: '{partial_signature}'")
+                self.logger.debug("[DEBUG] 🔍 Even partial signature not found: '%s'", _PARTIAL_AR_ACK_SIGNATURE)
         
         return found
     
@@ -4,10 +4,126 @@ Document Renaming System for SWNA Automation
 Generates appropriate filenames based on document type and extracted data.
 """
 
-from datetime import datetime
+import time
 from typing import Dict, Any, Optional
 from src.document_classifier import DocumentType, DocumentClassificationResult
 
+# (local day, M.D.YY string), reformatted only when the day changes; see file_manager.today_str
+_date_cache = (None, None)
+
+def _today_str() -> str:
+    global _date_cache
+    d = time.localtime()
+    key = (d.tm_year, d.tm_mon, d.tm_mday)
+    cached_key, date_str = _date_cache
+    if cached_key != key:
+        date_str = f"{d.tm_mon}.{d.tm_mday}.{str(d.tm_year)[2:]}"
+        _date_cache = (key, date_str)
+    return date_str
+
+# Document types whose base filename never depends on extracted data
+_BASE_NAME_STATIC = {
+    DocumentType.AR_ACK: "AR Ack",
+    DocumentType.CLAIM_ACK: "Claim Ack",
+    DocumentType.WH_RFI: "WH RFI",
+    DocumentType.IH_NOTICE: "IH Notice",
+    DocumentType.RFI_POST_IH: "RFI Post IH",
+    DocumentType.EN16: "EN16",
+    DocumentType.WITHDRAW_ACK: "Withdraw Ack",
+    DocumentType.OBJECTION_RD_DENY_ACK: "Objection to RD Deny Ack",
+    DocumentType.REMAND_ORDER: "Remand Order",
+    DocumentType.FD_ACCEPT_CQ: "FD Accept CQ",
+    DocumentType.EE11A: "EE-11A",
+    DocumentType.IMPAIR_AUTH: "Impair Auth",
+    DocumentType.IR_ACK: "IR Ack",
+    DocumentType.IR_FOLLOW_UP: "IR Follow Up",
+    DocumentType.IMPAIRMENT_FINAL_NOTICE: "Impairment Final Notice",
+    DocumentType.IMPAIR_APPT_REQUEST: "Impair Appt Request",
+    DocumentType.IR_DEFERRAL_NOTICE: "IR Deferral Notice",
+    DocumentType.EN20_REJECTION: "EN-20 Rejection",
+    DocumentType.WL: "WL",
+    DocumentType.ORAU: "ORAU",
+    DocumentType.NIOSH_WAIVER: "NIOSH Waiver",
+    DocumentType.DME_DENY: "DME Deny",
+    DocumentType.HHC_AUTH: "HHC Auth",
+    DocumentType.LMN_REQUEST: "LMN Request",
+    DocumentType.ADDRESS_CHANGE_ACK: "Address Change Ack",
+}
+
+# Builders take only the value they format: the first extracted amount or
+# condition (None when absent), or the whole extracted_data for the IR report
+
+def _rd_accept_be(amount: Optional[str]) -> str:
+    # Check if there's a specific amount, otherwise default to $150k
+    return f"RD Accept B&E {amount if amount is not None else '$150k'}"
+
+def _rd_accept_impair(amount: Optional[str]) -> str:
+    # Use extracted amount if available
+    return f"RD Accept Impair {amount}" if amount is not None else "RD Accept Impair"
+
+def _rd_accept_e(condition: Optional[str]) -> str:
+    # Check for specific condition; default to PF as shown in examples
+    return f"RD Accept E {condition}" if condition is not None else "RD Accept E PF"
+
+def _rd_deny(condition: Optional[str]) -> str:
+    return f"RD Deny {condition}" if condition is not None else "RD Deny"
+
+def _fd_accept_be(amount: Optional[str]) -> str:
+    return f"FD Accept B&E {amount if amount is not None else '$150k'}"
+
+def _fd_accept_impair(amount: Optional[str]) -> str:
+    return f"FD Accept Impair {amount}" if amount is not None else "FD Accept Impair"
+
+def _fd_accept_e(condition: Optional[str]) -> str:
+    return f"FD Accept E {condition}" if condition is not None else "FD Accept E"
+
+def _fd_accept_cq_specific(condition: Optional[str]) -> str:
+    return f"FD Accept CQ {condition}" if condition is not None else "FD Accept CQ"
+
+def _fd_accept_ir(amount: Optional[str]) -> str:
+    return f"FD Accept IR {amount}" if amount is not None else "FD Accept IR"
+
+def _fd_deny(condition: Optional[str]) -> str:
+    return f"FD Deny {condition}" if condition is not None else "FD Deny"
+
+def _dr_ir_report(extracted_data: Dict[str, Any]) -> str:
+    # Format: "Dr. LastName IR ##% (##% incr)"
+    doctors = extracted_data.get('doctors', [])
+    percentages = extracted_data.get('percentages', [])
+    is_increased = extracted_data.get('is_increased', False)
+    
+    if not (doctors and percentages):
+        return "Dr IR Report"
+    
+    doctor_name = doctors[0]
+    percentage = percentages[0]
+    
+    if is_increased and len(percentages) > 1:
+        # If there are multiple percentages and it's marked as increased
+        return f"Dr. {doctor_name} IR {percentage} ({percentages[1]} incr)"
+    elif is_increased:
+        return f"Dr. {doctor_name} IR {percentage} (incr)"
+    return f"Dr. {doctor_name} IR {percentage}"
+
+def _first(extracted_data: Dict[str, Any], key: str) -> Optional[str]:
+    values = extracted_data.get(key)
+    return values[0] if values else None
+
+# Document types whose base filename is built from extracted data
+_BASE_NAME_DYNAMIC = {
+    DocumentType.RD_ACCEPT_BE: lambda data: _rd_accept_be(_first(data, 'amounts')),
+    DocumentType.RD_ACCEPT_IMPAIR: lambda data: _rd_accept_impair(_first(data, 'amounts')),
+    DocumentType.RD_ACCEPT_E: lambda data: _rd_accept_e(_first(data, 'conditions')),
+    DocumentType.RD_DENY: lambda data: _rd_deny(_first(data, 'conditions')),
+    DocumentType.FD_ACCEPT_BE: lambda data: _fd_accept_be(_first(data, 'amounts')),
+    DocumentType.FD_ACCEPT_IMPAIR: lambda data: _fd_accept_impair(_first(data, 'amounts')),
+    DocumentType.FD_ACCEPT_E: lambda data: _fd_accept_e(_first(data, 'conditions')),
+    DocumentType.FD_ACCEPT_CQ_SPECIFIC: lambda data: _fd_accept_cq_specific(_first(data, 'conditions')),
+    DocumentType.FD_ACCEPT_IR: lambda data: _fd_accept_ir(_first(data, 'amounts')),
+    DocumentType.FD_DENY: lambda data: _fd_deny(_first(data, 'conditions')),
+    DocumentType.DR_IR_REPORT: _dr_ir_report,
+}
+
 class DocumentRenamer:
     """Generates filenames based on document type and extracted data."""
     
@@ -37,8 +153,7 @@ class DocumentRenamer:
         if date_override:
             date_str = date_override
         else:
-            now = datetime.now()
-            date_str = f"{now.month}.{now.day}.{str(now.year)[2:]}"
+            date_str = _today_str()
         
         # Generate base filename based on document type
         base_name = self._generate_base_name(doc_type, extracted_data)
@@ -61,19 +176,21 @@ class DocumentRenamer:
         Returns:
             Formatted name in "F. Last" format
         """
-        if not client_name or not client_name.strip():
+        name = client_name.strip() if client_name else ''
+        if not name:
             return "Unknown Client"
         
-        parts = client_name.strip().split()
-        if len(parts) >= 2:
-            first_initial = parts[0][0].upper()
-            last_name = parts[-1]
-            return f"{first_initial}. {last_name}"
-        elif len(parts) == 1:
+        if not name.isprintable():
+            # Tabs/newlines or other unusual whitespace - normalize first
+            name = " ".join(name.split())
+        
+        first, sep, rest = name.partition(' ')
+        if not sep:
             # If only one name, use it as last name with unknown first initial
-            return f"X. {parts[0]}"
-        else:
-            return "Unknown Client"
+            return f"X. {first}"
+        
+        last_name = rest.rpartition(' ')[2]
+        return f"{first[0].upper()}. {last_name}"
     
     def _generate_base_name(self, doc_type: DocumentType, extracted_data: Dict[str, Any]) -> str:
         """
@@ -86,183 +203,16 @@ class DocumentRenamer:
         Returns:
             Base filename part (without client name and date)
         """
-        if doc_type == DocumentType.AR_ACK:
-            return "AR Ack"
-        
-        elif doc_type == DocumentType.CLAIM_ACK:
-            return "Claim Ack"
-        
-        elif doc_type == DocumentType.WH_RFI:
-            return "WH RFI"
-        
-        elif doc_type == DocumentType.IH_NOTICE:
-            return "IH Notice"
-        
-        elif doc_type == DocumentType.RFI_POST_IH:
-            return "RFI Post IH"
-        
-        elif doc_type == DocumentType.EN16:
-            return "EN16"
-        
-        elif doc_type == DocumentType.RD_ACCEPT_BE:
-            # Check if there's a specific amount, otherwise default to $150k
-            amounts = extracted_data.get('amounts', [])
-            amount = amounts[0] if amounts else "$150k"
-            return f"RD Accept B&E {amount}"
+        static_name = _BASE_NAME_STATIC.get(doc_type)
+        if static_name is not None:
+            return static_name
         
-        elif doc_type == DocumentType.RD_ACCEPT_IMPAIR:
-            # Use extracted amount if available
-            amounts = extracted_data.get('amounts', [])
-            if amounts:
-                amount = amounts[0]
-                return f"RD Accept Impair {amount}"
-            else:
-                return "RD Accept Impair"
+        builder = _BASE_NAME_DYNAMIC.get(doc_type)
+        if builder is not None:
+            return builder(extracted_data)
         
-        elif doc_type == DocumentType.RD_ACCEPT_E:
-            # Check for specific condition
-            conditions = extracted_data.get('conditions', [])
-            if conditions:
-                condition = conditions[0]
-                return f"RD Accept E {condition}"
-            else:
-                return "RD Accept E PF"  # Default to PF as shown in examples
-        
-        elif doc_type == DocumentType.RD_DENY:
-            conditions = extracted_data.get('conditions', [])
-            if conditions:
-                condition = conditions[0]
-                return f"RD Deny {condition}"
-            else:
-                return "RD Deny"
-        
-        elif doc_type == DocumentType.WITHDRAW_ACK:
-            return "Withdraw Ack"
-        
-        elif doc_type == DocumentType.OBJECTION_RD_DENY_ACK:
-            return "Objection to RD Deny Ack"
-        
-        elif doc_type == DocumentType.REMAND_ORDER:
-            return "Remand Order"
-        
-        elif doc_type == DocumentType.FD_ACCEPT_BE:
-            amounts = extracted_data.get('amounts', [])
-            amount = amounts[0] if amounts else "$150k"
-            return f"FD Accept B&E {amount}"
-        
-        elif doc_type == DocumentType.FD_ACCEPT_IMPAIR:
-            amounts = extracted_data.get('amounts', [])
-            if amounts:
-                amount = amounts[0]
-                return f"FD Accept Impair {amount}"
-            else:
-                return "FD Accept Impair"
-        
-        elif doc_type == DocumentType.FD_ACCEPT_E:
-            conditions = extracted_data.get('conditions', [])
-            if conditions:
-                condition = conditions[0]
-                return f"FD Accept E {condition}"
-            else:
-                return "FD Accept E"
-        
-        elif doc_type == DocumentType.FD_ACCEPT_CQ:
-            return "FD Accept CQ"
-        
-        elif doc_type == DocumentType.FD_ACCEPT_CQ_SPECIFIC:
-            conditions = extracted_data.get('conditions', [])
-            if conditions:
-                condition = conditions[0]
-                return f"FD Accept CQ {condition}"
-            else:
-                return "FD Accept CQ"
-        
-        elif doc_type == DocumentType.FD_ACCEPT_IR:
-            amounts = extracted_data.get('amounts', [])
-            if amounts:
-                amount = amounts[0]
-                return f"FD Accept IR {amount}"
-            else:
-                return "FD Accept IR"
-        
-        elif doc_type == DocumentType.FD_DENY:
-            conditions = extracted_data.get('conditions', [])
-            if conditions:
-                condition = conditions[0]
-                return f"FD Deny {condition}"
-            else:
-                return "FD Deny"
-        
-        elif doc_type == DocumentType.EE11A:
-            return "EE-11A"
-        
-        elif doc_type == DocumentType.IMPAIR_AUTH:
-            return "Impair Auth"
-        
-        elif doc_type == DocumentType.IR_ACK:
-            return "IR Ack"
-        
-        elif doc_type == DocumentType.IR_FOLLOW_UP:
-            return "IR Follow Up"
-        
-        elif doc_type == DocumentType.IMPAIRMENT_FINAL_NOTICE:
-            return "Impairment Final Notice"
-        
-        elif doc_type == DocumentType.IMPAIR_APPT_REQUEST:
-            return "Impair Appt Request"
-        
-        elif doc_type == DocumentType.IR_DEFERRAL_NOTICE:
-            return "IR Deferral Notice"
-        
-        elif doc_type == DocumentType.DR_IR_REPORT:
-            # Format: "Dr. LastName IR ##% (##% incr)"
-            doctors = extracted_data.get('doctors', [])
-            percentages = extracted_data.get('percentages', [])
-            is_increased = extracted_data.get('is_increased', False)
-            
-            if doctors and percentages:
-                doctor_name = doctors[0]
-                percentage = percentages[0]
-                
-                if is_increased and len(percentages) > 1:
-                    # If there are multiple percentages and it's marked as increased
-                    base_name = f"Dr. {doctor_name} IR {percentage} ({percentages[1]} incr)"
-                elif is_increased:
-                    base_name = f"Dr. {doctor_name} IR {percentage} (incr)"
-                else:
-                    base_name = f"Dr. {doctor_name} IR {percentage}"
-                
-                return base_name
-            else:
-                return "Dr IR Report"
-        
-        elif doc_type == DocumentType.EN20_REJECTION:
-            return "EN-20 Rejection"
-        
-        elif doc_type == DocumentType.WL:
-            return "WL"
-        
-        elif doc_type == DocumentType.ORAU:
-            return "ORAU"
-        
-        elif doc_type == DocumentType.NIOSH_WAIVER:
-            return "NIOSH Waiver"
-        
-        elif doc_type == DocumentType.DME_DENY:
-            return "DME Deny"
-        
-        elif doc_type == DocumentType.HHC_AUTH:
-            return "HHC Auth"
-        
-        elif doc_type == DocumentType.LMN_REQUEST:
-            return "LMN Request"
-        
-        elif doc_type == DocumentType.ADDRESS_CHANGE_ACK:
-            return "Address Change Ack"
-        
-        else:
-            # For unknown or unhandled document types
-            return "Unknown Document"
+        # For unknown or unhandled document types
+        return "Unknown Document"
     
     def get_rename_preview(self, classification_result: DocumentClassificationResult, 
                           client_name: str, original_filename: str) -> Dict[str, Any]:
@@ -1,14 +1,36 @@
 import os
+import re
 import shutil
-from datetime import datetime
+import stat
+import time
 from config.settings import SYNC_FOLDER_PATH
 from src.logger import SWNALogger
 
+# Filenames this system has already produced ("AR Ack - F. Last MM.DD.YY.pdf")
+_AR_ACK_FILENAME_RE = re.compile(r"AR Ack - .*\.pdf\Z", re.IGNORECASE | re.DOTALL)
+
+# (local day, MM.DD.YY string), reformatted only when the day changes. One tuple,
+# rebound in a single assignment, so concurrent callers never see a new day with an old string
+_date_cache = (None, None)
+
+def today_str():
+    """Return today's date as MM.DD.YY, the format used in filenames and Airtable Log entries."""
+    global _date_cache
+    d = time.localtime()
+    key = (d.tm_year, d.tm_mon, d.tm_mday)
+    cached_key, date_str = _date_cache
+    if cached_key != key:
+        date_str = time.strftime("%m.%d.%y", d)
+        _date_cache = (key, date_str)
+    return date_str
+
 class FileManager:
     """Handle file rename and move operations."""
     
     def __init__(self, logger=None):
         self.logger = logger or SWNALogger()
+        # Parent of every client folder, joined once per instance rather than per file
+        self._active_clients_root = os.path.join(SYNC_FOLDER_PATH, "2. Active Clients")
     
     def generate_new_filename(self, client_name):
         """
@@ -17,20 +39,23 @@ class FileManager:
         """
         try:
             # Parse client name (expected format: "First Last" or "First Middle Last")
-            name_parts = client_name.strip().split()
+            name = client_name.strip()
+            if not name.isprintable():
+                name = " ".join(name.split())
+            
+            first_name, sep, rest = name.partition(' ')
             
-            if len(name_parts) < 2:
+            if not sep:
                 self.logger.error(f"Cannot generate filename - invalid client name format: {client_name}")
                 return None
             
             # Get first name initial and last name
-            first_name = name_parts[0]
-            last_name = name_parts[-1]  # Last part is surname
+            last_name = rest.rpartition(' ')[2]  # Last part is surname
             
             first_initial = first_name[0].upper()
             
             # Get current date
-            current_date = datetime.now().strftime("%m.%d.%y")
+            current_date = today_str()
             
             # Generate filename
             new_filename = f"AR Ack - {first_initial}. {last_name} {current_date}.pdf"
@@ -48,11 +73,7 @@ class FileManager:
         Returns folder path string.
         """
         try:
-            base_path = os.path.join(SYNC_FOLDER_PATH, "2. Active Clients")
-            client_folder = os.path.join(base_path, client_name_formatted)
-            dol_letters_folder = os.path.join(client_folder, "DOL Letters")
-            
-            return dol_letters_folder
+            return f"{self._active_clients_root}{os.sep}{client_name_formatted}{os.sep}DOL Letters"
             
         except Exception as e:
             self.logger.error(f"Client folder path construction failed: {str(e)}")
@@ -64,7 +85,10 @@ class FileManager:
         Returns True if exists, False otherwise.
         """
         try:
-            return os.path.exists(destination_path) and os.path.isdir(destination_path)
+            return stat.S_ISDIR(os.stat(destination_path).st_mode)
+        except OSError:
+            # Missing or inaccessible path
+            return False
         except Exception as e:
             self.logger.error(f"Destination folder validation failed: {str(e)}")
             return False
@@ -86,7 +110,7 @@ class FileManager:
                 return False, None
             
             # REAL MODE - ACTUAL FILE VALIDATION AND MOVE
-            self.logger.info(f"Validating destination folder: {destination_folder}")
+            self.logger.info("Validating destination folder: %s", destination_folder)
             
             # Validate destination folder exists
             if not self.validate_destination_folder(destination_folder):
@@ -96,16 +120,12 @@ class FileManager:
             # Construct full destination path
             destination_path = os.path.join(destination_folder, new_filename)
             
-            # Check if file already exists at destination
-            self.logger.info(f"Checking if file exists at: {destination_path}")
-            if os.path.exists(destination_path):
+            # Perform the actual move and rename
+            self.logger.info("Moving file: %s -> %s", original_file_path, destination_path)
+            if not self.rename_no_overwrite(original_file_path, destination_path):
                 self.logger.error(f"File already exists at destination: {destination_path}")
                 return False, None
             
-            # Perform the actual move and rename
-            self.logger.info(f"Moving file: {original_file_path} -> {destination_path}")
-            shutil.move(original_file_path, destination_path)
-            
             # Log the operation
             original_filename = os.path.basename(original_file_path)
             self.logger.log_file_renamed_moved(original_filename, new_filename, destination_folder)
@@ -116,15 +136,36 @@ class FileManager:
             self.logger.error(f"File move and rename failed: {str(e)}")
             return False, None
     
+    def rename_no_overwrite(self, source_path, destination_path):
+        """
+        Move a file without ever replacing an existing destination.
+        Returns False if the destination already exists, True once moved.
+        """
+        try:
+            # link() fails atomically if the destination exists, unlike rename() on POSIX
+            os.link(source_path, destination_path)
+        except FileExistsError:
+            return False
+        except OSError:
+            # Cross-device move or a filesystem without hard links
+            if os.path.exists(destination_path):
+                return False
+            shutil.move(source_path, destination_path)
+            return True
+        
+        os.unlink(source_path)
+        return True
+    
     def is_already_processed_file(self, filename):
         """
         Check if file is already processed (has AR Ack naming pattern).
+        Only the name is matched, no filesystem access, so results are not cached.
         Returns True if already processed, False otherwise.
         """
         try:
-            return filename.startswith("AR Ack - ") and filename.endswith(".pdf")
+            return _AR_ACK_FILENAME_RE.match(filename) is not None
         except Exception as e:
-            self.logger.debug(f"File processed check failed: {str(e)}")
+            self.logger.debug("File processed check failed: %s", e)
             return False
     
     def get_file_size_mb(self, file_path):
@@ -137,5 +178,5 @@ class FileManager:
             size_mb = size_bytes / (1024 * 1024)
             return round(size_mb, 2)
         except Exception as e:
-            self.logger.debug(f"File size check failed: {str(e)}")
+            self.logger.debug("File size check failed: %s", e)
             return None
\ No newline at end of file
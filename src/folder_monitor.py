@@ -1,18 +1,36 @@
 import os
 import time
+import threading
+from collections import OrderedDict
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from datetime import datetime
 from config.settings import SYNC_FOLDER_PATH
 from src.logger import SWNALogger
 
+STABILITY_POLL_INTERVAL = 0.05  # Seconds between size checks while a file is being written
+STABILITY_TIMEOUT = 2.0  # Max seconds to wait for a file's size to settle
+DEBOUNCE_SECONDS = 0.25  # Quiet period after the last event for a path before it is processed
+RECENT_FILE_TTL = 10.0  # Seconds after processing during which new events for the same path are ignored
+RECENT_FILES_MAX = 1024  # Cap on remembered paths; oldest are evicted first
+
 class PDFFileHandler(FileSystemEventHandler):
     """Handle PDF file system events for processing."""
     
     def __init__(self, process_callback, logger=None):
         self.process_callback = process_callback
         self.logger = logger or SWNALogger()
-        self.processing_files = set()  # Track files currently being processed
+        # Path -> monotonic time processing finished (inf while still in progress).
+        # Bounded and time-limited so it cannot grow over long uptimes.
+        self.recent_files = OrderedDict()
+        
+        # Paths waiting out their debounce window, in deadline order
+        self._pending = OrderedDict()
+        self._cv = threading.Condition(threading.Lock())
+        self._running = True
+        # Single worker keeps processing serial while the observer thread returns immediately
+        self._worker = threading.Thread(target=self._drain, name="PDFFileHandler", daemon=True)
+        self._worker.start()
     
     def on_created(self, event):
         """Handle file creation events."""
@@ -26,36 +44,117 @@ class PDFFileHandler(FileSystemEventHandler):
     
     def _is_pdf_file(self, file_path):
         """Check if file is a PDF."""
-        return file_path.lower().endswith('.pdf')
+        return file_path[-4:].lower() == '.pdf'
     
     def _schedule_file_processing(self, file_path):
-        """Schedule file for processing with delay to ensure file is fully written."""
-        if file_path in self.processing_files:
-            self.logger.debug(f"File already being processed: {file_path}")
-            return
-        
-        self.processing_files.add(file_path)
-        self.logger.debug(f"Scheduling file for processing: {file_path}")
-        
-        # Small delay to ensure file is fully written
-        time.sleep(1)
-        
+        """Queue file for processing, coalescing bursts of events for the same path."""
+        with self._cv:
+            finished_at = self.recent_files.get(file_path)
+            if finished_at is not None:
+                if time.monotonic() - finished_at < RECENT_FILE_TTL:
+                    self.logger.debug("File already being processed: %s", file_path)
+                    return
+                del self.recent_files[file_path]
+            
+            if file_path not in self._pending:
+                self.logger.debug("Scheduling file for processing: %s", file_path)
+            
+            # Each new event restarts the quiet period and moves the path to the back
+            self._pending[file_path] = time.monotonic() + DEBOUNCE_SECONDS
+            self._pending.move_to_end(file_path)
+            self._cv.notify()
+    
+    def _drain(self):
+        """Worker loop: process each pending file once its debounce window has passed."""
+        while True:
+            with self._cv:
+                while self._running and not self._pending:
+                    self._cv.wait()
+                if not self._running:
+                    return
+                
+                file_path, deadline = next(iter(self._pending.items()))
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._cv.wait(remaining)
+                    continue
+                
+                del self._pending[file_path]
+                self._mark_recent(file_path, float('inf'))
+            
+            self._process_file(file_path)
+    
+    def _process_file(self, file_path):
+        """Wait for the file to finish writing, then hand it to the callback."""
+        handled = False
         try:
             # Verify file still exists and is readable
-            if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
+            if self._wait_for_stable_size(file_path):
+                handled = True
                 self.process_callback(file_path)
             else:
-                self.logger.debug(f"File no longer exists or is empty: {file_path}")
+                self.logger.debug("File no longer exists or is empty: %s", file_path)
+        except Exception as e:
+            self.logger.error(f"Error processing {file_path}: {str(e)}")
         finally:
-            self.processing_files.discard(file_path)
+            with self._cv:
+                if handled:
+                    # Keep ignoring late duplicate events for this path for a while
+                    self._mark_recent(file_path, time.monotonic())
+                else:
+                    # Not processed yet - let the next event for it through
+                    self.recent_files.pop(file_path, None)
+    
+    def _mark_recent(self, file_path, timestamp):
+        """Record a path as recently handled, evicting the oldest entry past the cap. Caller holds the lock."""
+        self.recent_files[file_path] = timestamp
+        self.recent_files.move_to_end(file_path)
+        if len(self.recent_files) > RECENT_FILES_MAX:
+            self.recent_files.popitem(last=False)
+    
+    def _wait_for_stable_size(self, file_path):
+        """
+        Poll file size until it is non-zero and unchanged between two checks.
+        Returns True once stable (or at the timeout if non-empty), False if missing or empty.
+        """
+        prev_size = -1
+        deadline = time.monotonic() + STABILITY_TIMEOUT
+        
+        while time.monotonic() < deadline:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                return False
+            if size == prev_size and size > 0:
+                return True
+            prev_size = size
+            time.sleep(STABILITY_POLL_INTERVAL)
+        
+        return prev_size > 0
+    
+    def shutdown(self, wait=True):
+        """
+        Stop the worker thread, optionally waiting for the current file to finish.
+        Files still in their debounce window are dropped; they are picked up by
+        process_existing_files on the next start.
+        """
+        with self._cv:
+            self._running = False
+            self._pending.clear()
+            self._cv.notify()
+        if wait:
+            self._worker.join()
 
 class FolderMonitor:
     """Monitor sync folder for new PDF files and trigger processing."""
     
-    def __init__(self, process_callback, logger=None):
+    def __init__(self, process_callback, logger=None, batch_callback=None):
         self.logger = logger or SWNALogger()
         self.process_callback = process_callback
+        # Optional: takes a list of paths; used for the startup backlog so it can be batched
+        self.batch_callback = batch_callback
         self.observer = None
+        self.event_handler = None
         self.is_running = False
         
         # Build monitoring paths
@@ -66,23 +165,17 @@ class FolderMonitor:
         paths = []
         
         try:
-            # Main daily temp scans path pattern
-            daily_scans_base = os.path.join(SYNC_FOLDER_PATH, "1. Daily Temp Scans")
-            
-            # Check if base path exists
-            if os.path.exists(daily_scans_base):
-                paths.append(daily_scans_base)
-                self.logger.debug(f"Added monitoring path: {daily_scans_base}")
-            
-            # Also look for dated folders (MM.DD.YY format)
-            parent_folder = os.path.join(SYNC_FOLDER_PATH)
-            if os.path.exists(parent_folder):
-                for item in os.listdir(parent_folder):
-                    if item.startswith("1. Daily Temp Scans"):
-                        full_path = os.path.join(parent_folder, item)
-                        if os.path.isdir(full_path) and full_path not in paths:
-                            paths.append(full_path)
-                            self.logger.debug(f"Added monitoring path: {full_path}")
+            # Main daily temp scans folder plus any dated variants (MM.DD.YY format).
+            # DirEntry carries the readdir file type, so is_dir() needs no extra stat.
+            base_name = "1. Daily Temp Scans"
+            with os.scandir(SYNC_FOLDER_PATH) as entries:
+                for entry in entries:
+                    if entry.name.startswith(base_name) and entry.is_dir():
+                        if entry.name == base_name:
+                            paths.insert(0, entry.path)
+                        else:
+                            paths.append(entry.path)
+                        self.logger.debug("Added monitoring path: %s", entry.path)
             
             if not paths:
                 self.logger.error("No valid monitoring paths found")
@@ -108,12 +201,13 @@ class FolderMonitor:
             
             # Set up file handler
             event_handler = PDFFileHandler(self.process_callback, self.logger)
+            self.event_handler = event_handler
             
             # Add watchers for each monitored path
             for path in self.monitored_paths:
                 if os.path.exists(path):
                     self.observer.schedule(event_handler, path, recursive=False)
-                    self.logger.info(f"Started monitoring: {path}")
+                    self.logger.info("Started monitoring: %s", path)
                 else:
                     self.logger.error(f"Cannot monitor non-existent path: {path}")
             
@@ -137,6 +231,9 @@ class FolderMonitor:
         try:
             self.observer.stop()
             self.observer.join(timeout=5)  # Wait up to 5 seconds for clean shutdown
+            if self.event_handler:
+                self.event_handler.shutdown()
+                self.event_handler = None
             self.is_running = False
             self.logger.info("Folder monitoring stopped")
             
@@ -147,46 +244,73 @@ class FolderMonitor:
         """Process any existing PDF files in monitored folders on startup."""
         self.logger.info("Processing existing files in monitored folders")
         
-        processed_count = 0
-        
+        # Scan every folder first so directory iteration never overlaps with
+        # the callback moving or renaming files out of it
+        ready_files = []
         for folder_path in self.monitored_paths:
             if not os.path.exists(folder_path):
                 continue
                 
             try:
-                for filename in os.listdir(folder_path):
-                    if filename.lower().endswith('.pdf'):
-                        file_path = os.path.join(folder_path, filename)
+                with os.scandir(folder_path) as entries:
+                    pdf_entries = [e for e in entries if e.name[-4:].lower() == '.pdf']
+                
+                for entry in pdf_entries:
+                    # Skip if file is currently being written (very recent)
+                    if self._is_file_ready(entry.path, entry):
+                        ready_files.append(entry.path)
+                    else:
+                        self.logger.debug("Skipping file still being written: %s", entry.path)
                         
-                        # Skip if file is currently being written (very recent)
-                        if self._is_file_ready(file_path):
-                            self.logger.debug(f"Processing existing file: {file_path}")
-                            self.process_callback(file_path)
-                            processed_count += 1
-                        else:
-                            self.logger.debug(f"Skipping file still being written: {file_path}")
-                            
             except Exception as e:
                 self.logger.error(f"Error processing existing files in {folder_path}: {str(e)}")
         
-        self.logger.info(f"Processed {processed_count} existing PDF files")
+        if self.batch_callback is not None and ready_files:
+            self.logger.debug("Processing %s existing files as a batch", len(ready_files))
+            try:
+                batch_result = self.batch_callback(ready_files)
+                results = getattr(batch_result, 'results', None)
+                if results is None:
+                    self.logger.info("Processed %s existing PDF files", len(ready_files))
+                    return
+                # Files the batch did not report on are retried one at a time below
+                ready_files = [path for path in ready_files if path not in results]
+                if not ready_files:
+                    self.logger.info("Processed %s existing PDF files", len(results))
+                    return
+            except Exception as e:
+                self.logger.error(f"Batch processing of existing files failed: {str(e)}")
+                # Files the batch already handled have been moved out of the folder
+                ready_files = [path for path in ready_files if os.path.exists(path)]
+            self.logger.info("Processing %s existing files individually", len(ready_files))
+        
+        # Without a batch callback (or after a failed batch), files are processed one at a time
+        processed_count = 0
+        for file_path in ready_files:
+            try:
+                self.logger.debug("Processing existing file: %s", file_path)
+                self.process_callback(file_path)
+                processed_count += 1
+            except Exception as e:
+                self.logger.error(f"Error processing existing file {file_path}: {str(e)}")
+        
+        self.logger.info("Processed %s existing PDF files", processed_count)
     
-    def _is_file_ready(self, file_path):
-        """Check if file is ready for processing (not currently being written)."""
+    def _is_file_ready(self, file_path, entry=None):
+        """
+        Check if file is ready for processing (not currently being written).
+        When a scandir DirEntry is given its cached stat is used instead of a fresh syscall.
+        """
         try:
-            # Check if file was modified recently (within last 5 seconds)
-            mod_time = os.path.getmtime(file_path)
-            current_time = time.time()
+            st = entry.stat() if entry is not None else os.stat(file_path)
             
-            if current_time - mod_time < 5:
+            # Check if file was modified recently (within last 5 seconds)
+            if time.time() - st.st_mtime < 5:
                 return False
             
             # Check if file has reasonable size
-            if os.path.getsize(file_path) == 0:
-                return False
-            
-            return True
+            return st.st_size > 0
             
         except Exception as e:
-            self.logger.debug(f"File readiness check failed for {file_path}: {str(e)}")
-            return False
\ No newline at end of file
+            self.logger.debug("File readiness check failed for %s: %s", file_path, e)
+            return False
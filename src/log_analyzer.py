@@ -4,12 +4,41 @@ Log Analysis and Query Tools for SWNA Automation
 Provides utilities to search, filter, and analyze structured log files.
 """
 
+import argparse
+import copy
+import gzip
 import json
 import os
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Callable, Iterator, Optional, Union
 from dataclasses import dataclass
 from enum import Enum
+from itertools import islice, repeat
+from src.bloom_filter import BloomFilter
+from src.logger import default_logs_dir
+from src.log_rotator import BLOOM_SUFFIX, INDEX_SUFFIX
+
+try:
+    # Optional C JSON parser; several times faster than json.loads on log lines
+    import orjson
+except ImportError:
+    orjson = None
+
+JSONL_READ_BUFFER = 1 << 20  # 1 MB read buffer for streaming large log files
+SEEK_MIN_SPAN = 64 * 1024  # Stop binary searching once the window is this many bytes
+SEEK_PROBE_LINES = 16  # Lines to try after a probe offset before giving up on finding a timestamp
+SEEK_SAFETY_MARGIN = timedelta(hours=2)  # Slack around time windows for out-of-order entries
+TIMESTAMP_LINE_PREFIXES = (b'{"timestamp": "', b'{"timestamp":"')  # How SWNALogger starts every line (json / orjson spacing)
+FILENAME_FIELDS = ("filename", "original_filename", "new_filename")  # Fields searched by LogQuery.filename
+ARCHIVE_INDEX_VERSION = 2  # Bump when the per-day stats layout changes so old indexes are rebuilt
+STATS_COUNTER_KEYS = ("total_files", "processed", "renamed", "ignored", "failed",
+                      "airtable_updates", "file_moves")
+ACTION_TYPE_COUNTERS = {"airtable_update": "airtable_updates",  # action_type -> stats counter it bumps
+                        "file_moved": "file_moves"}
+STATS_CACHE_SIZE = 64  # Memoized get_processing_stats results kept per analyzer
+STATS_DETAIL_KEYS = ("processed_files", "renamed_files", "ignored_files", "failed_files")
 
 @dataclass
 class LogQuery:
@@ -30,79 +59,222 @@ class LogAnalyzer:
     def __init__(self, logs_dir: str = None):
         if logs_dir is None:
             # Default to logs directory relative to this file
-            logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
+            logs_dir = default_logs_dir()
         
         self.logs_dir = logs_dir
         self.audit_log_file = os.path.join(logs_dir, "audit.jsonl")
         self.performance_log_file = os.path.join(logs_dir, "performance.jsonl")
+        self.archive_dir = os.path.join(logs_dir, "archive")
+        # (date, details, filters, log state) -> stats; reused while the logs are unchanged
+        self._stats_cache = OrderedDict()
     
-    def _read_jsonl_file(self, file_path: str) -> List[Dict[str, Any]]:
-        """Read and parse JSONL file, returning list of log entries."""
-        entries = []
+    def _iter_jsonl_file(self, file_path: str, start_ts: str = None,
+                         end_ts: str = None, skip_before: str = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream parsed entries from a JSONL file (optionally .gz) one line at a time.
+        start_ts seeks past older entries; end_ts stops at the first newer entry.
+        Both rely on the logs being appended in timestamp order.
+        Lines written by SWNALogger with a timestamp before skip_before are dropped
+        without being parsed; callers must filter those entries out anyway.
+        """
         if not os.path.exists(file_path):
-            return entries
+            return
+        
+        skip_before_bytes = skip_before.encode("utf-8") if skip_before else None
+        
+        # Archived logs are gzipped; they are read front to back without seeking
+        compressed = file_path.endswith('.gz')
             
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            if compressed:
+                log_file = gzip.open(file_path, 'rb')
+            else:
+                log_file = open(file_path, 'rb', buffering=JSONL_READ_BUFFER)
+            
+            with log_file as f:
+                if start_ts and not compressed:
+                    f.seek(self._seek_to_timestamp(f, start_ts))
+                
+                # Buffered binary iteration splits lines in C and hands bytes straight
+                # to the parser; it measured faster than mmap or manual chunk splitting
                 for line in f:
                     line = line.strip()
                     if line:
+                        if skip_before_bytes and line.startswith(TIMESTAMP_LINE_PREFIXES):
+                            # Compare the raw timestamp bytes before paying for a parse
+                            ts_start = line.find(b'"', 13) + 1
+                            close = line.find(b'"', ts_start)
+                            raw_ts = line[ts_start:close]
+                            if close > 0 and raw_ts < skip_before_bytes and b"\\" not in raw_ts:
+                                continue
                         try:
-                            entries.append(json.loads(line))
+                            entry = self._parse_json_line(line)
                         except json.JSONDecodeError as e:
-                            print(f"Warning: Invalid JSON line: {line[:100]}... Error: {e}")
+                            print(f"Warning: Invalid JSON line: {line.decode('utf-8', 'replace')[:100]}... Error: {e}")
                             continue
+                        if end_ts and isinstance(entry, dict) and entry.get("timestamp", "") > end_ts:
+                            return
+                        yield entry
         except Exception as e:
             print(f"Error reading log file {file_path}: {e}")
-            
-        return entries
     
-    def query_audit_logs(self, query: LogQuery) -> List[Dict[str, Any]]:
-        """Query audit logs with filtering parameters."""
-        entries = self._read_jsonl_file(self.audit_log_file)
-        filtered_entries = []
+    def _parse_json_line(self, line: bytes) -> Any:
+        """Parse one JSONL line, using orjson when installed."""
+        if orjson is not None:
+            try:
+                return orjson.loads(line)
+            except orjson.JSONDecodeError:
+                # orjson is stricter (e.g. NaN, huge ints); let the stdlib decide
+                pass
+        return json.loads(line)
+    
+    def _seek_to_timestamp(self, f, start_ts: str) -> int:
+        """
+        Binary search a JSONL file for the offset of the first line with timestamp >= start_ts.
+        ISO-8601 timestamps compare correctly as strings. Returns a line-aligned byte offset.
+        """
+        lo, hi = 0, os.fstat(f.fileno()).st_size
         
-        for entry in entries:
-            # Apply filters
-            if query.action_type and entry.get("action_type") != query.action_type:
-                continue
-                
-            if query.start_date:
-                entry_date = entry.get("timestamp", "")
-                if entry_date < query.start_date:
-                    continue
-                    
-            if query.end_date:
-                entry_date = entry.get("timestamp", "")
-                if entry_date > query.end_date:
-                    continue
-                    
-            if query.client_name:
-                if query.client_name.lower() not in entry.get("client_name", "").lower():
-                    continue
-                    
-            if query.case_id and entry.get("case_id") != query.case_id:
-                continue
-                
-            if query.filename:
-                filename_fields = [entry.get("filename", ""), entry.get("original_filename", ""), 
-                                 entry.get("new_filename", "")]
-                if not any(query.filename.lower() in field.lower() for field in filename_fields):
-                    continue
-                    
-            if query.status and entry.get("status") != query.status:
-                continue
-                
-            if query.session_id and entry.get("session_id") != query.session_id:
+        while hi - lo > SEEK_MIN_SPAN:
+            mid = (lo + hi) // 2
+            timestamp = self._timestamp_after(f, mid)
+            if timestamp is None or timestamp >= start_ts:
+                hi = mid
+            else:
+                lo = mid
+        
+        if lo == 0:
+            return 0
+        
+        # Everything before the first full line after lo is older than start_ts
+        f.seek(lo)
+        f.readline()
+        return f.tell()
+    
+    def _timestamp_after(self, f, offset: int) -> Optional[str]:
+        """Return the timestamp of the first complete, parseable line after offset."""
+        f.seek(offset)
+        f.readline()  # Skip the partial line we landed in
+        
+        for _ in range(SEEK_PROBE_LINES):
+            line = f.readline()
+            if not line:
+                return None
+            try:
+                timestamp = self._parse_json_line(line).get("timestamp")
+            except (ValueError, AttributeError):
                 continue
-            
-            filtered_entries.append(entry)
+            if timestamp:
+                return timestamp
         
-        # Apply limit
+        return None
+    
+    def _shift_timestamp(self, timestamp: str, delta: timedelta) -> Optional[str]:
+        """Shift an ISO timestamp by delta, or None if it can't be parsed."""
+        try:
+            return (datetime.fromisoformat(timestamp) + delta).isoformat()
+        except ValueError:
+            return None
+    
+    def _read_jsonl_file(self, file_path: str) -> List[Dict[str, Any]]:
+        """Read and parse JSONL file, returning list of log entries."""
+        return list(self._iter_jsonl_file(file_path))
+    
+    def query_audit_logs(self, query: LogQuery) -> List[Dict[str, Any]]:
+        """Query audit logs with filtering parameters."""
+        entries = self._iter_audit_entries(query)
+        
+        # With a limit only the newest matches are kept, so memory stays bounded
         if query.limit:
-            filtered_entries = filtered_entries[-query.limit:]
+            return list(deque(entries, maxlen=query.limit))
+        return list(entries)
+    
+    def _iter_audit_entries(self, query: LogQuery, file_path: str = None) -> Iterator[Dict[str, Any]]:
+        """Stream audit log entries matching the query (its limit is ignored)."""
+        if file_path is None:
+            file_path = self.audit_log_file
+        
+        # Seek and stop a little outside the requested window so entries logged
+        # slightly out of order (e.g. across a DST change) are still seen; the
+        # exact date filters below still apply
+        start_ts = end_ts = None
+        if query.start_date:
+            start_ts = self._shift_timestamp(query.start_date, -SEEK_SAFETY_MARGIN)
+        if query.end_date:
+            end_ts = self._shift_timestamp(query.end_date, SEEK_SAFETY_MARGIN)
+        
+        predicates = self._build_query_predicates(query)
+        
+        for entry in self._iter_jsonl_file(file_path, start_ts, end_ts, query.start_date):
+            if all(predicate(entry) for predicate in predicates):
+                yield entry
+    
+    def _iter_day_entries(self, date: str, file_path: str = None) -> Iterator[Dict[str, Any]]:
+        """Stream audit log entries whose timestamp falls on date (YYYY-MM-DD)."""
+        if file_path is None:
+            file_path = self.audit_log_file
+        
+        # Same seek/stop slack as _iter_audit_entries; every timestamp on the day
+        # shares the date prefix, so one startswith replaces two range compares
+        start_ts = self._shift_timestamp(f"{date}T00:00:00", -SEEK_SAFETY_MARGIN)
+        end_ts = self._shift_timestamp(f"{date}T23:59:59", SEEK_SAFETY_MARGIN)
+        
+        for entry in self._iter_jsonl_file(file_path, start_ts, end_ts, date):
+            if entry.get("timestamp", "").startswith(date):
+                yield entry
+    
+    def _build_query_predicates(self, query: LogQuery) -> List[Callable[[Dict[str, Any]], bool]]:
+        """
+        Build one predicate per filter the query actually sets, cheapest first so
+        most entries are rejected before any string lowercasing happens.
+        Search values are prepared here once instead of for every log entry.
+        """
+        predicates = []
+        
+        # Exact matches first: a single dict lookup and compare, and usually the most selective
+        if query.action_type:
+            action_type = query.action_type
+            predicates.append(lambda entry: entry.get("action_type") == action_type)
+        
+        if query.case_id:
+            case_id = query.case_id
+            predicates.append(lambda entry: entry.get("case_id") == case_id)
+        
+        if query.session_id:
+            session_id = query.session_id
+            predicates.append(lambda entry: entry.get("session_id") == session_id)
+        
+        if query.status:
+            status = query.status
+            predicates.append(lambda entry: entry.get("status") == status)
+        
+        # Timestamp range: plain string comparisons
+        if query.start_date:
+            start_date = query.start_date
+            predicates.append(lambda entry: entry.get("timestamp", "") >= start_date)
+        
+        if query.end_date:
+            end_date = query.end_date
+            predicates.append(lambda entry: entry.get("timestamp", "") <= end_date)
+        
+        # Substring searches last since they lowercase entry fields
+        if query.client_name:
+            client_needle = query.client_name.lower()
+            predicates.append(lambda entry: client_needle in entry.get("client_name", "").lower())
+        
+        if query.filename:
+            filename_needle = query.filename.lower()
             
-        return filtered_entries
+            def matches_filename(entry):
+                # Fetch and lowercase each field only until one matches
+                for key in FILENAME_FIELDS:
+                    if filename_needle in entry.get(key, "").lower():
+                        return True
+                return False
+            
+            predicates.append(matches_filename)
+        
+        return predicates
     
     def get_recent_activity(self, hours: int = 24) -> List[Dict[str, Any]]:
         """Get all activity from the last N hours."""
@@ -119,12 +291,54 @@ class LogAnalyzer:
         if filters is None:
             filters = {}
         
-        start_date = f"{date}T00:00:00"
-        end_date = f"{date}T23:59:59"
+        cache_key = (date, include_details, tuple(sorted(filters.items())), self._log_state())
+        stats = self._stats_cache.get(cache_key)
+        if stats is None:
+            stats = self._compute_processing_stats(date, include_details, filters)
+            self._stats_cache[cache_key] = stats
+            if len(self._stats_cache) > STATS_CACHE_SIZE:
+                self._stats_cache.popitem(last=False)
+        else:
+            self._stats_cache.move_to_end(cache_key)
+        
+        # Callers get their own copy so the cached result can't be modified
+        return copy.deepcopy(stats)
+    
+    def _log_state(self) -> tuple:
+        """Fingerprint of the live audit log and archive directory; changes on any append or rotation."""
+        state = []
+        for path in (self.audit_log_file, self.archive_dir):
+            try:
+                st = os.stat(path)
+                state.append((st.st_ino, st.st_size, st.st_mtime_ns))
+            except OSError:
+                state.append(None)
+        return tuple(state)
+    
+    def _compute_processing_stats(self, date: str, include_details: bool,
+                                  filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Build processing statistics for one date from the archive indexes and live log."""
+        stats = self._new_stats(date, include_details)
         
-        query = LogQuery(start_date=start_date, end_date=end_date)
-        entries = self.query_audit_logs(query)
+        # Parts of the day already rotated out of the live log come from the
+        # small per-archive indexes instead of re-reading the archives
+        for archive_path in self._get_audit_archives():
+            day_stats = self._load_archive_index(archive_path).get(date)
+            if day_stats:
+                self._merge_day_stats(stats, day_stats, include_details, filters)
         
+        # Aggregate straight off the log stream; no intermediate entry list
+        for entry in self._iter_day_entries(date):
+            self._accumulate_entry(stats, entry, include_details, filters)
+        
+        # Convert sets to counts
+        stats["unique_clients"] = len(stats["unique_clients"])
+        stats["unique_cases"] = len(stats["unique_cases"])
+        
+        return stats
+    
+    def _new_stats(self, date: str, include_details: bool) -> Dict[str, Any]:
+        """Empty stats accumulator for one day."""
         stats = {
             "date": date,
             "total_files": 0,
@@ -148,95 +362,159 @@ class LogAnalyzer:
             stats["ignored_files"] = []
             stats["failed_files"] = []
         
-        for entry in entries:
-            action = entry.get("action", "")
-            status = entry.get("status", "")
-            
-            if action == "processing_started":
-                stats["total_files"] += 1
-            elif status == "SUCCESS" and entry.get("action_type") == "file_processed":
-                # Check if this was a rename-only operation or full processing
-                destination = entry.get("destination_folder", "")
-                if "Temp Folder (Renamed Only)" in destination:
-                    stats["renamed"] += 1
-                    if include_details:
-                        file_info = {
-                            "filename": entry.get("new_filename", entry.get("filename", "")),
-                            "original_filename": entry.get("original_filename", ""),
-                            "case_id": entry.get("case_id", ""),
-                            "client_name": entry.get("client_name", ""),
-                            "timestamp": entry.get("timestamp", ""),
-                            "document_type": entry.get("document_type", ""),
-                            "confidence": entry.get("classification_confidence", 0.0),
-                            "classification_reason": entry.get("classification_reason", "")
-                        }
-                        # Apply filters
-                        if self._matches_filters(file_info, filters):
-                            stats["renamed_files"].append(file_info)
-                else:
-                    stats["processed"] += 1
-                    if include_details:
-                        file_info = {
-                            "filename": entry.get("new_filename", entry.get("filename", "")),
-                            "original_filename": entry.get("original_filename", ""),
-                            "case_id": entry.get("case_id", ""),
-                            "client_name": entry.get("client_name", ""),
-                            "timestamp": entry.get("timestamp", ""),
-                            "destination_folder": entry.get("destination_folder", ""),
-                            "document_type": "AR Ack",
-                            "confidence": 1.0
-                        }
-                        # Apply filters
-                        if self._matches_filters(file_info, filters):
-                            stats["processed_files"].append(file_info)
-                
-                # Track document types
-                doc_type = entry.get("document_type", "AR Ack")
-                stats["document_types"][doc_type] = stats["document_types"].get(doc_type, 0) + 1
-                
-            elif status == "IGNORED":
-                stats["ignored"] += 1
+        return stats
+    
+    def _accumulate_entry(self, stats: Dict[str, Any], entry: Dict[str, Any],
+                          include_details: bool, filters: Dict[str, Any]):
+        """Fold one audit entry into a stats accumulator."""
+        get = entry.get
+        action = get("action", "")
+        status = get("status", "")
+        
+        if action == "processing_started":
+            stats["total_files"] += 1
+        elif status == "SUCCESS" and get("action_type") == "file_processed":
+            # Check if this was a rename-only operation or full processing
+            destination = get("destination_folder", "")
+            if "Temp Folder (Renamed Only)" in destination:
+                stats["renamed"] += 1
+                if include_details:
+                    file_info = {
+                        "filename": get("new_filename", get("filename", "")),
+                        "original_filename": get("original_filename", ""),
+                        "case_id": get("case_id", ""),
+                        "client_name": get("client_name", ""),
+                        "timestamp": get("timestamp", ""),
+                        "document_type": get("document_type", ""),
+                        "confidence": get("classification_confidence", 0.0),
+                        "classification_reason": get("classification_reason", "")
+                    }
+                    # Apply filters
+                    if self._matches_filters(file_info, filters):
+                        stats["renamed_files"].append(file_info)
+            else:
+                stats["processed"] += 1
                 if include_details:
                     file_info = {
-                        "filename": entry.get("filename", ""),
-                        "reason": entry.get("ignore_reason", ""),
-                        "timestamp": entry.get("timestamp", ""),
-                        "document_type": entry.get("document_type", "Unknown"),
-                        "confidence": entry.get("classification_confidence", 0.0)
+                        "filename": get("new_filename", get("filename", "")),
+                        "original_filename": get("original_filename", ""),
+                        "case_id": get("case_id", ""),
+                        "client_name": get("client_name", ""),
+                        "timestamp": get("timestamp", ""),
+                        "destination_folder": get("destination_folder", ""),
+                        "document_type": "AR Ack",
+                        "confidence": 1.0
                     }
                     # Apply filters
                     if self._matches_filters(file_info, filters):
-                        stats["ignored_files"].append(file_info)
-                        
-            elif status == "FAILED":
-                stats["failed"] += 1
-                error_info = {
-                    "filename": entry.get("filename", ""),
-                    "reason": entry.get("failure_reason", ""),
-                    "timestamp": entry.get("timestamp", ""),
-                    "document_type": entry.get("document_type", ""),
-                    "confidence": entry.get("classification_confidence", 0.0)
+                        stats["processed_files"].append(file_info)
+            
+            # Track document types
+            doc_type = get("document_type", "AR Ack")
+            stats["document_types"][doc_type] = stats["document_types"].get(doc_type, 0) + 1
+            
+        elif status == "IGNORED":
+            stats["ignored"] += 1
+            if include_details:
+                file_info = {
+                    "filename": get("filename", ""),
+                    "reason": get("ignore_reason", ""),
+                    "timestamp": get("timestamp", ""),
+                    "document_type": get("document_type", "Unknown"),
+                    "confidence": get("classification_confidence", 0.0)
                 }
-                stats["errors"].append(error_info)
-                if include_details and self._matches_filters(error_info, filters):
-                    stats["failed_files"].append(error_info)
+                # Apply filters
+                if self._matches_filters(file_info, filters):
+                    stats["ignored_files"].append(file_info)
                     
-            elif entry.get("action_type") == "airtable_update":
-                stats["airtable_updates"] += 1
-            elif entry.get("action_type") == "file_moved":
-                stats["file_moves"] += 1
+        elif status == "FAILED":
+            stats["failed"] += 1
+            error_info = {
+                "filename": get("filename", ""),
+                "reason": get("failure_reason", ""),
+                "timestamp": get("timestamp", ""),
+                "document_type": get("document_type", ""),
+                "confidence": get("classification_confidence", 0.0)
+            }
+            stats["errors"].append(error_info)
+            if include_details and self._matches_filters(error_info, filters):
+                stats["failed_files"].append(error_info)
+                
+        else:
+            counter_key = ACTION_TYPE_COUNTERS.get(get("action_type"))
+            if counter_key:
+                stats[counter_key] += 1
+        
+        # Track unique clients and cases
+        client_name = get("client_name")
+        if client_name:
+            stats["unique_clients"].add(client_name)
+        case_id = get("case_id")
+        if case_id:
+            stats["unique_cases"].add(case_id)
+    
+    def _merge_day_stats(self, stats: Dict[str, Any], day_stats: Dict[str, Any],
+                         include_details: bool, filters: Dict[str, Any]):
+        """Merge a day's indexed stats (built unfiltered, with details) into an accumulator."""
+        for key in STATS_COUNTER_KEYS:
+            stats[key] += day_stats.get(key, 0)
+        
+        stats["unique_clients"].update(day_stats.get("unique_clients", []))
+        stats["unique_cases"].update(day_stats.get("unique_cases", []))
+        stats["errors"].extend(day_stats.get("errors", []))
+        
+        for doc_type, count in day_stats.get("document_types", {}).items():
+            stats["document_types"][doc_type] = stats["document_types"].get(doc_type, 0) + count
+        
+        if include_details:
+            for key in STATS_DETAIL_KEYS:
+                stats[key].extend(file_info for file_info in day_stats.get(key, [])
+                                  if self._matches_filters(file_info, filters))
+    
+    def build_archive_index(self, archive_path: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Scan an archived audit log once and write per-day stats next to it.
+        Returns the {date: stats} mapping that was written.
+        """
+        days = {}
+        for entry in self._iter_jsonl_file(archive_path):
+            timestamp = entry.get("timestamp", "") if isinstance(entry, dict) else ""
+            if not isinstance(timestamp, str) or not timestamp:
+                continue
             
-            # Track unique clients and cases
-            if entry.get("client_name"):
-                stats["unique_clients"].add(entry["client_name"])
-            if entry.get("case_id"):
-                stats["unique_cases"].add(entry["case_id"])
+            # Bucketed by date prefix, as _iter_day_entries matches live entries
+            # (so 23:59:59.xxx entries count toward their own day)
+            day = timestamp[:10]
+            
+            if day not in days:
+                days[day] = self._new_stats(day, include_details=True)
+            self._accumulate_entry(days[day], entry, True, {})
         
-        # Convert sets to counts
-        stats["unique_clients"] = len(stats["unique_clients"])
-        stats["unique_cases"] = len(stats["unique_cases"])
+        for day_stats in days.values():
+            day_stats["unique_clients"] = list(day_stats["unique_clients"])
+            day_stats["unique_cases"] = list(day_stats["unique_cases"])
         
-        return stats
+        index_path = archive_path + INDEX_SUFFIX
+        temp_path = f"{index_path}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": ARCHIVE_INDEX_VERSION, "days": days}, f, default=str)
+            os.replace(temp_path, index_path)
+        except OSError as e:
+            print(f"Warning: Could not write archive index {index_path}: {e}")
+        
+        return days
+    
+    def _load_archive_index(self, archive_path: str) -> Dict[str, Dict[str, Any]]:
+        """Per-day stats for an archive, building the index on first use if it is missing."""
+        try:
+            with open(archive_path + INDEX_SUFFIX, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get("version") == ARCHIVE_INDEX_VERSION:
+                return index["days"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        return self.build_archive_index(archive_path)
     
     def _matches_filters(self, file_info: Dict[str, Any], filters: Dict[str, Any]) -> bool:
         """Check if file_info matches the provided filters."""
@@ -261,28 +539,33 @@ class LogAnalyzer:
     
     def format_verbose_stats(self, stats: Dict[str, Any], filter_type: str = "all") -> str:
         """Format processing stats with verbose details for specific action types."""
-        output = []
-        
+        return "\n".join(self.iter_verbose_stats(stats, filter_type)).strip()
+    
+    def iter_verbose_stats(self, stats: Dict[str, Any], filter_type: str = "all") -> Iterator[str]:
+        """
+        Yield the lines of format_verbose_stats one at a time, so callers that
+        only show the first few lines don't format every file.
+        """
         # Header with summary
-        output.append(f"Processing stats for {stats['date']}:")
-        output.append(f"Total: {stats['total_files']}, Processed: {stats['processed']}, "
+        yield f"Processing stats for {stats['date']}:"
+        yield (f"Total: {stats['total_files']}, Processed: {stats['processed']}, "
                      f"Renamed: {stats.get('renamed', 0)}, Ignored: {stats['ignored']}, Failed: {stats['failed']}")
         
         # Document type breakdown
         if stats.get('document_types'):
-            output.append(f"\nDocument Types:")
+            yield f"\nDocument Types:"
             for doc_type, count in sorted(stats['document_types'].items()):
-                output.append(f"  • {doc_type}: {count}")
+                yield f"  • {doc_type}: {count}"
         
-        output.append("")
+        yield ""
         
         # Show filtered results
         if filter_type in ["all", "processed"] and stats.get("processed_files"):
             if filter_type == "processed":
-                output.append(f"Showing PROCESSED files only ({len(stats['processed_files'])} of {stats['total_files']} total)")
+                yield f"Showing PROCESSED files only ({len(stats['processed_files'])} of {stats['total_files']} total)"
             else:
-                output.append("PROCESSED FILES:")
-            output.append("")
+                yield "PROCESSED FILES:"
+            yield ""
             
             for file_info in stats["processed_files"]:
                 timestamp = file_info["timestamp"][:16] if file_info["timestamp"] else "Unknown"
@@ -290,15 +573,15 @@ class LogAnalyzer:
                 case_id = file_info["case_id"]
                 client_name = file_info["client_name"]
                 
-                output.append(f"[{timestamp}] ✅ {filename} | Case: {case_id} | Client: {client_name}")
-            output.append("")
+                yield f"[{timestamp}] ✅ {filename} | Case: {case_id} | Client: {client_name}"
+            yield ""
         
         if filter_type in ["all", "renamed"] and stats.get("renamed_files"):
             if filter_type == "renamed":
-                output.append(f"Showing RENAMED files only ({len(stats['renamed_files'])} of {stats['total_files']} total)")
+                yield f"Showing RENAMED files only ({len(stats['renamed_files'])} of {stats['total_files']} total)"
             else:
-                output.append("RENAMED FILES:")
-            output.append("")
+                yield "RENAMED FILES:"
+            yield ""
             
             for file_info in stats["renamed_files"]:
                 timestamp = file_info["timestamp"][:16] if file_info["timestamp"] else "Unknown"
@@ -308,48 +591,46 @@ class LogAnalyzer:
                 doc_type = file_info.get("document_type", "Unknown")
                 confidence = file_info.get("confidence", 0.0)
                 
-                output.append(f"[{timestamp}] 🔄 {filename} | Type: {doc_type} ({confidence:.2f}) | Case: {case_id} | Client: {client_name}")
-            output.append("")
+                yield f"[{timestamp}] 🔄 {filename} | Type: {doc_type} ({confidence:.2f}) | Case: {case_id} | Client: {client_name}"
+            yield ""
         
         if filter_type in ["all", "ignored"] and stats.get("ignored_files"):
             if filter_type == "ignored":
-                output.append(f"Showing IGNORED files only ({len(stats['ignored_files'])} of {stats['total_files']} total)")
+                yield f"Showing IGNORED files only ({len(stats['ignored_files'])} of {stats['total_files']} total)"
             else:
-                output.append("IGNORED FILES:")
-            output.append("")
+                yield "IGNORED FILES:"
+            yield ""
             
             for file_info in stats["ignored_files"]:
                 timestamp = file_info["timestamp"][:16] if file_info["timestamp"] else "Unknown"
                 filename = file_info["filename"]
                 reason = file_info["reason"]
                 
-                output.append(f"[{timestamp}] ❌ {filename} | Reason: {reason}")
-            output.append("")
+                yield f"[{timestamp}] ❌ {filename} | Reason: {reason}"
+            yield ""
         
         if filter_type in ["all", "failed"] and stats.get("failed_files"):
             if filter_type == "failed":
-                output.append(f"Showing FAILED files only ({len(stats['failed_files'])} of {stats['total_files']} total)")
+                yield f"Showing FAILED files only ({len(stats['failed_files'])} of {stats['total_files']} total)"
             else:
-                output.append("FAILED FILES:")
-            output.append("")
+                yield "FAILED FILES:"
+            yield ""
             
             for file_info in stats["failed_files"]:
                 timestamp = file_info["timestamp"][:16] if file_info["timestamp"] else "Unknown"
                 filename = file_info["filename"]
                 reason = file_info["reason"]
                 
-                output.append(f"[{timestamp}] ⚠️  {filename} | Error: {reason}")
-            output.append("")
+                yield f"[{timestamp}] ⚠️  {filename} | Error: {reason}"
+            yield ""
         
         # Handle cases where no files match the filter
         if filter_type == "processed" and not stats.get("processed_files"):
-            output.append("No processed files found for this date.")
+            yield "No processed files found for this date."
         elif filter_type == "ignored" and not stats.get("ignored_files"):
-            output.append("No ignored files found for this date.")
+            yield "No ignored files found for this date."
         elif filter_type == "failed" and not stats.get("failed_files"):
-            output.append("No failed files found for this date.")
-        
-        return "\n".join(output).strip()
+            yield "No failed files found for this date."
     
     def find_client_activity(self, client_name: str, days: int = 30) -> List[Dict[str, Any]]:
         """Find all activity for a specific client in the last N days."""
@@ -357,10 +638,50 @@ class LogAnalyzer:
         query = LogQuery(client_name=client_name, start_date=start_date)
         return self.query_audit_logs(query)
     
-    def find_case_activity(self, case_id: str) -> List[Dict[str, Any]]:
-        """Find all activity for a specific case ID."""
+    def find_case_activity(self, case_id: str, include_archives: bool = False) -> List[Dict[str, Any]]:
+        """
+        Find all activity for a specific case ID.
+        With include_archives, rotated audit logs are searched too (oldest first),
+        skipping any archive whose Bloom filter sidecar rules the case out.
+        """
         query = LogQuery(case_id=case_id)
-        return self.query_audit_logs(query)
+        if not include_archives:
+            return self.query_audit_logs(query)
+        
+        candidates = [archive_path for archive_path in self._get_audit_archives()
+                      if self._archive_may_contain(archive_path, case_id)]
+        
+        entries = []
+        if len(candidates) > 1:
+            # Decompressing and parsing archives is CPU-bound, so scan them in
+            # separate processes; map() keeps the results in archive order
+            workers = min(len(candidates), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for archive_entries in executor.map(_scan_archive, repeat(self.logs_dir),
+                                                    candidates, repeat(query)):
+                    entries.extend(archive_entries)
+        else:
+            for archive_path in candidates:
+                entries.extend(self._iter_audit_entries(query, archive_path))
+        
+        entries.extend(self._iter_audit_entries(query))
+        return entries
+    
+    def _get_audit_archives(self) -> List[str]:
+        """Rotated audit logs, oldest first (archive names embed a sortable timestamp)."""
+        if not os.path.isdir(self.archive_dir):
+            return []
+        names = sorted(name for name in os.listdir(self.archive_dir)
+                       if name.startswith("audit_") and name.endswith(".jsonl.gz"))
+        return [os.path.join(self.archive_dir, name) for name in names]
+    
+    def _archive_may_contain(self, archive_path: str, case_id: str) -> bool:
+        """Check an archive's Bloom filter sidecar; archives without one are always searched."""
+        try:
+            bloom = BloomFilter.load(archive_path + BLOOM_SUFFIX)
+        except (OSError, ValueError):
+            return True
+        return str(case_id) in bloom
     
     def find_errors(self, hours: int = 24) -> List[Dict[str, Any]]:
         """Find all errors in the last N hours."""
@@ -370,12 +691,10 @@ class LogAnalyzer:
     
     def get_performance_data(self, operation: str = None, hours: int = 24) -> List[Dict[str, Any]]:
         """Get performance data for specific operations."""
-        entries = self._read_jsonl_file(self.performance_log_file)
-        
         start_time = (datetime.now() - timedelta(hours=hours)).isoformat()
         filtered_entries = []
         
-        for entry in entries:
+        for entry in self._iter_jsonl_file(self.performance_log_file):
             if entry.get("timestamp", "") < start_time:
                 continue
                 
@@ -422,18 +741,99 @@ class LogAnalyzer:
         
         return report
 
+def _scan_archive(logs_dir: str, archive_path: str, query: LogQuery) -> List[Dict[str, Any]]:
+    """Worker for parallel archive searches; module level so process pools can pickle it."""
+    return list(LogAnalyzer(logs_dir)._iter_audit_entries(query, archive_path))
+
+def _cli_recent(analyzer: LogAnalyzer, args):
+    entries = analyzer.get_recent_activity(args.hours)
+    print(f"Found {len(entries)} entries in the last {args.hours} hours:")
+    for entry in entries[-10:]:  # Show last 10
+        print(f"[{entry.get('timestamp', '')[:16]}] {entry.get('action', '')} - {entry.get('status', '')}")
+
+def _cli_stats(analyzer: LogAnalyzer, args):
+    # Build filters from command line arguments
+    filters = {}
+    if getattr(args, 'document_type', None):
+        filters['document_type'] = args.document_type
+    if getattr(args, 'min_confidence', None) is not None:
+        filters['min_confidence'] = args.min_confidence
+    if getattr(args, 'max_confidence', None) is not None:
+        filters['max_confidence'] = args.max_confidence
+        
+    if args.verbose:
+        # Get detailed stats and format with verbose output
+        stats = analyzer.get_processing_stats(args.date, include_details=True, filters=filters)
+        if args.limit:
+            # Only format as many lines as will be shown
+            for line in islice(analyzer.iter_verbose_stats(stats, args.filter), args.limit):
+                print(line)
+        else:
+            formatted_output = analyzer.format_verbose_stats(stats, args.filter)
+            print(formatted_output)
+    else:
+        # Simple stats output (enhanced with document types)
+        stats = analyzer.get_processing_stats(args.date, filters=filters)
+        print(f"Processing stats for {stats['date']}:")
+        print(f"Total: {stats['total_files']}, Processed: {stats['processed']}, "
+              f"Renamed: {stats.get('renamed', 0)}, Ignored: {stats['ignored']}, Failed: {stats['failed']}")
+        
+        # Show document type breakdown
+        if stats.get('document_types'):
+            print(f"\nDocument Types:")
+            for doc_type, count in sorted(stats['document_types'].items()):
+                print(f"  • {doc_type}: {count}")
+
+def _cli_client(analyzer: LogAnalyzer, args):
+    if not args.client:
+        print("Error: --client required for client action")
+        return
+    entries = analyzer.find_client_activity(args.client)
+    print(f"Found {len(entries)} entries for client '{args.client}':")
+    for entry in entries[-5:]:  # Show last 5
+        print(f"[{entry.get('timestamp', '')[:16]}] {entry.get('action', '')} - {entry.get('status', '')}")
+
+def _cli_case(analyzer: LogAnalyzer, args):
+    if not args.case:
+        print("Error: --case required for case action")
+        return
+    entries = analyzer.find_case_activity(args.case, include_archives=args.include_archives)
+    print(f"Found {len(entries)} entries for case '{args.case}':")
+    for entry in entries:
+        print(f"[{entry.get('timestamp', '')[:16]}] {entry.get('action', '')} - {entry.get('status', '')}")
+
+def _cli_errors(analyzer: LogAnalyzer, args):
+    errors = analyzer.find_errors(args.hours)
+    print(f"Found {len(errors)} errors in the last {args.hours} hours:")
+    for error in errors:
+        print(f"[{error.get('timestamp', '')[:16]}] {error.get('filename', '')} - {error.get('failure_reason', '')}")
+
+def _cli_report(analyzer: LogAnalyzer, args):
+    report = analyzer.generate_daily_report(args.date)
+    print(report)
+
+# CLI action name -> handler
+CLI_ACTIONS = {
+    "recent": _cli_recent,
+    "stats": _cli_stats,
+    "client": _cli_client,
+    "case": _cli_case,
+    "errors": _cli_errors,
+    "report": _cli_report,
+}
+
 def main():
     """CLI interface for log analysis."""
-    import argparse
-    
     parser = argparse.ArgumentParser(description="SWNA Automation Log Analyzer")
-    parser.add_argument("--action", choices=["recent", "stats", "client", "case", "errors", "report"], 
+    parser.add_argument("--action", choices=list(CLI_ACTIONS), 
                        required=True, help="Action to perform")
     parser.add_argument("--hours", type=int, default=24, help="Hours to look back (default: 24)")
     parser.add_argument("--date", help="Date for stats/report (YYYY-MM-DD, default: today)")
     parser.add_argument("--client", help="Client name to search for")
     parser.add_argument("--case", help="Case ID to search for")
-    parser.add_argument("--limit", type=int, help="Limit number of results")
+    parser.add_argument("--limit", type=int, help="Limit number of results (lines of --verbose stats output)")
+    parser.add_argument("--include-archives", action="store_true",
+                       help="Also search rotated audit logs (case action only)")
     parser.add_argument("--verbose", "-v", action="store_true", help="Show detailed file information for stats action")
     parser.add_argument("--filter", choices=["all", "processed", "ignored", "failed", "renamed"], default="all",
                        help="Filter results by action type (use with --verbose, default: all)")
@@ -443,69 +843,7 @@ def main():
     
     args = parser.parse_args()
     
-    analyzer = LogAnalyzer()
-    
-    if args.action == "recent":
-        entries = analyzer.get_recent_activity(args.hours)
-        print(f"Found {len(entries)} entries in the last {args.hours} hours:")
-        for entry in entries[-10:]:  # Show last 10
-            print(f"[{entry.get('timestamp', '')[:16]}] {entry.get('action', '')} - {entry.get('status', '')}")
-    
-    elif args.action == "stats":
-        # Build filters from command line arguments
-        filters = {}
-        if getattr(args, 'document_type', None):
-            filters['document_type'] = args.document_type
-        if getattr(args, 'min_confidence', None) is not None:
-            filters['min_confidence'] = args.min_confidence
-        if getattr(args, 'max_confidence', None) is not None:
-            filters['max_confidence'] = args.max_confidence
-            
-        if args.verbose:
-            # Get detailed stats and format with verbose output
-            stats = analyzer.get_processing_stats(args.date, include_details=True, filters=filters)
-            formatted_output = analyzer.format_verbose_stats(stats, args.filter)
-            print(formatted_output)
-        else:
-            # Simple stats output (enhanced with document types)
-            stats = analyzer.get_processing_stats(args.date, filters=filters)
-            print(f"Processing stats for {stats['date']}:")
-            print(f"Total: {stats['total_files']}, Processed: {stats['processed']}, "
-                  f"Renamed: {stats.get('renamed', 0)}, Ignored: {stats['ignored']}, Failed: {stats['failed']}")
-            
-            # Show document type breakdown
-            if stats.get('document_types'):
-                print(f"\nDocument Types:")
-                for doc_type, count in sorted(stats['document_types'].items()):
-                    print(f"  • {doc_type}: {count}")
-    
-    elif args.action == "client":
-        if not args.client:
-            print("Error: --client required for client action")
-            return
-        entries = analyzer.find_client_activity(args.client)
-        print(f"Found {len(entries)} entries for client '{args.client}':")
-        for entry in entries[-5:]:  # Show last 5
-            print(f"[{entry.get('timestamp', '')[:16]}] {entry.get('action', '')} - {entry.get('status', '')}")
-    
-    elif args.action == "case":
-        if not args.case:
-            print("Error: --case required for case action")
-            return
-        entries = analyzer.find_case_activity(args.case)
-        print(f"Found {len(entries)} entries for case '{args.case}':")
-        for entry in entries:
-            print(f"[{entry.get('timestamp', '')[:16]}] {entry.get('action', '')} - {entry.get('status', '')}")
-    
-    elif args.action == "errors":
-        errors = analyzer.find_errors(args.hours)
-        print(f"Found {len(errors)} errors in the last {args.hours} hours:")
-        for error in errors:
-            print(f"[{error.get('timestamp', '')[:16]}] {error.get('filename', '')} - {error.get('failure_reason', '')}")
-    
-    elif args.action == "report":
-        report = analyzer.generate_daily_report(args.date)
-        print(report)
+    CLI_ACTIONS[args.action](LogAnalyzer(), args)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,19 +4,36 @@ Log Rotation and Archival System for SWNA Automation
 Handles automatic rotation of log files to prevent disk space issues.
 """
 
+import argparse
 import os
+import re
 import gzip
+import heapq
 import shutil
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 import json
+from src.bloom_filter import BloomFilter
+from src.logger import default_logs_dir
+
+BLOOM_SUFFIX = ".bloom"  # Sidecar next to each archived audit log listing its case IDs
+INDEX_SUFFIX = ".index.json"  # Sidecar next to each archived audit log with per-day stats
+ARCHIVE_SIDECAR_SUFFIXES = (BLOOM_SUFFIX, INDEX_SUFFIX)
+# SWNALogger reopens a JSONL log whenever its path names a new file, so these
+# can be renamed away safely. The main log is held open by a logging.FileHandler
+# and must be copied and truncated in place instead.
+RENAME_ROTATED_TYPES = {"audit", "performance"}
+ROTATE_CHUNK_SIZE = 1 << 20  # 1 MB copy buffer when compressing logs
+ARCHIVE_COMPRESS_LEVEL = 1  # Fastest gzip level; archives are rarely read
+# "case_id" keys as written by json.dumps, with a string or integer value
+_CASE_ID_PATTERN = re.compile(rb'"case_id":\s*(?:"([^"\\]*)"|(-?\d+))')
 
 class LogRotator:
     """Handles log file rotation and archival."""
     
     def __init__(self, logs_dir: str = None, max_file_size_mb: int = 50, max_files: int = 10):
         if logs_dir is None:
-            logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
+            logs_dir = default_logs_dir()
         
         self.logs_dir = logs_dir 
         self.max_file_size = max_file_size_mb * 1024 * 1024  # Convert to bytes
@@ -59,13 +76,22 @@ class LogRotator:
             
             archive_path = os.path.join(self.archive_dir, archive_name)
             
-            # Compress and move the file
-            with open(file_path, 'rb') as f_in:
-                with gzip.open(archive_path, 'wb') as f_out:
-                    shutil.copyfileobj(f_in, f_out)
+            if file_type in RENAME_ROTATED_TYPES:
+                # Move the live file aside first so lines appended while we compress
+                # land in the fresh file instead of being truncated away
+                source_path = f"{file_path}.rot.{timestamp}"
+                os.rename(file_path, source_path)
+                open(file_path, 'a').close()
+            else:
+                source_path = file_path
+            
+            self._compress_to_archive(source_path, archive_path, file_type)
             
-            # Create new empty log file
-            open(file_path, 'w').close()
+            if source_path != file_path:
+                os.remove(source_path)
+            else:
+                # Create new empty log file
+                open(file_path, 'w').close()
             
             print(f"Rotated {file_path} to {archive_path}")
             return True
@@ -74,27 +100,76 @@ class LogRotator:
             print(f"Failed to rotate {file_path}: {str(e)}")
             return False
     
+    def _compress_to_archive(self, source_path: str, archive_path: str, file_type: str):
+        """Gzip a log file into the archive, writing a case ID Bloom filter for audit logs."""
+        # Level 1 is several times faster than the default 9 and costs little
+        # extra space on repetitive JSONL text
+        with open(source_path, 'rb', buffering=0) as f_in:
+            with gzip.open(archive_path, 'wb', compresslevel=ARCHIVE_COMPRESS_LEVEL) as f_out:
+                if file_type == "audit":
+                    case_ids = self._copy_collecting_case_ids(f_in, f_out)
+                else:
+                    shutil.copyfileobj(f_in, f_out, ROTATE_CHUNK_SIZE)
+        
+        # Sidecar filter lets case lookups skip this archive without decompressing it
+        if file_type == "audit":
+            bloom = BloomFilter(capacity=len(case_ids))
+            for case_id in case_ids:
+                bloom.add(case_id)
+            bloom.save(archive_path + BLOOM_SUFFIX)
+            
+            # Precompute per-day stats so reports never need to decompress this archive
+            from src.log_analyzer import LogAnalyzer
+            LogAnalyzer(self.logs_dir).build_archive_index(archive_path)
+    
+    def _copy_collecting_case_ids(self, f_in, f_out) -> set:
+        """Copy a JSONL log in large chunks, returning the set of case IDs it mentions."""
+        case_ids = set()
+        tail = b""
+        
+        while True:
+            chunk = f_in.read(ROTATE_CHUNK_SIZE)
+            if not chunk:
+                break
+            f_out.write(chunk)
+            
+            # Only scan whole lines; carry the partial last line into the next chunk
+            data = tail + chunk
+            cut = data.rfind(b"\n") + 1
+            tail = data[cut:]
+            case_ids.update(self._find_case_ids(data[:cut]))
+        
+        case_ids.update(self._find_case_ids(tail))
+        return case_ids
+    
+    def _find_case_ids(self, data: bytes) -> set:
+        """Extract case_id values from raw JSONL bytes."""
+        case_ids = set()
+        for quoted, number in _CASE_ID_PATTERN.findall(data):
+            value = quoted or number
+            if value:
+                case_ids.add(value.decode('utf-8', 'replace'))
+        return case_ids
+    
     def cleanup_old_archives(self):
         """Remove old archived log files beyond the retention limit."""
         try:
-            # Get all archive files sorted by modification time
-            archive_files = []
-            for filename in os.listdir(self.archive_dir):
-                if filename.endswith('.gz'):
-                    file_path = os.path.join(self.archive_dir, filename)
-                    mtime = os.path.getmtime(file_path)
-                    archive_files.append((mtime, file_path, filename))
+            # Get all archive files with their modification time
+            with os.scandir(self.archive_dir) as entries:
+                archive_files = [(entry.stat().st_mtime, entry.path, entry.name)
+                                 for entry in entries if entry.name.endswith('.gz')]
             
-            # Sort by modification time (oldest first)
-            archive_files.sort()
-            
-            # Remove old files if we exceed max_files
-            if len(archive_files) > self.max_files:
-                files_to_remove = archive_files[:len(archive_files) - self.max_files]
+            # Remove the oldest files if we exceed max_files
+            excess = len(archive_files) - self.max_files
+            if excess > 0:
+                files_to_remove = heapq.nsmallest(excess, archive_files)
                 
                 for _, file_path, filename in files_to_remove:
                     try:
                         os.remove(file_path)
+                        for suffix in ARCHIVE_SIDECAR_SUFFIXES:
+                            if os.path.exists(file_path + suffix):
+                                os.remove(file_path + suffix)
                         print(f"Removed old archive: {filename}")
                     except Exception as e:
                         print(f"Failed to remove {filename}: {str(e)}")
@@ -119,24 +194,28 @@ class LogRotator:
         return results
     
     def get_archive_info(self) -> List[Dict[str, Any]]:
-        """Get information about archived log files."""
+        """
+        Get information about archived log files, newest first.
+        created/modified are raw epoch seconds; format only the ones you display.
+        """
         archives = []
         
         if not os.path.exists(self.archive_dir):
             return archives
         
         try:
-            for filename in os.listdir(self.archive_dir):
-                if filename.endswith('.gz'):
-                    file_path = os.path.join(self.archive_dir, filename)
-                    stat = os.stat(file_path)
+            with os.scandir(self.archive_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith('.gz'):
+                        continue
+                    stat = entry.stat()
                     
                     archives.append({
-                        "filename": filename,
-                        "path": file_path,
+                        "filename": entry.name,
+                        "path": entry.path,
                         "size_mb": round(stat.st_size / (1024 * 1024), 2),
-                        "created": datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                        "modified": datetime.fromtimestamp(stat.st_mtime).isoformat()
+                        "created": stat.st_ctime,
+                        "modified": stat.st_mtime
                     })
             
             # Sort by creation time (newest first)
@@ -185,12 +264,61 @@ class LogRotator:
         self.cleanup_old_archives()
         return results
 
+def _cli_rotate(rotator: LogRotator, args):
+    print("Checking log files for rotation...")
+    results = rotator.rotate_all_logs()
+    
+    rotated_count = sum(1 for success in results.values() if success)
+    print(f"\nRotated {rotated_count} log files:")
+    for log_type, success in results.items():
+        status = "✓ Rotated" if success else "- No rotation needed"
+        print(f"  {log_type}: {status}")
+
+def _cli_info(rotator: LogRotator, args):
+    print("Current log file status:")
+    log_info = rotator.get_current_log_sizes()
+    
+    for log_type, info in log_info.items():
+        status = "⚠️ NEEDS ROTATION" if info.get('needs_rotation', False) else "✓ OK"
+        print(f"  {log_type}: {info['size_mb']} MB {status}")
+    
+    print(f"\nArchived files:")
+    archives = rotator.get_archive_info()
+    if archives:
+        for archive in archives[:5]:  # Show latest 5
+            print(f"  {archive['filename']}: {archive['size_mb']} MB ({datetime.fromtimestamp(archive['created']).strftime('%Y-%m-%d')})")
+        if len(archives) > 5:
+            print(f"  ... and {len(archives) - 5} more archived files")
+    else:
+        print("  No archived files")
+
+def _cli_force(rotator: LogRotator, args):
+    print("Force rotating all log files...")
+    results = rotator.force_rotate_all()
+    
+    rotated_count = sum(1 for success in results.values() if success)
+    print(f"\nForce rotated {rotated_count} log files:")
+    for log_type, success in results.items():
+        status = "✓ Rotated" if success else "- Skipped (empty/missing)"
+        print(f"  {log_type}: {status}")
+
+def _cli_cleanup(rotator: LogRotator, args):
+    print("Cleaning up old archived files...")
+    rotator.cleanup_old_archives()
+    print("Cleanup completed")
+
+# CLI action name -> handler
+CLI_ACTIONS = {
+    "rotate": _cli_rotate,
+    "info": _cli_info,
+    "force": _cli_force,
+    "cleanup": _cli_cleanup,
+}
+
 def main():
     """CLI interface for log rotation."""
-    import argparse
-    
     parser = argparse.ArgumentParser(description="SWNA Automation Log Rotator")
-    parser.add_argument("--action", choices=["rotate", "info", "force", "cleanup"], 
+    parser.add_argument("--action", choices=list(CLI_ACTIONS), 
                        required=True, help="Action to perform")
     parser.add_argument("--max-size", type=int, default=50, 
                        help="Maximum file size in MB before rotation (default: 50)")
@@ -200,49 +328,7 @@ def main():
     args = parser.parse_args()
     
     rotator = LogRotator(max_file_size_mb=args.max_size, max_files=args.max_files)
-    
-    if args.action == "rotate":
-        print("Checking log files for rotation...")
-        results = rotator.rotate_all_logs()
-        
-        rotated_count = sum(1 for success in results.values() if success)
-        print(f"\nRotated {rotated_count} log files:")
-        for log_type, success in results.items():
-            status = "✓ Rotated" if success else "- No rotation needed"
-            print(f"  {log_type}: {status}")
-    
-    elif args.action == "info":
-        print("Current log file status:")
-        log_info = rotator.get_current_log_sizes()
-        
-        for log_type, info in log_info.items():
-            status = "⚠️ NEEDS ROTATION" if info.get('needs_rotation', False) else "✓ OK"
-            print(f"  {log_type}: {info['size_mb']} MB {status}")
-        
-        print(f"\nArchived files:")
-        archives = rotator.get_archive_info()
-        if archives:
-            for archive in archives[:5]:  # Show latest 5
-                print(f"  {archive['filename']}: {archive['size_mb']} MB ({archive['created'][:10]})")
-            if len(archives) > 5:
-                print(f"  ... and {len(archives) - 5} more archived files")
-        else:
-            print("  No archived files")
-    
-    elif args.action == "force":
-        print("Force rotating all log files...")
-        results = rotator.force_rotate_all()
-        
-        rotated_count = sum(1 for success in results.values() if success)
-        print(f"\nForce rotated {rotated_count} log files:")
-        for log_type, success in results.items():
-            status = "✓ Rotated" if success else "- Skipped (empty/missing)"
-            print(f"  {log_type}: {status}")
-    
-    elif args.action == "cleanup":
-        print("Cleaning up old archived files...")
-        rotator.cleanup_old_archives()
-        print("Cleanup completed")
+    CLI_ACTIONS[args.action](rotator, args)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
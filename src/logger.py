@@ -1,11 +1,44 @@
+import atexit
 import logging
+import logging.handlers
 import os
 import json
+import queue
+import threading
 import time
 from datetime import datetime
 from typing import Dict, Any, Optional
 from enum import Enum
 
+try:
+    # Optional C JSON serializer; several times faster than json.dumps for log entries
+    import orjson
+except ImportError:
+    orjson = None
+
+STRUCTURED_QUEUE_SIZE = 10000  # Pending structured entries before logging calls block (back-pressure)
+STRUCTURED_BATCH_SIZE = 64  # Most entries the writer thread writes per batch
+STRUCTURED_BATCH_WAIT = 0.05  # Seconds the writer thread waits to fill a batch
+LOGS_DIR_ENV = "SWNA_LOGS_DIR"  # Environment variable overriding the default <repo>/logs directory
+
+def default_logs_dir() -> str:
+    """Logs directory used when none is given: $SWNA_LOGS_DIR, else logs/ beside src/."""
+    return os.getenv(LOGS_DIR_ENV) or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs")
+
+# Local time to the second as "YYYY-MM-DDTHH:MM:SS", reformatted only when the second changes
+_timestamp_cache = (None, None)
+
+def _now_isoformat() -> str:
+    """Current local time as an ISO string with microseconds, like datetime.now().isoformat()."""
+    global _timestamp_cache
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _timestamp_cache
+    if cached_second != second:
+        prefix = datetime.fromtimestamp(second).isoformat()
+        _timestamp_cache = (second, prefix)
+    return f"{prefix}.{int((now - second) * 1_000_000):06d}"
+
 class ActionType(Enum):
     """Enumeration of all possible system actions for audit tracking."""
     FILE_PROCESSED = "file_processed"
@@ -28,12 +61,173 @@ class LogLevel(Enum):
     ERROR = "ERROR"
     AUDIT = "AUDIT"
 
+# Stdlib fallback encoder, built once: json.dumps(default=...) constructs a new one per call
+_json_encoder = json.JSONEncoder(default=str)
+
+def _serialize_log_entry(log_data: Dict[str, Any]) -> bytes:
+    """Encode one structured entry as a JSONL line, using orjson when installed."""
+    # Hand-written per-action JSON templates were tried and measured slower than
+    # orjson on a full audit entry (~2.9us vs ~0.7us); this also runs on the
+    # writer thread, off the processing path.
+    if orjson is not None:
+        try:
+            return orjson.dumps(log_data, default=str,
+                                option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits; let the stdlib decide
+            pass
+    return _json_encoder.encode(log_data).encode('utf-8') + b'\n'
+
+class _JSONLWriter:
+    """
+    Appends lines to one JSONL file through a persistent O_APPEND descriptor,
+    writing each batch with a single os.write (no Python-level buffer to flush).
+    The file is reopened when it has been rotated away since the last batch, so
+    batched lines always land in the live file.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._pending = []
+        self._fd = None
+        self._file_id = None
+    
+    def write(self, line: bytes):
+        self._pending.append(line)
+    
+    def flush(self):
+        if not self._pending:
+            return
+        data = b"".join(self._pending)
+        self._pending.clear()
+        
+        fd = self._current_fd()
+        # O_APPEND puts the whole write at the end of the file, even with other
+        # writers; loop only in case the kernel takes part of a large batch
+        written = os.write(fd, data)
+        while written < len(data):
+            data = data[written:]
+            written = os.write(fd, data)
+    
+    def _current_fd(self):
+        """The open descriptor for path, reopened if the path now names a different file."""
+        try:
+            st = os.stat(self.path)
+            file_id = (st.st_dev, st.st_ino)
+        except FileNotFoundError:
+            file_id = None
+        
+        if self._fd is None or file_id != self._file_id:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            st = os.fstat(self._fd)
+            self._file_id = (st.st_dev, st.st_ino)
+        return self._fd
+
+# Structured entries from every SWNALogger go through one queue to one writer
+# thread, which owns the JSONL files; callers never wait on disk
+_structured_queue = queue.Queue(maxsize=STRUCTURED_QUEUE_SIZE)
+_jsonl_writers: Dict[str, _JSONLWriter] = {}
+_writer_thread = None
+_writer_thread_lock = threading.Lock()
+
+def _enqueue_structured_log(log_file: str, log_data: Dict[str, Any]):
+    """Hand an entry to the writer thread, starting it on first use. Blocks only when the queue is full."""
+    global _writer_thread
+    if _writer_thread is None:
+        with _writer_thread_lock:
+            if _writer_thread is None:
+                _writer_thread = threading.Thread(target=_write_structured_logs,
+                                                  name="swna-structured-log-writer", daemon=True)
+                _writer_thread.start()
+    _structured_queue.put((log_file, log_data))
+
+def _write_structured_logs():
+    """Writer thread: serialize queued entries and write them in batches, one flush per file per batch."""
+    while True:
+        batch = [_structured_queue.get()]
+        deadline = time.monotonic() + STRUCTURED_BATCH_WAIT
+        while len(batch) < STRUCTURED_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(_structured_queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        
+        for log_file, log_data in batch:
+            try:
+                writer = _jsonl_writers.get(log_file)
+                if writer is None:
+                    writer = _jsonl_writers[log_file] = _JSONLWriter(log_file)
+                writer.write(_serialize_log_entry(log_data))
+            except Exception as e:
+                _report_write_failure(e)
+        
+        for writer in _jsonl_writers.values():
+            try:
+                writer.flush()
+            except Exception as e:
+                _report_write_failure(e)
+        
+        for _ in batch:
+            _structured_queue.task_done()
+
+def _report_write_failure(error: Exception):
+    # Same logger and "ERROR:" prefix SWNALogger.error uses
+    logging.getLogger("swna_automation").error(f"ERROR: Failed to write structured log: {str(error)}")
+
+def _wait_for_structured_logs():
+    """Block until every queued structured entry has been written."""
+    if _writer_thread is not None:
+        _structured_queue.join()
+
+# Text log records are handed to a QueueListener thread that owns the file and
+# console handlers, so logging calls never wait on disk or the terminal
+_text_log_queue = queue.Queue()
+_text_log_listener = None
+
+def _wait_for_text_logs():
+    """Block until every queued text log record has been handled."""
+    if _text_log_listener is not None:
+        _text_log_queue.join()
+
+def _stop_text_log_listener():
+    if _text_log_listener is not None:
+        _text_log_listener.stop()
+
+def _shutdown_logging():
+    """At exit: write the queued structured entries first, since a failed write is reported
+    through the text log, then stop the text listener, which handles what is still queued."""
+    _wait_for_structured_logs()
+    _stop_text_log_listener()
+
+# One hook, so the order does not depend on atexit running handlers in reverse
+atexit.register(_shutdown_logging)
+
+class OperationTimer:
+    """
+    State for one timed operation, held by the caller between start_timer and
+    end_timer. The wall-clock start is only formatted if the timer is logged.
+    """
+    __slots__ = ("operation", "start_time", "start_perf", "ended")
+    
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.start_time = time.time()
+        self.start_perf = time.perf_counter()
+        self.ended = False
+
 class SWNALogger:
     """Centralized logging system for SWNA automation."""
     
-    def __init__(self, log_level="INFO"):
+    def __init__(self, log_level="INFO", logs_dir: str = None):
         # Set up file paths
-        logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
+        if logs_dir is None:
+            logs_dir = default_logs_dir()
         self.log_file = os.path.join(logs_dir, "swna_automation.log")
         self.audit_log_file = os.path.join(logs_dir, "audit.jsonl")
         self.performance_log_file = os.path.join(logs_dir, "performance.jsonl")
@@ -45,17 +239,19 @@ class SWNALogger:
         self.logger = self._setup_logger(log_level)
         self.session_id = self._generate_session_id()
         
-        # Performance tracking
-        self._operation_timers = {}
+        # Stamped on every structured entry; fixed for the life of the process
+        self._pid = os.getpid()
+        self._base_entry_fields = {"session_id": self.session_id, "pid": self._pid}
     
     def _setup_logger(self, log_level):
         """Set up logger with file and console handlers."""
         logger = logging.getLogger("swna_automation")
         logger.setLevel(getattr(logging, log_level.upper()))
         
-        # Clear existing handlers
-        for handler in logger.handlers[:]:
-            logger.removeHandler(handler)
+        # The logger is process-wide; later SWNALogger instances reuse its handlers
+        # instead of closing and reopening them mid-run
+        if logger.handlers:
+            return logger
         
         # Create formatter
         formatter = logging.Formatter('[%(asctime)s] [%(levelname)s] %(message)s')
@@ -63,12 +259,17 @@ class SWNALogger:
         # File handler - append mode
         file_handler = logging.FileHandler(self.log_file, mode='a')
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
         
         # Console handler
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        
+        # Both handlers run on the listener thread; the logger only enqueues
+        global _text_log_listener
+        _text_log_listener = logging.handlers.QueueListener(
+            _text_log_queue, file_handler, console_handler, respect_handler_level=True)
+        _text_log_listener.start()
+        logger.addHandler(logging.handlers.QueueHandler(_text_log_queue))
         
         return logger
     
@@ -76,84 +277,93 @@ class SWNALogger:
         """Generate unique session ID for tracking related operations."""
         return f"session_{int(time.time())}"
     
-    def _write_structured_log(self, log_data: Dict[str, Any], log_file: str):
-        """Write structured log entry to JSONL file."""
+    def _write_structured_log(self, log_data: Dict[str, Any], log_file: str, flush: bool = False):
+        """
+        Queue structured log entry for its JSONL file; the writer thread serializes
+        and writes it. flush=True waits until everything queued is on disk.
+        """
         try:
-            with open(log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_data, default=str) + '\n')
+            _enqueue_structured_log(log_file, log_data)
+            if flush:
+                self.flush()
         except Exception as e:
             self.logger.error(f"Failed to write structured log: {str(e)}")
     
+    def flush(self):
+        """Wait until every queued structured entry and text log record has been written."""
+        _wait_for_structured_logs()
+        _wait_for_text_logs()
+    
     def _create_base_log_entry(self, action_type: ActionType, level: LogLevel = LogLevel.INFO) -> Dict[str, Any]:
         """Create base log entry with common fields."""
+        # timestamp must stay the first key; the log analyzer reads it off the raw line
         return {
-            "timestamp": datetime.now().isoformat(),
-            "session_id": self.session_id,
+            "timestamp": _now_isoformat(),
+            **self._base_entry_fields,
             "action_type": action_type.value,
-            "level": level.value,
-            "pid": os.getpid()
+            "level": level.value
         }
     
-    def info(self, message):
-        """Log info message."""
-        self.logger.info(message)
+    def info(self, message, *args):
+        """Log info message. Extra args are %-formatted lazily by logging."""
+        self.logger.info(message, *args)
+    
+    def warning(self, message, *args):
+        """Log warning message. Extra args are %-formatted lazily by logging."""
+        self.logger.warning(message, *args)
     
-    def error(self, message):
+    def error(self, message, *args):
         """Log error message with ERROR prefix for easy identification."""
-        self.logger.error(f"ERROR: {message}")
+        self.logger.error(f"ERROR: {message}", *args)
     
-    def debug(self, message):
-        """Log debug message."""
-        self.logger.debug(message)
+    def debug(self, message, *args):
+        """Log debug message. Extra args are %-formatted lazily by logging."""
+        self.logger.debug(message, *args)
     
     # Performance Tracking Methods
-    def start_timer(self, operation_name: str) -> str:
-        """Start timing an operation. Returns timer ID."""
-        timer_id = f"{operation_name}_{int(time.time() * 1000)}"
-        self._operation_timers[timer_id] = {
-            'operation': operation_name,
-            'start_time': time.time(),
-            'start_timestamp': datetime.now().isoformat()
-        }
-        return timer_id
+    def start_timer(self, operation_name: str) -> "OperationTimer":
+        """Start timing an operation. Returns the timer to pass to end_timer."""
+        return OperationTimer(operation_name)
     
-    def end_timer(self, timer_id: str) -> float:
+    def end_timer(self, timer: "OperationTimer") -> float:
         """End timing an operation and return duration in seconds."""
-        if timer_id not in self._operation_timers:
-            self.logger.warning(f"Timer {timer_id} not found")
+        if timer.ended:
+            self.logger.warning(f"Timer {timer.operation} already ended")
             return 0.0
         
-        timer_data = self._operation_timers[timer_id]
-        duration = time.time() - timer_data['start_time']
+        timer.ended = True
+        duration = time.perf_counter() - timer.start_perf
         
         # Log performance data
         perf_entry = self._create_base_log_entry(ActionType.FILE_PROCESSED, LogLevel.INFO)
         perf_entry.update({
-            "operation": timer_data['operation'],
+            "operation": timer.operation,
             "duration_seconds": round(duration, 3),
-            "start_time": timer_data['start_timestamp'],
-            "end_time": datetime.now().isoformat()
+            "start_time": datetime.fromtimestamp(timer.start_time).isoformat(),
+            "end_time": _now_isoformat()
         })
         
         self._write_structured_log(perf_entry, self.performance_log_file)
-        
-        # Clean up
-        del self._operation_timers[timer_id]
         return duration
     
     # Structured Audit Logging Methods
     def log_file_processing_start(self, filename: str, file_path: str):
         """Log start of file processing with structured data."""
         # Traditional log
-        self.info(f"Processing started: {filename}")
+        self.info("Processing started: %s", filename)
         
         # Structured audit log
         audit_entry = self._create_base_log_entry(ActionType.FILE_PROCESSED, LogLevel.AUDIT)
+        try:
+            file_size = os.stat(file_path).st_size
+        except OSError:
+            file_size = None
+        
         audit_entry.update({
             "action": "processing_started",
             "filename": filename,
             "file_path": file_path,
-            "file_size": os.path.getsize(file_path) if os.path.exists(file_path) else None
+            "file_size": file_size
         })
         
         self._write_structured_log(audit_entry, self.audit_log_file)
@@ -164,7 +374,8 @@ class SWNALogger:
                                    classification_reason: str = None):
         """Log successful file processing with complete audit trail and classification data."""
         # Traditional log  
-        self.info(f"✅ PROCESSED: {new_filename} | Case: {case_id} | Client: {client_name} | Action: Filed to {destination_folder}")
+        self.info("✅ PROCESSED: %s | Case: %s | Client: %s | Action: Filed to %s",
+                  new_filename, case_id, client_name, destination_folder)
         
         # Structured audit log
         audit_entry = self._create_base_log_entry(ActionType.FILE_PROCESSED, LogLevel.AUDIT)
@@ -188,7 +399,7 @@ class SWNALogger:
                                    error_details: Dict[str, Any] = None):
         """Log file processing failure with detailed error context."""
         # Traditional log
-        self.info(f"⚠️  FAILED: {filename} | Error: {reason}")
+        self.info("⚠️  FAILED: %s | Error: %s", filename, reason)
         
         # Structured audit log
         audit_entry = self._create_base_log_entry(ActionType.FILE_FAILED, LogLevel.ERROR)
@@ -208,7 +419,7 @@ class SWNALogger:
                         classification_reason: str = None):
         """Log when file is ignored with structured data."""
         # Traditional log
-        self.info(f"❌ IGNORED: {filename} | Reason: {reason}")
+        self.info("❌ IGNORED: %s | Reason: %s", filename, reason)
         
         # Structured audit log
         audit_entry = self._create_base_log_entry(ActionType.FILE_IGNORED, LogLevel.INFO)
@@ -229,7 +440,7 @@ class SWNALogger:
                                    log_entry: str, update_data: Dict[str, Any] = None):
         """Log Airtable update with complete audit trail."""
         # Traditional log
-        self.info(f"📝 AIRTABLE UPDATE: {client_name} ({record_id}) | Case ID: {case_id} | Log: \"{log_entry}\"")
+        self.info("📝 AIRTABLE UPDATE: %s (%s) | Case ID: %s | Log: \"%s\"", client_name, record_id, case_id, log_entry)
         
         # Structured audit log
         audit_entry = self._create_base_log_entry(ActionType.AIRTABLE_UPDATE, LogLevel.AUDIT)
@@ -247,8 +458,10 @@ class SWNALogger:
     
     def log_file_moved(self, original_path: str, new_path: str, filename: str, new_filename: str):
         """Log file move operation with complete paths."""
+        destination_directory = os.path.dirname(new_path)
+        
         # Traditional log
-        self.debug(f"File processed: {filename} -> {new_filename} moved to {os.path.dirname(new_path)}")
+        self.debug("File processed: %s -> %s moved to %s", filename, new_filename, destination_directory)
         
         # Structured audit log
         audit_entry = self._create_base_log_entry(ActionType.FILE_MOVED, LogLevel.AUDIT)
@@ -258,7 +471,7 @@ class SWNALogger:
             "new_path": new_path,
             "original_filename": filename,
             "new_filename": new_filename,
-            "destination_directory": os.path.dirname(new_path),
+            "destination_directory": destination_directory,
             "status": "SUCCESS"
         })
         
@@ -271,7 +484,7 @@ class SWNALogger:
         
         # Traditional log
         status = "PASSED" if success else "FAILED"
-        self.info(f"[VALIDATION] {validation_type} {status}: {details.get('message', '')}")
+        self.info("[VALIDATION] %s %s: %s", validation_type, status, details.get('message', ''))
         
         # Structured audit log
         audit_entry = self._create_base_log_entry(action_type, level)
@@ -285,6 +498,34 @@ class SWNALogger:
         
         self._write_structured_log(audit_entry, self.audit_log_file)
     
+    def log_validation_steps(self, steps):
+        """
+        Log a run of validation checks as one structured record.
+        steps is a list of (validation_type, success, details); the record's top-level
+        validation_type/details are those of the last step, which decided the outcome.
+        """
+        validation_type, success, details = steps[-1]
+        action_type = ActionType.VALIDATION_PASSED if success else ActionType.VALIDATION_FAILED
+        level = LogLevel.INFO if success else LogLevel.WARNING
+        
+        # Traditional log
+        status = "PASSED" if success else "FAILED"
+        self.info("[VALIDATION] %s %s: %s", validation_type, status, details.get('message', ''))
+        
+        # Structured audit log
+        audit_entry = self._create_base_log_entry(action_type, level)
+        audit_entry.update({
+            "action": "validation",
+            "validation_type": validation_type,
+            "success": success,
+            "details": details,
+            "status": status,
+            "steps": [{"validation_type": step_type, "success": step_success, "details": step_details}
+                      for step_type, step_success, step_details in steps]
+        })
+        
+        self._write_structured_log(audit_entry, self.audit_log_file)
+    
     def log_daily_summary(self, processed_count: int, ignored_count: int, failed_count: int, 
                          total_count: int, renamed_count: int = 0, by_type_count: Dict[str, int] = None, 
                          date_str: str = None):
@@ -295,22 +536,25 @@ class SWNALogger:
         if by_type_count is None:
             by_type_count = {}
             
-        # Traditional log
-        self.info("=" * 50)
-        self.info(f"=== DAILY SUMMARY {date_str} ===")
-        self.info(f"• Processed: {processed_count} AR Ack documents (full processing)")
-        self.info(f"• Renamed: {renamed_count} other document types (rename only)")
-        self.info(f"• Ignored: {ignored_count} unknown document types")
-        self.info(f"• Failed: {failed_count} processing errors")
-        self.info(f"• Total files scanned: {total_count}")
+        # Traditional log, emitted as one multi-line record
+        summary_lines = [
+            "=" * 50,
+            f"=== DAILY SUMMARY {date_str} ===",
+            f"• Processed: {processed_count} AR Ack documents (full processing)",
+            f"• Renamed: {renamed_count} other document types (rename only)",
+            f"• Ignored: {ignored_count} unknown document types",
+            f"• Failed: {failed_count} processing errors",
+            f"• Total files scanned: {total_count}"
+        ]
         
         # Document type breakdown
         if by_type_count:
-            self.info("--- Document Type Breakdown ---")
+            summary_lines.append("--- Document Type Breakdown ---")
             for doc_type, count in sorted(by_type_count.items()):
-                self.info(f"  • {doc_type}: {count}")
+                summary_lines.append(f"  • {doc_type}: {count}")
         
-        self.info("=" * 50)
+        summary_lines.append("=" * 50)
+        self.info("\n".join(summary_lines))
         
         # Structured audit log
         audit_entry = self._create_base_log_entry(ActionType.DAILY_SUMMARY, LogLevel.AUDIT)
@@ -328,28 +572,28 @@ class SWNALogger:
             }
         })
         
-        self._write_structured_log(audit_entry, self.audit_log_file)
+        self._write_structured_log(audit_entry, self.audit_log_file, flush=True)
     
     # Keep old methods for backward compatibility but make them debug level
     def log_ar_ack_identified(self, filename):
         """Log AR Ack identification."""
-        self.debug(f"AR Ack document identified: {filename}")
+        self.debug("AR Ack document identified: %s", filename)
     
     def log_data_extracted(self, case_id, client_name):
         """Log successful data extraction."""
-        self.debug(f"Data extracted - Case ID: {case_id}, Client: {client_name}")
+        self.debug("Data extracted - Case ID: %s, Client: %s", case_id, client_name)
     
     def log_client_matched(self, client_name, airtable_record):
         """Log successful client matching."""
-        self.debug(f"Client matched in Airtable: {client_name} -> {airtable_record}")
+        self.debug("Client matched in Airtable: %s -> %s", client_name, airtable_record)
     
     def log_airtable_updated(self, record_id, case_id):
         """Log Airtable update."""
-        self.debug(f"Airtable updated - Record ID: {record_id}, Case ID: {case_id}")
+        self.debug("Airtable updated - Record ID: %s, Case ID: %s", record_id, case_id)
     
     def log_file_renamed_moved(self, old_name, new_name, destination):
         """Log file rename and move operation."""
-        self.debug(f"File processed: {old_name} -> {new_name} moved to {destination}")
+        self.debug("File processed: %s -> %s moved to %s", old_name, new_name, destination)
     
     def log_startup(self, config_details: Dict[str, Any] = None):
         """Log system startup with configuration details."""
@@ -379,4 +623,4 @@ class SWNALogger:
             "status": "STOPPED"
         })
         
-        self._write_structured_log(audit_entry, self.audit_log_file)
\ No newline at end of file
+        self._write_structured_log(audit_entry, self.audit_log_file, flush=True)
\ No newline at end of file
@@ -1,32 +1,136 @@
+import copy
+import errno
+import logging
+import multiprocessing
 import os
+import re
 import shutil
-from typing import Dict, Any
-from src.document_processor import DocumentProcessor
-from src.data_extractor import DataExtractor
-from src.airtable_client import AirtableClient
-from src.file_manager import FileManager
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional
+from config.settings import SKIP_FILENAME_PATTERN, SKIP_MAX_FILE_MB
 from src.logger import SWNALogger
 from src.document_classifier import DocumentClassifier, DocumentType
 from src.document_renamer import DocumentRenamer
 
+BATCH_MAX_WORKERS = 4  # Files processed concurrently by process_files
+EXTRACTION_WORKERS = max(1, (os.cpu_count() or 1) - 1)  # Processes extracting text for a process_files batch
+AIRTABLE_MAX_CONCURRENT_REQUESTS = 5  # Airtable allows 5 requests/s per base
+CLIENT_CACHE_SIZE = 512  # Airtable client records remembered across files
+CLIENT_CACHE_TTL = 300   # Seconds before a remembered client record is looked up again
+
+class PipelineState:
+    """Per-file processing state used for rollback."""
+    # Explicit __slots__ rather than @dataclass(slots=True), which needs Python 3.10
+    __slots__ = ('original_file_path', 'airtable_updated', 'file_moved', 'file_renamed', 'new_file_path',
+                 'record_id', 'case_id', 'destination_folder', 'new_filename', 'record_before')
+    
+    def __init__(self, original_file_path: Optional[str] = None, airtable_updated: bool = False,
+                 file_moved: bool = False, file_renamed: bool = False, new_file_path: Optional[str] = None,
+                 record_id: Optional[str] = None, case_id: Optional[str] = None,
+                 destination_folder: Optional[str] = None, new_filename: Optional[str] = None,
+                 record_before: Optional[Dict[str, Any]] = None):
+        self.original_file_path = original_file_path
+        self.airtable_updated = airtable_updated
+        self.file_moved = file_moved
+        self.file_renamed = file_renamed
+        self.new_file_path = new_file_path
+        self.record_id = record_id
+        self.case_id = case_id  # Case ID this run wrote to the record
+        self.destination_folder = destination_folder
+        self.new_filename = new_filename
+        self.record_before = record_before  # Airtable Case ID/Log before our update, and the Log entry it added
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Field values by name, deep-copied like dataclasses.asdict."""
+        return {name: copy.deepcopy(getattr(self, name)) for name in self.__slots__}
+    
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"PipelineState({fields})"
+
+@dataclass
+class BatchResult:
+    """Outcome of process_files: success per file, in completion order."""
+    results: Dict[str, bool] = field(default_factory=dict)
+    
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for success in self.results.values() if success)
+    
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.succeeded
+
 class ProcessingPipeline:
-    """Main processing pipeline with atomic operations for multiple document types."""
+    """
+    Main processing pipeline with atomic operations for multiple document types.
+    Building one loads the OCR engine and compiles the classifier, so a single
+    pipeline should be reused for every file rather than created per file, and
+    shutdown() called when it is no longer needed.
+    """
     
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, skip_filename_pattern=SKIP_FILENAME_PATTERN, skip_max_file_mb=SKIP_MAX_FILE_MB,
+                 extraction_workers=EXTRACTION_WORKERS, airtable_client=None, file_manager=None):
         self.logger = logger or SWNALogger()
+        self.extraction_workers = max(1, extraction_workers)
+        
+        # Cheap checks that let a file be ignored before any text extraction
+        self._skip_filename_re = re.compile(skip_filename_pattern, re.IGNORECASE) if skip_filename_pattern else None
+        self._skip_max_bytes = int(skip_max_file_mb * 1024 * 1024) if skip_max_file_mb else None
+        
+        # Imported here rather than at module level: OCR (pytesseract/PIL) and
+        # pyairtable are slow to import and only needed once a pipeline exists
+        from src.document_processor import DocumentProcessor
+        from src.data_extractor import DataExtractor
+        from src.airtable_client import AirtableClient
+        from src.file_manager import FileManager
         
         # Initialize existing components
         self.document_processor = DocumentProcessor(self.logger)
         self.data_extractor = DataExtractor(self.logger)
-        self.airtable_client = AirtableClient(self.logger)
-        self.file_manager = FileManager(self.logger)
+        # airtable_client / file_manager may be supplied instead (e.g. test doubles)
+        self.airtable_client = airtable_client or AirtableClient(self.logger)
+        self.file_manager = file_manager or FileManager(self.logger)
         
         # Initialize new components for multi-document processing
         self.document_classifier = DocumentClassifier(self.logger)
         self.document_renamer = DocumentRenamer(self.logger)
         
-        # Track processing state for rollback
-        self.processing_state = {}
+        # Load the OCR engine up front so the first file is not slower than the rest
+        self.document_processor.warmup()
+        
+        # Rollback state is per thread, so process_files workers each track their own file
+        self._local = threading.local()
+        self.processing_state = PipelineState()
+        
+        # OCR/PDF rendering is not thread-safe; classification (one Hyperscan scratch
+        # per thread), Airtable and filesystem work overlap across batch workers
+        self._document_lock = threading.Lock()
+        
+        # Text extraction worker processes, started on the first batch that needs
+        # them and kept for later batches until shutdown()
+        self._extraction_pool = None
+        self._extraction_pool_lock = threading.Lock()
+        self._airtable_slots = threading.Semaphore(AIRTABLE_MAX_CONCURRENT_REQUESTS)
+        self._stats_lock = threading.Lock()
+        
+        # Client records found in Airtable: name -> (monotonic lookup time, record)
+        self._client_cache = OrderedDict()
+        self._client_cache_lock = threading.Lock()
+        
+        # Filled by process_files for the files of one batch
+        self._prefetched_text = {}   # file_path -> (is_ar_ack, extracted_text)
+        self._client_records = {}    # formatted client name -> Airtable record
+        self._airtable_batcher = None  # Combines concurrent workers' record updates
+        
+        # Client DOL Letters folders already seen to exist: formatted name -> path.
+        # Cleared after each batch and daily summary so removed folders are noticed;
+        # move_and_rename_file still checks the folder before moving.
+        self._folder_cache = {}
         
         # Track daily statistics
         self.daily_stats = {
@@ -38,6 +142,149 @@ class ProcessingPipeline:
             'by_type': {}         # Count by document type
         }
     
+    @property
+    def processing_state(self) -> PipelineState:
+        """Rollback state of the file being processed on the calling thread."""
+        state = getattr(self._local, 'state', None)
+        if state is None:
+            state = self._local.state = PipelineState()
+        return state
+    
+    @processing_state.setter
+    def processing_state(self, state: PipelineState):
+        self._local.state = state
+    
+    def process_files(self, file_paths, max_workers=BATCH_MAX_WORKERS, progress_callback=None,
+                      continue_on_error=True) -> BatchResult:
+        """
+        Process several PDF files as a two-stage pipeline. Text is extracted in up to
+        extraction_workers processes; as each file's text arrives it is handed to
+        process_file on a pool of max_workers threads, so Airtable calls and file
+        moves for earlier files overlap extraction of later ones. AR Ack clients are
+        looked up with one batched Airtable search per AIRTABLE_LOOKUP_BATCH_SIZE
+        files before those files are handed on.
+        progress_callback(file_path, success), if given, is called as each file finishes.
+        With continue_on_error=False, files not yet started are skipped after a failure.
+        """
+        from src.airtable_client import AIRTABLE_LOOKUP_BATCH_SIZE
+        
+        candidates, others = [], []
+        for file_path in file_paths:
+            filename = os.path.basename(file_path)
+            if (self.file_manager.is_already_processed_file(filename)
+                    or self._prefilter_reason(filename, file_path)):
+                # process_file only logs these, without extracting any text
+                others.append(file_path)
+            else:
+                candidates.append(file_path)
+        
+        if max_workers > 1:
+            from src.airtable_client import AirtableUpdateBatcher
+            self._airtable_batcher = AirtableUpdateBatcher(self.airtable_client)
+        
+        batch = BatchResult()
+        failed = threading.Event()
+        futures = {}
+        
+        def submit(executor, paths):
+            for file_path in paths:
+                if failed.is_set() and not continue_on_error:
+                    return
+                future = executor.submit(self.process_file, file_path)
+                future.add_done_callback(note_failure)
+                futures[future] = file_path
+        
+        def note_failure(future):
+            if not future.cancelled() and (future.exception() is not None or not future.result()):
+                failed.set()
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                submit(executor, others)
+                
+                # AR Acks wait here until their client names have been looked up together
+                waiting, client_names = [], []
+                for file_path, (is_ar_ack, extracted_text) in zip(candidates, self._extract_texts(candidates)):
+                    client_name_formatted = self._prefetch_document(file_path, is_ar_ack, extracted_text)
+                    if client_name_formatted is None:
+                        submit(executor, [file_path])
+                        continue
+                    
+                    waiting.append(file_path)
+                    client_names.append(client_name_formatted)
+                    if len(client_names) >= AIRTABLE_LOOKUP_BATCH_SIZE:
+                        self._prefetch_clients(client_names)
+                        submit(executor, waiting)
+                        waiting, client_names = [], []
+                
+                if client_names:
+                    self._prefetch_clients(client_names)
+                submit(executor, waiting)
+                
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    file_path = futures[future]
+                    try:
+                        success = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Error processing file {file_path}: {str(e)}")
+                        success = False
+                    batch.results[file_path] = success
+                    
+                    if progress_callback is not None:
+                        progress_callback(file_path, success)
+                    
+                    if not success and not continue_on_error:
+                        for pending in futures:
+                            pending.cancel()
+        finally:
+            self._prefetched_text.clear()
+            self._client_records = {}
+            self._folder_cache.clear()
+            self._airtable_batcher = None
+        
+        return batch
+    
+    def _prefetch_document(self, file_path, is_ar_ack, extracted_text):
+        """
+        Keep a batch file's extracted text for process_file. Returns the formatted
+        client name if the file is an AR Ack whose client can be looked up, else None.
+        """
+        try:
+            if not extracted_text:
+                return None
+            self._prefetched_text[file_path] = (is_ar_ack, extracted_text)
+            
+            document_type = self.document_classifier.classify_document(extracted_text).document_type
+            if document_type != DocumentType.AR_ACK:
+                return None
+            
+            _, client_name = self.data_extractor.extract_data_for_document_type(extracted_text, document_type)
+            if client_name:
+                return self.data_extractor.format_client_name_for_matching(client_name) or None
+            return None
+        except Exception as e:
+            # process_file will retry and report this file on its own
+            self.logger.debug(f"Batch prefetch skipped {file_path}: {str(e)}")
+            return None
+    
+    def _prefetch_clients(self, client_names):
+        """Look up a group of AR Ack clients with one batched Airtable search."""
+        with self._airtable_slots:
+            found = self.airtable_client.find_clients_by_names(client_names)
+        # Replaced rather than mutated: worker threads may be reading the current dict
+        self._client_records = {**self._client_records, **found}
+        
+        # Also keep them for later batches and single files, like a _lookup_client result
+        now = time.monotonic()
+        with self._client_cache_lock:
+            for client_name_formatted, client_record in found.items():
+                self._client_cache[client_name_formatted] = (now, client_record)
+                self._client_cache.move_to_end(client_name_formatted)
+            while len(self._client_cache) > CLIENT_CACHE_SIZE:
+                self._client_cache.popitem(last=False)
+    
     def process_file(self, file_path):
         """
         Process a single PDF file through the multi-document pipeline.
@@ -47,7 +294,7 @@ class ProcessingPipeline:
         filename = os.path.basename(file_path)
         
         # Track total files processed
-        self.daily_stats['total'] += 1
+        self._count_stat('total')
         
         # Add separator line for readability
         self.logger.info("=" * 80)
@@ -59,14 +306,7 @@ class ProcessingPipeline:
         self.logger.log_file_processing_start(filename, file_path)
         
         # Initialize processing state
-        self.processing_state = {
-            'original_file_path': file_path,
-            'airtable_updated': False,
-            'file_moved': False,
-            'file_renamed': False,
-            'new_file_path': None,
-            'record_id': None
-        }
+        self.processing_state = PipelineState(original_file_path=file_path)
         
         try:
             # Step 1: Check if file is already processed
@@ -75,12 +315,25 @@ class ProcessingPipeline:
                 self.logger.end_timer(processing_timer)
                 return True
             
-            # Step 2: Extract text from document
-            is_ar_ack, extracted_text = self.document_processor.process_document(file_path)
+            # Skip text extraction for files the configured prefilter rules out
+            skip_reason = self._prefilter_reason(filename, file_path)
+            if skip_reason:
+                self._count_stat('ignored')
+                self.logger.log_file_ignored(filename, skip_reason, file_path)
+                self.logger.end_timer(processing_timer)
+                return True
+            
+            # Step 2: Extract text from document (already done if part of a process_files batch)
+            prefetched = self._prefetched_text.pop(file_path, None)
+            if prefetched:
+                is_ar_ack, extracted_text = prefetched
+            else:
+                with self._document_lock:
+                    is_ar_ack, extracted_text = self.document_processor.process_document(file_path)
             
             if not extracted_text:
                 self._handle_processing_failure(filename, "Failed to extract text from document", file_path, processing_timer)
-                self.daily_stats['failed'] += 1
+                self._count_stat('failed')
                 return False
             
             # Step 3: Classify document type
@@ -89,15 +342,15 @@ class ProcessingPipeline:
             
             # Update stats by document type
             type_name = document_type.value
-            self.daily_stats['by_type'][type_name] = self.daily_stats['by_type'].get(type_name, 0) + 1
+            self._count_document_type(type_name)
             
             self.logger.info(f"📋 CLASSIFIED: {filename} as {type_name} (confidence: {classification_result.confidence:.2f})")
             
             if document_type == DocumentType.UNKNOWN:
                 # Unknown document type - ignore
-                self.daily_stats['ignored'] += 1
+                self._count_stat('ignored')
                 self.logger.log_file_ignored(filename, f"Unknown document type: {classification_result.classification_reason}", file_path,
-                                            document_type=document_type.value, 
+                                            document_type=type_name, 
                                             classification_confidence=classification_result.confidence,
                                             classification_reason=classification_result.classification_reason)
                 self.logger.end_timer(processing_timer)
@@ -110,20 +363,21 @@ class ProcessingPipeline:
             if not self.data_extractor.validate_extraction_for_document_type(case_id, client_name, document_type):
                 required = "Case ID and Client Name" if document_type == DocumentType.AR_ACK else "Client Name"
                 self._handle_processing_failure(filename, f"Failed to extract required data ({required})", file_path, processing_timer)
-                self.daily_stats['failed'] += 1
+                self._count_stat('failed')
                 return False
             
             # Step 6: Route to appropriate processing path
             if document_type == DocumentType.AR_ACK:
                 # AR Ack: Full processing (existing logic)
-                success = self._process_ar_ack_document(file_path, case_id, client_name, processing_timer)
+                success = self._process_ar_ack_document(file_path, filename, case_id, client_name, processing_timer)
             else:
                 # Other document types: Rename-only processing
-                success = self._process_other_document(file_path, document_type, classification_result, client_name, processing_timer)
+                success = self._process_other_document(file_path, filename, document_type, classification_result, client_name, processing_timer)
             
-            # End performance tracking
-            duration = self.logger.end_timer(processing_timer)
-            self.logger.info(f"File processing completed in {duration:.2f} seconds")
+            # End performance tracking (failure paths have already ended the timer)
+            if not processing_timer.ended:
+                duration = self.logger.end_timer(processing_timer)
+                self.logger.info(f"File processing completed in {duration:.2f} seconds")
             
             return success
                 
@@ -132,32 +386,31 @@ class ProcessingPipeline:
             error_details = {
                 "exception_type": type(e).__name__,
                 "exception_message": str(e),
-                "processing_state": self.processing_state.copy()
+                "processing_state": self.processing_state.as_dict()
             }
             self._handle_processing_failure(filename, f"Unexpected error: {str(e)}", file_path, processing_timer, error_details)
-            self.daily_stats['failed'] += 1
+            self._count_stat('failed')
             return False
     
-    def _process_ar_ack_document(self, file_path, case_id, client_name, processing_timer):
+    def _process_ar_ack_document(self, file_path, filename, case_id, client_name, processing_timer):
         """
         Process AR Ack document with full processing (existing logic).
+        filename is the basename of file_path, as already computed by process_file.
         Returns True if successful, False if failed.
         """
-        filename = os.path.basename(file_path)
-        
         try:
             # Format client name for Airtable matching
             client_name_formatted = self.data_extractor.format_client_name_for_matching(client_name)
             
             if not client_name_formatted:
                 self._handle_processing_failure(filename, "Failed to format client name for matching", file_path, processing_timer)
-                self.daily_stats['failed'] += 1
+                self._count_stat('failed')
                 return False
             
             # Validate all required operations can be performed
             if not self._validate_all_operations(client_name, client_name_formatted):
                 self._handle_processing_failure(filename, "Pre-validation failed", file_path, processing_timer)
-                self.daily_stats['failed'] += 1
+                self._count_stat('failed')
                 return False
             
             # Execute all operations atomically
@@ -166,9 +419,9 @@ class ProcessingPipeline:
             )
             
             if success:
-                # Get the new filename and destination for audit log
-                new_filename = self.file_manager.generate_new_filename(client_name)
-                destination_folder = os.path.basename(self.file_manager.construct_client_folder_path(client_name_formatted))
+                # New filename and destination for audit log, as worked out during validation
+                new_filename = self.processing_state.new_filename
+                destination_folder = os.path.basename(self.processing_state.destination_folder)
                 
                 # Log successful processing with audit details
                 self.logger.log_file_processing_success(filename, case_id, client_name, new_filename, destination_folder, file_path,
@@ -176,40 +429,39 @@ class ProcessingPipeline:
                                                        classification_reason="AR Ack signature matched")
                 
                 # Log Airtable update details
-                from datetime import datetime
-                current_date = datetime.now().strftime("%m.%d.%y")
-                log_entry = f"Rcvd AR Ack. Filed Away. {current_date} AI"
+                # Same cached entry AirtableClient prepends to the record's Log
+                from src.airtable_client import ar_ack_log_entry
+                log_entry = ar_ack_log_entry()
                 update_data = {
                     "Case ID": case_id,
                     "Log": log_entry
                 }
-                self.logger.log_airtable_update_details(client_name, self.processing_state['record_id'], case_id, log_entry, update_data)
+                self.logger.log_airtable_update_details(client_name, self.processing_state.record_id, case_id, log_entry, update_data)
                 
                 # Log file move operation
-                if self.processing_state.get('new_file_path'):
-                    self.logger.log_file_moved(file_path, self.processing_state['new_file_path'], filename, new_filename)
+                if self.processing_state.new_file_path:
+                    self.logger.log_file_moved(file_path, self.processing_state.new_file_path, filename, new_filename)
                 
-                self.daily_stats['processed'] += 1
+                self._count_stat('processed')
                 return True
             else:
                 self._rollback_operations()
                 self._handle_processing_failure(filename, "Atomic operations failed", file_path, processing_timer)
-                self.daily_stats['failed'] += 1
+                self._count_stat('failed')
                 return False
                 
         except Exception as e:
             self._rollback_operations()
             self._handle_processing_failure(filename, f"AR Ack processing error: {str(e)}", file_path, processing_timer)
-            self.daily_stats['failed'] += 1
+            self._count_stat('failed')
             return False
     
-    def _process_other_document(self, file_path, document_type, classification_result, client_name, processing_timer):
+    def _process_other_document(self, file_path, filename, document_type, classification_result, client_name, processing_timer):
         """
         Process non-AR Ack documents with rename-only processing.
+        filename is the basename of file_path, as already computed by process_file.
         Returns True if successful, False if failed.
         """
-        filename = os.path.basename(file_path)
-        
         try:
             # Generate new filename based on document type
             new_filename = self.document_renamer.generate_filename(classification_result, client_name)
@@ -218,26 +470,25 @@ class ProcessingPipeline:
             original_dir = os.path.dirname(file_path)
             new_file_path = os.path.join(original_dir, new_filename)
             
-            # Check if target filename already exists
-            if os.path.exists(new_file_path):
+            # Rename the file, failing rather than replacing an existing target
+            # (checked atomically: another worker may be renaming to the same name)
+            if not self.file_manager.rename_no_overwrite(file_path, new_file_path):
                 self._handle_processing_failure(filename, f"Target filename already exists: {new_filename}", file_path, processing_timer)
-                self.daily_stats['failed'] += 1
+                self._count_stat('failed')
                 return False
-            
-            # Rename the file
-            os.rename(file_path, new_file_path)
-            self.processing_state['file_renamed'] = True
-            self.processing_state['new_file_path'] = new_file_path
+            self.processing_state.file_renamed = True
+            self.processing_state.new_file_path = new_file_path
             
             # Log successful renaming
             case_id = classification_result.extracted_data.get('case_id')
-            self.logger.info(f"🔄 RENAMED: {filename} → {new_filename} | Type: {document_type.value} | Client: {client_name}")
+            type_name = document_type.value
+            self.logger.info(f"🔄 RENAMED: {filename} → {new_filename} | Type: {type_name} | Client: {client_name}")
             
             # Log structured data for the renamed document
             self.logger.log_file_processing_success(
                 filename, case_id, client_name, new_filename, 
                 "Temp Folder (Renamed Only)", file_path,
-                document_type=document_type.value, 
+                document_type=type_name, 
                 classification_confidence=classification_result.confidence,
                 classification_reason=classification_result.classification_reason
             )
@@ -245,12 +496,12 @@ class ProcessingPipeline:
             # Log file move operation (though it's a rename in same directory)
             self.logger.log_file_moved(file_path, new_file_path, filename, new_filename)
             
-            self.daily_stats['renamed'] += 1
+            self._count_stat('renamed')
             return True
             
         except Exception as e:
             self._handle_processing_failure(filename, f"Document renaming error: {str(e)}", file_path, processing_timer)
-            self.daily_stats['failed'] += 1
+            self._count_stat('failed')
             return False
     
     def _validate_all_operations(self, client_name, client_name_formatted):
@@ -258,73 +509,81 @@ class ProcessingPipeline:
         Pre-validate that all operations can be performed successfully.
         Returns True if all validations pass, False otherwise.
         """
+        # Each check's (validation_type, success, details); logged as one record at the end
+        steps = []
         try:
             self.logger.info(f"[VALIDATION] Starting validation for client: {client_name_formatted}")
             
             # Validate client exists in Airtable
-            client_record = self.airtable_client.find_client_by_name(client_name_formatted)
+            client_record = self._lookup_client(client_name_formatted)
             if not client_record:
-                self.logger.log_validation_result("airtable_client_lookup", False, {
+                steps.append(("airtable_client_lookup", False, {
                     "client_name": client_name_formatted,
                     "message": f"Client not found in Airtable: {client_name_formatted}"
-                })
+                }))
                 return False
             
             # Store record ID for later use
-            self.processing_state['record_id'] = client_record['id']
-            self.logger.log_validation_result("airtable_client_lookup", True, {
+            self.processing_state.record_id = client_record['id']
+            steps.append(("airtable_client_lookup", True, {
                 "client_name": client_name_formatted,
                 "record_id": client_record['id'],
                 "message": f"Client record found: {client_record['id']}"
-            })
+            }))
             
             # REAL MODE - ACTUAL FOLDER VALIDATION
-            destination_folder = self.file_manager.construct_client_folder_path(client_name_formatted)
-            self.logger.info(f"[VALIDATION] Validating destination folder: {destination_folder}")
+            destination_folder, folder_exists = self._get_validated_folder(client_name_formatted)
             
             # Validate destination folder exists
-            if not destination_folder or not self.file_manager.validate_destination_folder(destination_folder):
-                self.logger.log_validation_result("destination_folder", False, {
+            if not folder_exists:
+                steps.append(("destination_folder", False, {
                     "client_name": client_name_formatted,
                     "destination_folder": destination_folder,
                     "message": f"Destination folder does not exist: {destination_folder}"
-                })
+                }))
                 return False
+            self.processing_state.destination_folder = destination_folder
             
             # Validate new filename can be generated
             new_filename = self.file_manager.generate_new_filename(client_name)
             if not new_filename:
-                self.logger.log_validation_result("filename_generation", False, {
+                steps.append(("filename_generation", False, {
                     "client_name": client_name,
                     "message": "Cannot generate new filename"
-                })
+                }))
                 return False
             
-            # Check if file would already exist at destination
+            # Check if file would already exist at destination. This stays a separate
+            # stat: a missing file and a missing folder both raise ENOENT, and listing
+            # the folder instead would read every letter already filed there
             new_file_path = os.path.join(destination_folder, new_filename)
             
             if os.path.exists(new_file_path):
-                self.logger.log_validation_result("file_conflict", False, {
+                steps.append(("file_conflict", False, {
                     "client_name": client_name_formatted,
                     "new_file_path": new_file_path,
                     "message": f"File already exists at destination: {new_file_path}"
-                })
+                }))
                 return False
             
             # All validations passed
-            self.logger.log_validation_result("complete_validation", True, {
+            self.processing_state.new_filename = new_filename
+            steps.append(("complete_validation", True, {
                 "client_name": client_name_formatted,
                 "destination_folder": destination_folder,
                 "new_filename": new_filename,
                 "new_file_path": new_file_path,
                 "message": f"All validations passed for {client_name_formatted}"
-            })
+            }))
             
             return True
             
         except Exception as e:
             self.logger.error(f"Validation failed: {str(e)}")
             return False
+        finally:
+            if steps:
+                self.logger.log_validation_steps(steps)
     
     def _execute_atomic_operations(self, file_path, case_id, client_name, client_name_formatted):
         """
@@ -332,13 +591,17 @@ class ProcessingPipeline:
         Returns True if all operations succeed, False if any fail.
         """
         try:
-            # Operation 1: Update Airtable record
-            record_id = self.processing_state['record_id']
-            if not self.airtable_client.update_client_record(record_id, case_id):
+            # Operation 1: Update Airtable record. It runs first so a file only
+            # reaches the client's synced folder once its record has been written.
+            record_id = self.processing_state.record_id
+            record_before = {}
+            if not self._update_airtable_record(record_id, case_id, record_before):
                 self.logger.error("Airtable update failed")
                 return False
             
-            self.processing_state['airtable_updated'] = True
+            self.processing_state.airtable_updated = True
+            self.processing_state.case_id = case_id
+            self.processing_state.record_before = record_before
             
             # Operation 2: Move and rename file
             success, new_file_path = self.file_manager.move_and_rename_file(
@@ -349,8 +612,8 @@ class ProcessingPipeline:
                 self.logger.error("File move/rename failed")
                 return False
             
-            self.processing_state['file_moved'] = True
-            self.processing_state['new_file_path'] = new_file_path
+            self.processing_state.file_moved = True
+            self.processing_state.new_file_path = new_file_path
             
             return True
             
@@ -358,59 +621,230 @@ class ProcessingPipeline:
             self.logger.error(f"Atomic operations execution failed: {str(e)}")
             return False
     
+    def _extract_texts(self, file_paths):
+        """
+        Yield (is_ar_ack, extracted_text) for each path, in order, as soon as each
+        is ready. OCR is CPU-bound and its engines are not thread-safe, so several
+        files are spread over worker processes, each with its own DocumentProcessor.
+        """
+        done = 0
+        if min(len(file_paths), self.extraction_workers) > 1:
+            pool = None
+            try:
+                pool = self._get_extraction_pool()
+                for result in pool.map(_extract_document_text, file_paths):
+                    yield result
+                    done += 1
+                return
+            except Exception as e:
+                self.logger.error(f"Parallel text extraction failed, extracting serially: {str(e)}")
+                self._discard_extraction_pool(pool)
+        
+        for file_path in file_paths[done:]:
+            with self._document_lock:
+                result = self.document_processor.process_document(file_path)
+            yield result
+    
+    def _get_extraction_pool(self):
+        """The pipeline's text extraction process pool, started on first use."""
+        with self._extraction_pool_lock:
+            if self._extraction_pool is None:
+                # spawn, not fork: a forked child would inherit the logger's queues
+                # without the threads that drain them
+                self._extraction_pool = ProcessPoolExecutor(
+                    max_workers=self.extraction_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_extraction_worker,
+                    initargs=(logging.getLevelName(self.logger.logger.level), os.path.dirname(self.logger.log_file)))
+            return self._extraction_pool
+    
+    def _discard_extraction_pool(self, pool):
+        """Drop a failed pool so the next batch starts fresh workers."""
+        if pool is None:
+            return
+        with self._extraction_pool_lock:
+            if self._extraction_pool is pool:
+                self._extraction_pool = None
+        pool.shutdown(wait=False)
+    
+    def shutdown(self):
+        """Stop the text extraction worker processes; a later batch starts new ones."""
+        with self._extraction_pool_lock:
+            pool, self._extraction_pool = self._extraction_pool, None
+        if pool is not None:
+            pool.shutdown()
+    
+    def _prefilter_reason(self, filename, file_path):
+        """Reason to ignore a file without extracting its text, or None to process it."""
+        if self._skip_filename_re is not None and self._skip_filename_re.search(filename):
+            return f"Filename matches skip pattern: {self._skip_filename_re.pattern}"
+        
+        if self._skip_max_bytes is not None:
+            try:
+                if os.path.getsize(file_path) > self._skip_max_bytes:
+                    return f"File larger than {self._skip_max_bytes} bytes"
+            except OSError:
+                pass  # Let text extraction report the unreadable file
+        
+        return None
+    
+    def _lookup_client(self, client_name_formatted):
+        """
+        Find the client's Airtable record, reusing a batched lookup or a cached
+        record younger than CLIENT_CACHE_TTL before asking Airtable.
+        Only found records are cached, so a newly added client is picked up.
+        Entries are not dropped after an update: only the record id is used here,
+        and update_client_record re-reads the current fields itself.
+        """
+        client_record = self._client_records.get(client_name_formatted)
+        if client_record is not None:
+            return client_record
+        
+        now = time.monotonic()
+        with self._client_cache_lock:
+            cached = self._client_cache.get(client_name_formatted)
+            if cached is not None:
+                if now - cached[0] < CLIENT_CACHE_TTL:
+                    self._client_cache.move_to_end(client_name_formatted)
+                    return cached[1]
+                del self._client_cache[client_name_formatted]
+        
+        with self._airtable_slots:
+            client_record = self.airtable_client.find_client_by_name(client_name_formatted)
+        
+        if client_record:
+            with self._client_cache_lock:
+                self._client_cache[client_name_formatted] = (now, client_record)
+                if len(self._client_cache) > CLIENT_CACHE_SIZE:
+                    self._client_cache.popitem(last=False)
+        return client_record
+    
+    def _get_validated_folder(self, client_name_formatted):
+        """
+        Return (destination_folder, exists) for the client's DOL Letters folder,
+        skipping the path construction and stat for folders already found this batch.
+        """
+        destination_folder = self._folder_cache.get(client_name_formatted)
+        if destination_folder is not None:
+            return destination_folder, True
+        
+        destination_folder = self.file_manager.construct_client_folder_path(client_name_formatted)
+        self.logger.info(f"[VALIDATION] Validating destination folder: {destination_folder}")
+        if not destination_folder or not self.file_manager.validate_destination_folder(destination_folder):
+            return destination_folder, False
+        
+        self._folder_cache[client_name_formatted] = destination_folder
+        return destination_folder, True
+    
+    def clear_client_cache(self):
+        """Forget every cached Airtable client record."""
+        with self._client_cache_lock:
+            self._client_cache.clear()
+    
+    def _update_airtable_record(self, record_id, case_id, record_before):
+        """
+        Update the client record, holding one of the shared Airtable request slots.
+        During process_files the update joins other workers' in one batched request.
+        record_before receives the Case ID and Log the update replaced.
+        """
+        batcher = self._airtable_batcher
+        if batcher is not None:
+            return batcher.update_client_record(record_id, case_id, before_image=record_before)
+        
+        with self._airtable_slots:
+            return self.airtable_client.update_client_record(record_id, case_id, before_image=record_before)
+    
+    def _count_stat(self, key):
+        """Increment a daily counter; batch workers update the stats concurrently."""
+        with self._stats_lock:
+            self.daily_stats[key] += 1
+    
+    def _count_document_type(self, type_name):
+        """Increment the per-document-type daily counter."""
+        with self._stats_lock:
+            by_type = self.daily_stats['by_type']
+            by_type[type_name] = by_type.get(type_name, 0) + 1
+    
     def _rollback_operations(self):
         """
         Rollback any operations that were performed if the pipeline fails.
         """
         try:
             # If file was moved (AR Ack processing), move it back
-            if self.processing_state.get('file_moved') and self.processing_state.get('new_file_path'):
-                original_path = self.processing_state['original_file_path']
-                new_path = self.processing_state['new_file_path']
+            if self.processing_state.file_moved and self.processing_state.new_file_path:
+                original_path = self.processing_state.original_file_path
+                new_path = self.processing_state.new_file_path
                 
                 try:
-                    if os.path.exists(new_path):
-                        shutil.move(new_path, original_path)
+                    if self._move_back(new_path, original_path):
                         self.logger.info(f"Rolled back file move: {new_path} -> {original_path}")
                 except Exception as e:
                     self.logger.error(f"Failed to rollback file move: {str(e)}")
             
             # If file was renamed (other document types), rename it back
-            elif self.processing_state.get('file_renamed') and self.processing_state.get('new_file_path'):
-                original_path = self.processing_state['original_file_path']
-                new_path = self.processing_state['new_file_path']
+            elif self.processing_state.file_renamed and self.processing_state.new_file_path:
+                original_path = self.processing_state.original_file_path
+                new_path = self.processing_state.new_file_path
                 
                 try:
-                    if os.path.exists(new_path):
-                        os.rename(new_path, original_path)
+                    if self._move_back(new_path, original_path):
                         self.logger.info(f"Rolled back file rename: {new_path} -> {original_path}")
                 except Exception as e:
                     self.logger.error(f"Failed to rollback file rename: {str(e)}")
             
-            # Note: Airtable rollback is complex and not implemented in this version
-            # In production, you might want to store the original values and restore them
-            if self.processing_state.get('airtable_updated'):
-                self.logger.error("Airtable rollback not implemented - manual intervention may be required")
+            # Take this run's Case ID and Log entry back out of the record
+            if self.processing_state.airtable_updated:
+                record_id = self.processing_state.record_id
+                record_before = self.processing_state.record_before
+                restored = False
+                if record_before:
+                    with self._airtable_slots:
+                        restored = self.airtable_client.revert_client_record_update(
+                            record_id, self.processing_state.case_id, record_before)
+                if restored:
+                    self.processing_state.airtable_updated = False
+                    self.logger.info(f"Rolled back Airtable update for record {record_id}")
+                else:
+                    self.logger.error(f"Airtable rollback failed for record {record_id} - manual intervention may be required")
             
         except Exception as e:
             self.logger.error(f"Rollback operations failed: {str(e)}")
     
+    def _move_back(self, new_path, original_path):
+        """
+        Return a file to its original path: one rename when both paths share a
+        filesystem, shutil.move only across devices. No stat beforehand; returns
+        False if the file is no longer at new_path.
+        """
+        try:
+            os.replace(new_path, original_path)
+            self.logger.debug("Rollback renamed %s -> %s", new_path, original_path)
+        except FileNotFoundError:
+            # Either the file is already gone, or the original folder is
+            if os.path.exists(new_path):
+                raise
+            return False
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(new_path, original_path)
+            self.logger.debug("Rollback copied %s -> %s across filesystems", new_path, original_path)
+        return True
+    
     def _handle_processing_failure(self, filename: str, reason: str, file_path: str = None, 
-                                  timer_id: str = None, error_details: Dict[str, Any] = None):
+                                  timer_id=None, error_details: Dict[str, Any] = None):
         """Handle processing failure with proper logging and performance tracking."""
-        # End performance tracking if timer provided
-        if timer_id:
-            try:
-                duration = self.logger.end_timer(timer_id)
-                self.logger.info(f"File processing failed after {duration:.2f} seconds")
-            except:
-                pass  # Timer may have already been ended
+        # End performance tracking if timer provided and still running
+        if timer_id is not None and not timer_id.ended:
+            duration = self.logger.end_timer(timer_id)
+            self.logger.info(f"File processing failed after {duration:.2f} seconds")
         
         # Log the failure with structured data
         self.logger.log_file_processing_failure(filename, reason, file_path, error_details)
     
     def log_daily_summary(self):
         """Log daily processing summary."""
+        self._folder_cache.clear()
         self.logger.log_daily_summary(
             processed_count=self.daily_stats['processed'],
             ignored_count=self.daily_stats['ignored'], 
@@ -422,4 +856,18 @@ class ProcessingPipeline:
     
     def get_processing_stats(self):
         """Get current processing statistics."""
-        return self.daily_stats.copy()
\ No newline at end of file
+        return self.daily_stats.copy()
+
+# One DocumentProcessor per extraction worker process, built by _init_extraction_worker
+_worker_document_processor = None
+
+def _init_extraction_worker(log_level, logs_dir):
+    """Process pool initializer: build the worker's DocumentProcessor once, logging at the pipeline's level."""
+    global _worker_document_processor
+    from src.document_processor import DocumentProcessor
+    _worker_document_processor = DocumentProcessor(SWNALogger(log_level, logs_dir))
+    _worker_document_processor.warmup()
+
+def _extract_document_text(file_path):
+    """Worker for parallel text extraction; module level so process pools can pickle it."""
+    return _worker_document_processor.process_document(file_path)
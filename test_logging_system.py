@@ -4,11 +4,13 @@ Test script for the new structured logging system.
 Simulates various operations to verify logging functionality.
 """
 
+import json
 import os
 import sys
 import tempfile
 import shutil
 from datetime import datetime
+from itertools import islice
 
 # Add src directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
@@ -18,8 +20,17 @@ from log_analyzer import LogAnalyzer, LogQuery
 from daily_reporter import DailyReporter
 from log_rotator import LogRotator
 
-def test_basic_logging():
-    """Test basic logging functionality."""
+try:
+    # Only needed when this script is collected by pytest
+    import pytest
+except ImportError:
+    pytest = None
+
+def write_sample_logs():
+    """
+    Write one of each structured log entry to a new temporary logs directory.
+    Returns the directory, or None if logging failed.
+    """
     print("Testing basic logging functionality...")
     
     # Create temporary logs directory
@@ -107,6 +118,7 @@ def test_basic_logging():
         # Test 6: System shutdown
         print("✓ Testing system shutdown logging...")
         logger.log_shutdown("test_complete")
+        logger.flush()
         
         print(f"✅ Basic logging tests completed successfully!")
         
@@ -126,6 +138,27 @@ def test_basic_logging():
         shutil.rmtree(temp_logs_dir, ignore_errors=True)
         return None
 
+def test_basic_logging():
+    """Test basic logging functionality."""
+    logs_dir = write_sample_logs()
+    assert logs_dir, "Basic logging test failed"
+    
+    try:
+        for log_name in ("audit.jsonl", "performance.jsonl"):
+            assert os.path.getsize(os.path.join(logs_dir, log_name)) > 0, f"{log_name} should have entries"
+    finally:
+        shutil.rmtree(logs_dir, ignore_errors=True)
+
+if pytest is not None:
+    @pytest.fixture(scope="module")
+    def logs_dir():
+        """Logs written once by write_sample_logs and shared by the tests below, as main() does."""
+        logs_dir = write_sample_logs()
+        if not logs_dir:
+            pytest.fail("Basic logging test failed")
+        yield logs_dir
+        shutil.rmtree(logs_dir, ignore_errors=True)
+
 def test_log_analyzer(logs_dir):
     """Test log analysis functionality."""
     print("\nTesting log analysis functionality...")
@@ -234,26 +267,22 @@ def display_sample_logs(logs_dir):
     if os.path.exists(audit_file):
         print("📋 AUDIT LOG SAMPLES:")
         with open(audit_file, 'r') as f:
-            lines = f.readlines()
-            for i, line in enumerate(lines[:3]):  # Show first 3 entries
+            for i, line in enumerate(islice(f, 3)):  # Show first 3 entries
                 try:
-                    import json
                     entry = json.loads(line.strip())
                     print(f"  {i+1}. {entry.get('action', 'unknown')} - {entry.get('status', 'unknown')} [{entry.get('timestamp', '')[:19]}]")
-                except:
+                except (ValueError, AttributeError, TypeError):
                     print(f"  {i+1}. [Invalid JSON entry]")
     
     perf_file = os.path.join(logs_dir, "performance.jsonl")
     if os.path.exists(perf_file):
         print("\n⚡ PERFORMANCE LOG SAMPLES:")
         with open(perf_file, 'r') as f:
-            lines = f.readlines()
-            for i, line in enumerate(lines[:2]):  # Show first 2 entries
+            for i, line in enumerate(islice(f, 2)):  # Show first 2 entries
                 try:
-                    import json
                     entry = json.loads(line.strip())
                     print(f"  {i+1}. {entry.get('operation', 'unknown')} - {entry.get('duration_seconds', 0)}s")
-                except:
+                except (ValueError, AttributeError, TypeError):
                     print(f"  {i+1}. [Invalid JSON entry]")
 
 def main():
@@ -262,7 +291,7 @@ def main():
     print("=" * 60)
     
     # Test basic logging
-    logs_dir = test_basic_logging()
+    logs_dir = write_sample_logs()
     if not logs_dir:
         print("❌ Basic logging test failed. Aborting further tests.")
         return
@@ -89,8 +89,10 @@ def pytest_configure(config):
 
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers automatically."""
+    integration_marker = pytest.mark.integration
+    rollback_marker = pytest.mark.rollback
     for item in items:
         if "test_integration" in item.nodeid:
-            item.add_marker(pytest.mark.integration)
+            item.add_marker(integration_marker)
         if "rollback" in item.name:
-            item.add_marker(pytest.mark.rollback)
\ No newline at end of file
+            item.add_marker(rollback_marker)
\ No newline at end of file
@@ -2,7 +2,7 @@
 Mock Airtable client with rollback tracking for integration tests
 """
 
-from datetime import datetime
+from src.file_manager import today_str
 
 class MockAirtableClient:
     """Mock Airtable client that tracks operations for rollback testing."""
@@ -32,6 +32,8 @@ class MockAirtableClient:
                 }
             }
         }
+        # Same client dicts, keyed by record id
+        self._by_record_id = {client["id"]: client for client in self.test_clients.values()}
         
         # Track updates for rollback
         self.original_states = {}
@@ -68,7 +70,7 @@ class MockAirtableClient:
                 self.logger.info(f"[MOCK] Client not found: {client_name_formatted}")
             return None
     
-    def update_client_record(self, record_id, case_id):
+    def update_client_record(self, record_id, case_id, before_image=None):
         """Mock record update with rollback tracking."""
         self.operation_count += 1
         
@@ -79,17 +81,13 @@ class MockAirtableClient:
             raise Exception("Mock Airtable update failure")
         
         # Find the original record to store for rollback
-        original_record = None
-        for client_name, client_data in self.test_clients.items():
-            if client_data["id"] == record_id:
-                # Store original state for rollback
-                self.original_states[record_id] = client_data["fields"].copy()
-                original_record = client_data
-                break
-        
+        original_record = self._by_record_id.get(record_id)
         if not original_record:
             raise Exception(f"Mock record not found: {record_id}")
         
+        # Store original state for rollback
+        self.original_states[record_id] = original_record["fields"].copy()
+        
         # Check if Case ID already exists and matches
         existing_case_id = original_record["fields"].get("Case ID", "")
         if existing_case_id == case_id:
@@ -108,12 +106,16 @@ class MockAirtableClient:
             self.operations.append(operation)
             return True
         
-        # Simulate update
-        current_date = datetime.now().strftime("%m.%d.%y")
+        # Simulate update, prepending the entry as AirtableClient does
+        current_date = today_str()
         log_entry = f"Rcvd AR Ack. Filed Away. {current_date} AI"
         
         existing_log = original_record["fields"].get("Log", "")
-        new_log = f"{existing_log}\n{log_entry}" if existing_log else log_entry
+        new_log = f"{log_entry}\n{existing_log}" if existing_log else log_entry
+        if before_image is not None:
+            before_image['Case ID'] = original_record["fields"].get('Case ID')
+            before_image['Log'] = existing_log
+            before_image['Log entry'] = log_entry
         
         # Update the mock data
         original_record["fields"]["Case ID"] = case_id
@@ -134,6 +136,78 @@ class MockAirtableClient:
         
         return True
     
+    def find_clients_by_names(self, client_names_formatted):
+        """Mock batched client search: one operation for the whole list of names."""
+        self.operation_count += 1
+        
+        # Check if we should fail at this operation
+        if self.should_fail_at == self.operation_count:
+            if self.logger:
+                self.logger.error(f"[MOCK] Injected failure at operation {self.operation_count}")
+            raise Exception("Mock Airtable search failure")
+        
+        names = list(dict.fromkeys(client_names_formatted))
+        operation = {
+            "type": "search",
+            "client_names": names,
+            "operation_id": self.operation_count
+        }
+        self.operations.append(operation)
+        
+        if self.logger:
+            self.logger.info(f"[MOCK] Searching for {len(names)} clients")
+        
+        # Names without a record are left out, as in AirtableClient
+        return {name: self.test_clients[name].copy() for name in names if name in self.test_clients}
+    
+    def update_client_records(self, updates):
+        """Mock batched record update: (record_id, case_id, before_image) per update."""
+        try:
+            record_ids = [record_id for record_id, _, _ in updates]
+            if len(set(record_ids)) != len(record_ids):
+                raise ValueError("Duplicate record ids in one batched update")
+            return [self.update_client_record(record_id, case_id, before_image)
+                    for record_id, case_id, before_image in updates]
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"[MOCK] Batch update failed: {str(e)}")
+            return [False] * len(updates)
+    
+    def revert_client_record_update(self, record_id, case_id, before_image):
+        """Mock compensating update: remove only what update_client_record wrote."""
+        self.operation_count += 1
+        
+        # Check if we should fail at this operation
+        if self.should_fail_at == self.operation_count:
+            if self.logger:
+                self.logger.error(f"[MOCK] Injected failure at operation {self.operation_count}")
+            return False
+        
+        client_data = self._by_record_id.get(record_id)
+        if client_data is None:
+            return False
+        fields = client_data["fields"]
+        
+        if before_image.get('Case ID') != case_id and fields.get('Case ID') == case_id:
+            fields['Case ID'] = before_image.get('Case ID')
+        
+        log_lines = (fields.get('Log') or '').split('\n')
+        if before_image.get('Log entry') in log_lines:
+            log_lines.remove(before_image['Log entry'])
+            fields['Log'] = '\n'.join(log_lines)
+        
+        operation = {
+            "type": "revert",
+            "record_id": record_id,
+            "case_id": case_id,
+            "operation_id": self.operation_count
+        }
+        self.operations.append(operation)
+        
+        if self.logger:
+            self.logger.info(f"[MOCK] Reverted update for record {record_id}")
+        return True
+    
     def validate_client_match(self, extracted_client_name, airtable_record):
         """Mock validation."""
         airtable_name = airtable_record.get('fields', {}).get('Name', '')
@@ -175,12 +249,11 @@ class MockAirtableClient:
                     original_state = operation["original_state"]
                     
                     # Find the record and restore original state
-                    for client_name, client_data in self.test_clients.items():
-                        if client_data["id"] == record_id:
-                            client_data["fields"] = original_state.copy()
-                            if self.logger:
-                                self.logger.info(f"[MOCK] Rolled back update for record {record_id}")
-                            break
+                    client_data = self._by_record_id.get(record_id)
+                    if client_data is not None:
+                        client_data["fields"] = original_state.copy()
+                        if self.logger:
+                            self.logger.info(f"[MOCK] Rolled back update for record {record_id}")
                 
                 # Search operations don't need rollback
                 
@@ -4,7 +4,7 @@ Mock file manager with rollback tracking for integration tests
 
 import os
 import shutil
-from datetime import datetime
+from src.file_manager import today_str
 
 class MockFileManager:
     """Mock file manager that tracks operations for rollback testing."""
@@ -25,14 +25,18 @@ class MockFileManager:
     def generate_new_filename(self, client_name):
         """Mock filename generation."""
         try:
-            name_parts = client_name.strip().split()
-            if len(name_parts) < 2:
+            # Same parsing as FileManager.generate_new_filename
+            name = client_name.strip()
+            if not name.isprintable():
+                name = " ".join(name.split())
+            
+            first_name, sep, rest = name.partition(' ')
+            if not sep:
                 return None
             
-            first_name = name_parts[0]
-            last_name = name_parts[-1]
+            last_name = rest.rpartition(' ')[2]
             first_initial = first_name[0].upper()
-            current_date = datetime.now().strftime("%m.%d.%y")
+            current_date = today_str()
             
             return f"AR Ack - {first_initial}. {last_name} {current_date}.pdf"
         except Exception as e:
@@ -119,7 +123,38 @@ class MockFileManager:
             if self.logger:
                 self.logger.error(f"[MOCK] File move failed: {str(e)}")
             return False, None
-    
+
+    def rename_no_overwrite(self, source_path, destination_path):
+        """Mock rename that refuses to replace an existing destination."""
+        self.operation_count += 1
+
+        # Check if we should fail at this operation
+        if self.should_fail_at == self.operation_count:
+            if self.logger:
+                self.logger.error(f"[MOCK] Injected failure at operation {self.operation_count}")
+            raise Exception("Mock file rename failure")
+
+        if destination_path in self.mock_files:
+            if self.logger:
+                self.logger.error(f"[MOCK] File already exists at destination: {destination_path}")
+            return False
+
+        # Recorded as a move so rollback_file_operations can reverse it
+        operation = {
+            "type": "file_move",
+            "original_path": source_path,
+            "destination_path": destination_path,
+            "operation_id": self.operation_count
+        }
+        self.file_operations.append(operation)
+
+        self.mock_files.pop(source_path, None)
+        self.mock_files[destination_path] = True
+
+        if self.logger:
+            self.logger.info(f"[MOCK] Renamed file: {source_path} -> {destination_path}")
+        return True
+
     def is_already_processed_file(self, filename):
         """Mock processed file check."""
         return filename.startswith("AR Ack - ") and filename.endswith(".pdf")
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Tests for AirtableClient record updates and their rollback, against an in-memory table
+"""
+
+import threading
+import time
+
+import pytest
+from unittest.mock import patch
+
+from src.airtable_client import AirtableClient, AirtableUpdateBatcher, ar_ack_log_entry
+from src.logger import SWNALogger
+
+
+class FakeTable:
+    """Just enough of pyairtable's Table for AirtableClient: records kept in a dict."""
+
+    def __init__(self, records):
+        self.records = records  # record id -> fields
+        self.requests = []  # (method, args) per call, in order
+
+    def get(self, record_id):
+        self.requests.append(("get", record_id))
+        return {"id": record_id, "fields": dict(self.records[record_id])}
+
+    def update(self, record_id, fields):
+        self.requests.append(("update", record_id))
+        self.records[record_id].update(fields)
+        return {"id": record_id, "fields": dict(self.records[record_id])}
+
+
+@pytest.fixture
+def table():
+    return FakeTable({
+        "rec1": {"Name": "Doe, Jane", "Case ID": "", "Log": "Sent AR form 01.02.24"},
+    })
+
+
+@pytest.fixture
+def client(table):
+    with patch("src.airtable_client.Table", return_value=table):
+        return AirtableClient(SWNALogger())
+
+
+class TestRevertClientRecordUpdate:
+    """revert_client_record_update removes only the change one update made."""
+
+    def test_restores_untouched_record(self, client, table):
+        before = {}
+        assert client.update_client_record("rec1", "50001234", before_image=before)
+        assert table.records["rec1"]["Log"] == f"{ar_ack_log_entry()}\nSent AR form 01.02.24"
+
+        assert client.revert_client_record_update("rec1", "50001234", before)
+        assert table.records["rec1"]["Case ID"] == ""
+        assert table.records["rec1"]["Log"] == "Sent AR form 01.02.24"
+
+    def test_keeps_edits_made_after_the_update(self, client, table):
+        before = {}
+        client.update_client_record("rec1", "50001234", before_image=before)
+
+        # Someone corrects the Case ID and adds a note before the rollback runs
+        table.records["rec1"]["Case ID"] = "50009999"
+        table.records["rec1"]["Log"] = "Called client\n" + table.records["rec1"]["Log"]
+
+        assert client.revert_client_record_update("rec1", "50001234", before)
+        assert table.records["rec1"]["Case ID"] == "50009999"
+        assert table.records["rec1"]["Log"] == "Called client\nSent AR form 01.02.24"
+
+    def test_skips_write_when_nothing_of_the_update_is_left(self, client, table):
+        before = {}
+        client.update_client_record("rec1", "50001234", before_image=before)
+        table.records["rec1"].update({"Case ID": "50009999", "Log": "Rewritten by hand"})
+
+        assert client.revert_client_record_update("rec1", "50001234", before)
+        assert table.requests[-1] == ("get", "rec1")
+        assert table.records["rec1"] == {"Name": "Doe, Jane", "Case ID": "50009999", "Log": "Rewritten by hand"}
+
+    def test_case_id_left_alone_when_update_did_not_change_it(self, client, table):
+        table.records["rec1"]["Case ID"] = "50001234"
+        before = {}
+        client.update_client_record("rec1", "50001234", before_image=before)
+
+        assert client.revert_client_record_update("rec1", "50001234", before)
+        assert table.records["rec1"]["Case ID"] == "50001234"
+        assert table.records["rec1"]["Log"] == "Sent AR form 01.02.24"
+
+
+class FakeBatchClient:
+    """Records each update_client_records request; fails them all when told to."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def update_client_records(self, updates):
+        with self._lock:
+            self.requests.append([(record_id, case_id) for record_id, case_id, _ in updates])
+        if self.fail:
+            raise Exception("Airtable unavailable")
+        for record_id, case_id, before_image in updates:
+            if before_image is not None:
+                before_image["Case ID"] = f"before {record_id}"
+        return [True] * len(updates)
+
+
+def run_concurrently(batcher, updates):
+    """Call batcher.update_client_record once per (record_id, case_id) from its own thread."""
+    results = [None] * len(updates)
+    start = threading.Barrier(len(updates))
+
+    def call(i, record_id, case_id):
+        start.wait()
+        results[i] = batcher.update_client_record(record_id, case_id)
+
+    threads = [threading.Thread(target=call, args=(i, record_id, case_id))
+               for i, (record_id, case_id) in enumerate(updates)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+        assert not thread.is_alive(), "a caller was left waiting"
+    return results
+
+
+class TestAirtableUpdateBatcher:
+    """AirtableUpdateBatcher coalescing concurrent updates into batched requests."""
+
+    def test_single_caller(self):
+        client = FakeBatchClient()
+        batcher = AirtableUpdateBatcher(client, wait=0.01)
+        before = {}
+
+        assert batcher.update_client_record("rec1", "50001234", before_image=before) is True
+        assert client.requests == [[("rec1", "50001234")]]
+        assert before == {"Case ID": "before rec1"}
+
+    def test_concurrent_callers_share_one_request(self):
+        client = FakeBatchClient()
+        batcher = AirtableUpdateBatcher(client, wait=1.0)
+        updates = [(f"rec{i}", f"5000000{i}") for i in range(5)]
+
+        results = run_concurrently(batcher, updates)
+
+        assert results == [True] * 5
+        assert len(client.requests) == 1
+        assert sorted(client.requests[0]) == updates
+
+    def test_full_batch_is_sent_without_waiting(self):
+        client = FakeBatchClient()
+        batcher = AirtableUpdateBatcher(client, wait=30.0)
+        updates = [(f"rec{i:02d}", "50001234") for i in range(10)]
+
+        started = time.monotonic()
+        assert run_concurrently(batcher, updates) == [True] * 10
+        assert time.monotonic() - started < 10
+        assert len(client.requests) == 1
+
+    def test_duplicate_record_ids_go_in_separate_requests(self):
+        client = FakeBatchClient()
+        batcher = AirtableUpdateBatcher(client, wait=0.2)
+
+        results = run_concurrently(batcher, [("rec1", "50001234"), ("rec1", "50005678"), ("rec2", "50009999")])
+
+        assert results == [True, True, True]
+        for request in client.requests:
+            record_ids = [record_id for record_id, _ in request]
+            assert len(record_ids) == len(set(record_ids))
+        sent = sorted(update for request in client.requests for update in request)
+        assert sent == [("rec1", "50001234"), ("rec1", "50005678"), ("rec2", "50009999")]
+
+    def test_failed_request_fails_every_waiter(self):
+        client = FakeBatchClient(fail=True)
+        batcher = AirtableUpdateBatcher(client, wait=0.2)
+
+        results = run_concurrently(batcher, [(f"rec{i}", "50001234") for i in range(4)])
+
+        assert results == [False] * 4
+        # Later calls are still served
+        client.fail = False
+        assert batcher.update_client_record("rec9", "50001234") is True
+
+    def test_client_rejects_duplicate_record_ids_in_one_request(self, client, table):
+        results = client.update_client_records([("rec1", "50001234", None), ("rec1", "50005678", None)])
+
+        assert results == [False, False]
+        assert table.requests == []
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for the Bloom filter sidecars written next to archived audit logs
+"""
+
+import struct
+
+import pytest
+
+from src.bloom_filter import BloomFilter
+
+
+CASE_IDS = [f"5000{i:04d}" for i in range(500)]
+
+
+@pytest.fixture
+def bloom():
+    bloom = BloomFilter(capacity=len(CASE_IDS))
+    for case_id in CASE_IDS:
+        bloom.add(case_id)
+    return bloom
+
+
+def test_added_keys_are_members(bloom):
+    assert all(case_id in bloom for case_id in CASE_IDS)
+
+
+def test_absent_keys_are_mostly_rejected(bloom):
+    absent = [f"6000{i:04d}" for i in range(2000)]
+    false_positives = sum(case_id in bloom for case_id in absent)
+    # Sized for a 0.1% error rate; allow generous slack over 2000 lookups
+    assert false_positives <= 20
+
+
+def test_empty_filter_contains_nothing():
+    assert "50001234" not in BloomFilter(capacity=0)
+
+
+def test_save_load_round_trip(bloom, tmp_path):
+    path = str(tmp_path / "audit.jsonl.gz.bloom")
+    bloom.save(path)
+
+    loaded = BloomFilter.load(path)
+
+    assert (loaded.num_bits, loaded.num_hashes, loaded.bits) == (bloom.num_bits, bloom.num_hashes, bloom.bits)
+    assert all(case_id in loaded for case_id in CASE_IDS)
+
+
+@pytest.mark.parametrize("corrupt", [
+    lambda data: b"",
+    lambda data: data[:5],  # truncated header
+    lambda data: data[:-1],  # truncated bit array
+    lambda data: data + b"\x00",  # trailing bytes
+    lambda data: b"XXXX" + data[4:],  # wrong magic
+    lambda data: struct.pack("<4sII", b"SWBF", 0, 0),  # no bits to test against
+    lambda data: data[:8] + struct.pack("<I", 0) + data[12:],  # zero hash functions
+])
+def test_load_rejects_corrupt_files(bloom, tmp_path, corrupt):
+    path = tmp_path / "audit.jsonl.gz.bloom"
+    bloom.save(str(path))
+    path.write_bytes(corrupt(path.read_bytes()))
+
+    with pytest.raises(ValueError):
+        BloomFilter.load(str(path))
+
+
+def test_load_missing_file_raises_oserror(tmp_path):
+    with pytest.raises(OSError):
+        BloomFilter.load(str(tmp_path / "missing.bloom"))
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Tests for DocumentClassifier use from several threads
+"""
+
+import threading
+
+from src.document_classifier import DocumentClassifier, DocumentType
+
+
+AR_ACK_TEXT = (
+    "Acknowledgment of Authorized Representative. Case ID Number: 50001234. "
+    "Employee Name: Test ARACK. Claim for occupational asbestos exposure. "
+    "According to our records, you have been designated as the authorized representative "
+    "in the above case. "
+) * 40
+
+
+def test_classify_document_from_many_threads():
+    """One classifier shared by worker threads gives every thread the single-threaded result."""
+    classifier = DocumentClassifier()
+    expected = classifier.classify_document(AR_ACK_TEXT).document_type
+    assert expected == DocumentType.AR_ACK
+
+    errors, mismatches = [], []
+    start = threading.Barrier(8)
+
+    def classify_repeatedly():
+        start.wait()
+        for _ in range(200):
+            try:
+                if classifier.classify_document(AR_ACK_TEXT).document_type != expected:
+                    mismatches.append(1)
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=classify_repeatedly) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert mismatches == []
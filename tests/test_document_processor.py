@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the DocumentProcessor OCR result cache
+"""
+
+import os
+
+import pytest
+from unittest.mock import patch
+
+from src.document_processor import DocumentProcessor
+from src.logger import SWNALogger
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    cache_dir = str(tmp_path / "ocr")
+    with patch("src.document_processor.OCR_CACHE_DIR", cache_dir):
+        yield cache_dir
+
+
+@pytest.fixture
+def processor():
+    return DocumentProcessor(SWNALogger())
+
+
+@pytest.fixture
+def scan(tmp_path):
+    path = tmp_path / "scan.pdf"
+    path.write_bytes(b"%PDF-1.4 scanned page")
+    return str(path)
+
+
+class TestOCRCache:
+    """_read_ocr_cache / _write_ocr_cache and the path they are keyed by."""
+
+    def test_disabled_when_no_directory_is_set(self, processor, scan):
+        with patch("src.document_processor.OCR_CACHE_DIR", ""):
+            assert processor._get_ocr_cache_path(scan) is None
+        assert processor._read_ocr_cache(None) is None
+        processor._write_ocr_cache(None, "text")  # no-op, no error
+
+    def test_miss_then_hit(self, processor, scan, cache_dir):
+        cache_path = processor._get_ocr_cache_path(scan)
+        assert os.path.dirname(cache_path) == cache_dir
+        assert processor._read_ocr_cache(cache_path) is None
+
+        processor._write_ocr_cache(cache_path, "Case ID Number: 50001234")
+
+        assert processor._read_ocr_cache(cache_path) == "Case ID Number: 50001234"
+        assert os.listdir(cache_dir) == [os.path.basename(cache_path)], "no temp files left behind"
+
+    def test_key_follows_file_contents(self, processor, scan, tmp_path, cache_dir):
+        copy = tmp_path / "copy.pdf"
+        copy.write_bytes(open(scan, "rb").read())
+        assert processor._get_ocr_cache_path(str(copy)) == processor._get_ocr_cache_path(scan)
+
+        with open(scan, "ab") as f:
+            f.write(b" rescanned")
+        os.utime(scan, ns=(0, 0))  # mtime change guarantees the memoized hash is not reused
+        assert processor._get_ocr_cache_path(scan) != processor._get_ocr_cache_path(str(copy))
+
+    def test_corrupt_entry_is_a_miss_and_removed(self, processor, scan, cache_dir):
+        cache_path = processor._get_ocr_cache_path(scan)
+        os.makedirs(cache_dir)
+        with open(cache_path, "wb") as f:
+            f.write(b"\xff\xfe\x00garbage")
+
+        assert processor._read_ocr_cache(cache_path) is None
+        assert not os.path.exists(cache_path)
+
+    def test_empty_entry_is_not_used(self, processor, scan, cache_dir):
+        cache_path = processor._get_ocr_cache_path(scan)
+        processor._write_ocr_cache(cache_path, "")
+
+        with patch.object(processor, "_extract_text_layer", return_value=None), \
+                patch.object(processor, "_extract_with_ocr", return_value="fresh OCR text") as ocr:
+            assert processor.extract_text_from_pdf(scan) == "fresh OCR text"
+        ocr.assert_called_once()
+        assert processor._read_ocr_cache(cache_path) == "fresh OCR text"
+
+    def test_cached_text_skips_ocr(self, processor, scan, cache_dir):
+        processor._write_ocr_cache(processor._get_ocr_cache_path(scan), "cached OCR text")
+
+        with patch.object(processor, "_extract_with_ocr") as ocr:
+            assert processor.extract_text_from_pdf(scan) == "cached OCR text"
+        ocr.assert_not_called()
+
+    def test_failed_write_leaves_no_entry(self, processor, scan, cache_dir, tmp_path):
+        # A file where the cache directory should be makes every write fail
+        blocked = tmp_path / "blocked"
+        blocked.write_text("")
+        cache_path = str(blocked / "entry.txt")
+
+        processor._write_ocr_cache(cache_path, "text")
+
+        assert processor._read_ocr_cache(cache_path) is None
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests for DocumentRenamer filenames built from extracted data
+"""
+
+import time
+
+import pytest
+from unittest.mock import patch
+
+from src.document_classifier import DocumentClassificationResult, DocumentType
+from src.document_renamer import DocumentRenamer, _today_str
+
+
+@pytest.mark.parametrize("doc_type, extracted_data, expected", [
+    (DocumentType.AR_ACK, {}, "AR Ack"),
+    (DocumentType.RD_ACCEPT_BE, {}, "RD Accept B&E $150k"),
+    (DocumentType.RD_ACCEPT_BE, {"amounts": ["$250k", "$1k"]}, "RD Accept B&E $250k"),
+    (DocumentType.RD_ACCEPT_IMPAIR, {"amounts": []}, "RD Accept Impair"),
+    (DocumentType.RD_ACCEPT_E, {}, "RD Accept E PF"),
+    (DocumentType.RD_ACCEPT_E, {"conditions": ["COPD", "OSA"]}, "RD Accept E COPD"),
+    (DocumentType.FD_ACCEPT_IR, {"amounts": ["$37k"], "conditions": ["BCC"]}, "FD Accept IR $37k"),
+    (DocumentType.FD_DENY, {"amounts": ["$37k"]}, "FD Deny"),
+    (DocumentType.FD_ACCEPT_CQ_SPECIFIC, {"conditions": ["OSA"]}, "FD Accept CQ OSA"),
+    (DocumentType.DR_IR_REPORT, {}, "Dr IR Report"),
+    (DocumentType.DR_IR_REPORT, {"doctors": ["Smith"], "percentages": ["12%", "5%"], "is_increased": True},
+     "Dr. Smith IR 12% (5% incr)"),
+    (DocumentType.UNKNOWN, {}, "Unknown Document"),
+])
+def test_base_name(doc_type, extracted_data, expected):
+    assert DocumentRenamer()._generate_base_name(doc_type, extracted_data) == expected
+
+
+def test_generate_filename():
+    result = DocumentClassificationResult(DocumentType.RD_DENY, 0.9, {"conditions": ["asbestosis"]}, "test")
+
+    filename = DocumentRenamer().generate_filename(result, "Jane Q Doe", date_override="3.1.24")
+
+    assert filename == "RD Deny asbestosis - J. Doe 3.1.24.pdf"
+
+
+def test_today_str_follows_the_local_day():
+    days = [time.struct_time((2024, 3, 1, 23, 59, 59, 4, 61, 0)), time.struct_time((2024, 3, 2, 0, 0, 1, 5, 62, 0))]
+
+    with patch("src.document_renamer.time.localtime", side_effect=days):
+        assert [_today_str(), _today_str()] == ["3.1.24", "3.2.24"]
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for FolderMonitor processing of files already in the monitored folders
+"""
+
+import os
+
+import pytest
+from unittest.mock import Mock, patch
+
+from src.folder_monitor import FolderMonitor
+from src.processing_pipeline import BatchResult
+
+
+@pytest.fixture
+def scans(tmp_path):
+    paths = []
+    for name in ("a.pdf", "b.pdf", "c.pdf"):
+        path = tmp_path / name
+        path.write_bytes(b"%PDF-1.4")
+        os.utime(path, (0, 0))  # old enough to count as fully written
+        paths.append(str(path))
+    return paths
+
+
+def make_monitor(tmp_path, process_callback, batch_callback):
+    with patch.object(FolderMonitor, "_build_monitoring_paths", return_value=[str(tmp_path)]):
+        return FolderMonitor(process_callback, logger=Mock(), batch_callback=batch_callback)
+
+
+def test_batch_handles_every_file(tmp_path, scans):
+    process = Mock()
+    batch = Mock(side_effect=lambda paths: BatchResult({path: True for path in paths}))
+
+    make_monitor(tmp_path, process, batch).process_existing_files()
+
+    assert sorted(batch.call_args.args[0]) == scans
+    process.assert_not_called()
+
+
+def test_failed_batch_falls_back_to_files_still_present(tmp_path, scans):
+    def batch(paths):
+        os.remove(scans[0])  # handled and moved away before the failure
+        raise RuntimeError("worker pool crashed")
+
+    process = Mock()
+
+    make_monitor(tmp_path, process, batch).process_existing_files()
+
+    assert sorted(call.args[0] for call in process.call_args_list) == scans[1:]
+
+
+def test_files_missing_from_batch_result_are_processed_individually(tmp_path, scans):
+    process = Mock()
+    batch = Mock(return_value=BatchResult({scans[0]: True, scans[2]: False}))
+
+    make_monitor(tmp_path, process, batch).process_existing_files()
+
+    process.assert_called_once_with(scans[1])
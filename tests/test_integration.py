@@ -4,6 +4,7 @@ Integration tests for SWNA Automation Pipeline
 Tests the complete workflow with rollback scenarios
 """
 
+import logging
 import os
 import pytest
 import tempfile
@@ -17,6 +18,9 @@ from src.logger import SWNALogger
 # Import our mocks
 from tests.mocks.mock_airtable import MockAirtableClient
 from tests.mocks.mock_filesystem import MockFileManager
+
+# The test PDFs are drawn with reportlab; skip this module rather than error without it
+pytest.importorskip("reportlab")
 from tests.test_pdf_generator import create_test_ar_ack_pdf, create_invalid_pdf, create_malformed_ar_ack_pdf
 
 
@@ -46,20 +50,17 @@ class TestIntegrationPipeline:
     
     def create_pipeline_with_mocks(self):
         """Create a pipeline with mocked components."""
-        pipeline = ProcessingPipeline(self.logger)
-        
-        # Replace real components with mocks
-        pipeline.airtable_client = self.mock_airtable
-        pipeline.file_manager = self.mock_file_manager
+        pipeline = ProcessingPipeline(self.logger, airtable_client=self.mock_airtable,
+                                      file_manager=self.mock_file_manager)
         
         # Override the rollback method to use our mock rollbacks
         original_rollback = pipeline._rollback_operations
         def mock_rollback():
             try:
                 # Use mock rollbacks instead of real ones
-                if pipeline.processing_state.get('file_moved'):
+                if pipeline.processing_state.file_moved:
                     self.mock_file_manager.rollback_file_operations()
-                if pipeline.processing_state.get('airtable_updated'):
+                if pipeline.processing_state.airtable_updated:
                     self.mock_airtable.rollback_operations()
             except Exception as e:
                 self.logger.error(f"Mock rollback failed: {str(e)}")
@@ -330,6 +331,166 @@ class TestIntegrationPipeline:
         # Verify file is still in original location
         assert self.mock_file_manager.file_exists(self.test_pdf_path), "File should remain in original location after rollback"
 
+    def test_batch_uses_batched_airtable_calls(self):
+        """Test process_files looks clients up and updates them through the batched calls."""
+        first_path = str(self.test_files_dir / "first_ar_ack.pdf")
+        second_path = str(self.test_files_dir / "second_ar_ack.pdf")
+        create_test_ar_ack_pdf("Test ARACK", "50001234", first_path)
+        create_test_ar_ack_pdf("Existing Client", "12345678", second_path)
+        self.mock_file_manager.add_mock_file(first_path)
+        self.mock_file_manager.add_mock_file(second_path)
+
+        pipeline = self.create_pipeline_with_mocks()
+        result = pipeline.process_files([first_path, second_path], max_workers=2)
+
+        assert result.results == {first_path: True, second_path: True}, "Both files should succeed"
+
+        # One batched search covers both clients; no per-file searches follow it
+        airtable_ops = self.mock_airtable.get_operations_log()
+        searches = [op for op in airtable_ops if op["type"] == "search"]
+        assert len(searches) == 1, f"Expected 1 batched search, got {len(searches)}"
+        assert sorted(searches[0]["client_names"]) == ["ARACK, Test", "Client, Existing"]
+
+        updates = {op["record_id"]: op for op in airtable_ops if op["type"] == "update"}
+        assert set(updates) == {"rec_test_001", "rec_test_002"}, "Both records should be updated"
+        assert self.mock_airtable.get_client_state("ARACK, Test")["Case ID"] == "50001234"
+
+        file_ops = self.mock_file_manager.get_operations_log()
+        assert len([op for op in file_ops if op["type"] == "file_move"]) == 2, "Both files should be moved"
+
+    def test_batch_classifies_concurrently(self):
+        """Test process_files with several workers classifying documents at once."""
+        ar_ack_path = str(self.test_files_dir / "ar_ack.pdf")
+        create_test_ar_ack_pdf("Test ARACK", "50001234", ar_ack_path)
+        file_paths = [ar_ack_path]
+        for i in range(12):
+            invalid_path = str(self.test_files_dir / f"notice_{i}.pdf")
+            create_invalid_pdf(invalid_path)
+            file_paths.append(invalid_path)
+        for file_path in file_paths:
+            self.mock_file_manager.add_mock_file(file_path)
+
+        pipeline = self.create_pipeline_with_mocks()
+        result = pipeline.process_files(file_paths, max_workers=4)
+
+        # A classifier call colliding with another thread's would fail its file
+        assert result.results == {file_path: True for file_path in file_paths}, "Every file should succeed"
+        assert self.mock_airtable.get_client_state("ARACK, Test")["Case ID"] == "50001234"
+
+    def _extraction_batch(self):
+        """An AR Ack, two other documents and an unreadable file, in that order."""
+        ar_ack_path = str(self.test_files_dir / "ar_ack.pdf")
+        create_test_ar_ack_pdf("Test ARACK", "50001234", ar_ack_path)
+        file_paths = [ar_ack_path]
+        for i in range(2):
+            invalid_path = str(self.test_files_dir / f"notice_{i}.pdf")
+            create_invalid_pdf(invalid_path)
+            file_paths.append(invalid_path)
+        broken_path = self.test_files_dir / "broken.pdf"
+        broken_path.write_bytes(b"%PDF-1.4 truncated")
+        file_paths.append(str(broken_path))
+        for file_path in file_paths:
+            self.mock_file_manager.add_mock_file(file_path)
+        return file_paths
+
+    def test_extraction_workers_keep_file_order(self):
+        """Test text extracted in worker processes comes back in input order."""
+        file_paths = self._extraction_batch()
+        pipeline = ProcessingPipeline(self.logger, extraction_workers=2, airtable_client=self.mock_airtable,
+                                      file_manager=self.mock_file_manager)
+
+        try:
+            extracted = list(pipeline._extract_texts(file_paths))
+        finally:
+            pipeline.shutdown()
+
+        assert extracted == [pipeline.document_processor.process_document(path) for path in file_paths]
+        assert extracted[0][0] is True, "The AR Ack should be recognized"
+        assert extracted[-1] == (False, None), "The unreadable file should have no text"
+
+    def test_extraction_pool_is_reused_until_shutdown(self):
+        """Test batches share one worker pool, started with the pipeline's log level."""
+        file_paths = self._extraction_batch()
+        pipeline = ProcessingPipeline(self.logger, extraction_workers=2, airtable_client=self.mock_airtable,
+                                      file_manager=self.mock_file_manager)
+
+        with patch("src.processing_pipeline.ProcessPoolExecutor") as pool_class:
+            pool_class.return_value.map.side_effect = lambda fn, paths: map(
+                pipeline.document_processor.process_document, paths)
+            list(pipeline._extract_texts(file_paths))
+            list(pipeline._extract_texts(file_paths[:2]))
+            pipeline.shutdown()
+
+        pool_class.assert_called_once()
+        assert pool_class.call_args.kwargs["initargs"] == (
+            logging.getLevelName(self.logger.logger.level), os.path.dirname(self.logger.log_file))
+        pool_class.return_value.shutdown.assert_called_once_with()
+        assert pipeline._extraction_pool is None
+
+    def test_batch_with_extraction_workers(self):
+        """Test process_files with text extracted in two worker processes."""
+        file_paths = self._extraction_batch()
+        pipeline = self.create_pipeline_with_mocks()
+        pipeline.extraction_workers = 2
+
+        try:
+            result = pipeline.process_files(file_paths, max_workers=2)
+        finally:
+            pipeline.shutdown()
+
+        assert set(result.results) == set(file_paths), "Every file should get a result"
+        assert result.results[file_paths[0]] is True, "The AR Ack should be processed"
+        assert result.results[file_paths[-1]] is False, "The unreadable file should fail"
+        assert self.mock_airtable.get_client_state("ARACK, Test")["Case ID"] == "50001234"
+
+    def test_extraction_falls_back_to_serial_when_workers_fail(self):
+        """Test files the worker pool did not finish are extracted in-process, in order."""
+        file_paths = self._extraction_batch()
+        pipeline = ProcessingPipeline(self.logger, extraction_workers=2, airtable_client=self.mock_airtable,
+                                      file_manager=self.mock_file_manager)
+
+        class BrokenAfterFirstResult:
+            """Stands in for a process pool whose workers die after the first file."""
+            def __init__(self, *args, **kwargs):
+                self.shut_down = False
+            def shutdown(self, wait=True):
+                self.shut_down = True
+            def map(self, fn, paths):
+                yield pipeline.document_processor.process_document(paths[0])
+                raise RuntimeError("A process in the process pool was terminated abruptly")
+
+        with patch("src.processing_pipeline.ProcessPoolExecutor", BrokenAfterFirstResult), \
+                patch.object(self.logger, "error") as log_error:
+            extracted = list(pipeline._extract_texts(file_paths))
+
+        assert extracted == [pipeline.document_processor.process_document(path) for path in file_paths]
+        assert any("extracting serially" in call.args[0] for call in log_error.call_args_list)
+        assert pipeline._extraction_pool is None, "The broken pool should not be reused"
+
+    @pytest.mark.parametrize("extraction_workers, file_count", [(1, 3), (0, 3), (2, 1)])
+    def test_extraction_without_worker_pool(self, extraction_workers, file_count):
+        """Test no process pool is started for one worker or one file."""
+        file_paths = self._extraction_batch()[:file_count]
+        pipeline = ProcessingPipeline(self.logger, extraction_workers=extraction_workers,
+                                      airtable_client=self.mock_airtable, file_manager=self.mock_file_manager)
+
+        with patch("src.processing_pipeline.ProcessPoolExecutor", side_effect=AssertionError("pool started")):
+            extracted = list(pipeline._extract_texts(file_paths))
+
+        assert extracted == [pipeline.document_processor.process_document(path) for path in file_paths]
+
+    def test_airtable_revert_removes_only_this_update(self):
+        """Test the mock's compensating update keeps edits made after the update."""
+        before = {}
+        assert self.mock_airtable.update_client_record("rec_test_001", "50001234", before_image=before)
+
+        client = self.mock_airtable.test_clients["ARACK, Test"]["fields"]
+        client["Log"] = "Called client\n" + client["Log"]
+
+        assert self.mock_airtable.revert_client_record_update("rec_test_001", "50001234", before)
+        assert client["Case ID"] == "", "Case ID should be restored"
+        assert client["Log"] == "Called client\nPrevious log entries...", "Only this update's entry should be removed"
+
 if __name__ == "__main__":
     # Run tests
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Tests for LogAnalyzer over generated audit logs and archives
+"""
+
+import gzip
+import json
+import os
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.bloom_filter import BloomFilter
+from src.log_analyzer import LogAnalyzer, LogQuery, ARCHIVE_INDEX_VERSION, SEEK_MIN_SPAN
+from src.log_rotator import LogRotator, BLOOM_SUFFIX, INDEX_SUFFIX
+
+
+def write_jsonl(path, entries):
+    """Write entries the way SWNALogger does: one JSON object per line, timestamp first."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+
+def started(timestamp, filename="doc.pdf"):
+    return {"timestamp": timestamp, "action": "processing_started", "filename": filename}
+
+
+@pytest.fixture
+def logs_dir(tmp_path):
+    (tmp_path / "archive").mkdir()
+    return str(tmp_path)
+
+
+class TestArchiveIndex:
+    """Per-day stats kept next to rotated audit logs."""
+
+    def test_last_second_of_day_is_counted(self, logs_dir):
+        archive_path = os.path.join(logs_dir, "archive", "audit_20240301_000000.jsonl.gz")
+        write_jsonl(archive_path, [
+            started("2024-02-29T00:00:00.000001"),
+            started("2024-02-29T23:59:59.999999"),
+            started("2024-03-01T00:00:00.000000"),
+        ])
+
+        analyzer = LogAnalyzer(logs_dir)
+        days = analyzer.build_archive_index(archive_path)
+
+        assert days["2024-02-29"]["total_files"] == 2
+        assert days["2024-03-01"]["total_files"] == 1
+        assert analyzer.get_processing_stats("2024-02-29")["total_files"] == 2
+
+    def test_index_from_older_version_is_rebuilt(self, logs_dir):
+        archive_path = os.path.join(logs_dir, "archive", "audit_20240301_000000.jsonl.gz")
+        write_jsonl(archive_path, [started("2024-02-29T23:59:59.5")])
+        with open(archive_path + INDEX_SUFFIX, "w", encoding="utf-8") as f:
+            json.dump({"version": ARCHIVE_INDEX_VERSION - 1, "days": {}}, f)
+
+        assert LogAnalyzer(logs_dir).get_processing_stats("2024-02-29")["total_files"] == 1
+        with open(archive_path + INDEX_SUFFIX, encoding="utf-8") as f:
+            assert json.load(f)["version"] == ARCHIVE_INDEX_VERSION
+
+
+def processed(timestamp, case_id):
+    return {"timestamp": timestamp, "action_type": "file_processed", "status": "SUCCESS", "case_id": case_id}
+
+
+def write_archive(logs_dir, name, entries, bloom_case_ids=None):
+    """Write an archived audit log, with a Bloom sidecar over bloom_case_ids if given."""
+    archive_path = os.path.join(logs_dir, "archive", name)
+    write_jsonl(archive_path, entries)
+    if bloom_case_ids is not None:
+        bloom = BloomFilter(capacity=len(bloom_case_ids))
+        for case_id in bloom_case_ids:
+            bloom.add(case_id)
+        bloom.save(archive_path + BLOOM_SUFFIX)
+    return archive_path
+
+
+class TestArchiveCaseLookup:
+    """find_case_activity(include_archives=True) and the Bloom filter sidecars."""
+
+    def test_rotation_writes_sidecar_with_case_ids(self, logs_dir):
+        write_jsonl(os.path.join(logs_dir, "audit.jsonl"),
+                    [processed("2024-03-01T10:00:00", "50001234"), processed("2024-03-01T11:00:00", "50005678")])
+
+        assert LogRotator(logs_dir).rotate_file(os.path.join(logs_dir, "audit.jsonl"), "audit")
+
+        archive_path, = LogAnalyzer(logs_dir)._get_audit_archives()
+        bloom = BloomFilter.load(archive_path + BLOOM_SUFFIX)
+        assert "50001234" in bloom and "50005678" in bloom
+        assert "59999999" not in bloom
+
+    def test_archive_ruled_out_by_sidecar_is_skipped(self, logs_dir):
+        # The second archive does hold the case, but its sidecar says otherwise:
+        # finding no entries from it shows the archive was never opened
+        write_archive(logs_dir, "audit_20240301_000000.jsonl.gz",
+                      [processed("2024-02-29T10:00:00", "50001234")], bloom_case_ids=["50001234"])
+        write_archive(logs_dir, "audit_20240302_000000.jsonl.gz",
+                      [processed("2024-03-01T10:00:00", "50001234")], bloom_case_ids=["50005678"])
+        write_jsonl(os.path.join(logs_dir, "audit.jsonl"), [processed("2024-03-02T10:00:00", "50001234")])
+
+        activity = LogAnalyzer(logs_dir).find_case_activity("50001234", include_archives=True)
+
+        assert [entry["timestamp"] for entry in activity] == ["2024-02-29T10:00:00", "2024-03-02T10:00:00"]
+
+    def test_archive_without_usable_sidecar_is_searched(self, logs_dir):
+        write_archive(logs_dir, "audit_20240301_000000.jsonl.gz", [processed("2024-02-29T10:00:00", "50001234")])
+        corrupt_path = write_archive(logs_dir, "audit_20240302_000000.jsonl.gz",
+                                     [processed("2024-03-01T10:00:00", "50001234")])
+        with open(corrupt_path + BLOOM_SUFFIX, "wb") as f:
+            f.write(b"SWBF")
+
+        activity = LogAnalyzer(logs_dir).find_case_activity("50001234", include_archives=True)
+
+        assert [entry["timestamp"] for entry in activity] == ["2024-02-29T10:00:00", "2024-03-01T10:00:00"]
+
+
+LOG_START = datetime(2024, 1, 1)
+LOG_LINES = 25000
+LOG_STEP = timedelta(seconds=13, microseconds=250)
+
+
+@pytest.fixture(scope="module")
+def large_log(tmp_path_factory):
+    """
+    A multi-MB live audit log in timestamp order, with garbage lines scattered
+    through it and, in the middle, a run of them several SEEK_MIN_SPANs long.
+    Returns (logs_dir, entries written).
+    """
+    logs_dir = tmp_path_factory.mktemp("large_log")
+    entries = []
+    rng = random.Random(7)
+    garbage_run_at = LOG_LINES // 2
+    with open(logs_dir / "audit.jsonl", "w", encoding="utf-8") as f:
+        for i in range(LOG_LINES):
+            if i % 997 == 0:
+                f.write("this is not json {\n")
+            if i == garbage_run_at:
+                # Wide enough that binary search probes land inside it
+                f.write('{"timestamp": "truncated\n' * (4 * SEEK_MIN_SPAN // 25))
+            entry = {"timestamp": (LOG_START + i * LOG_STEP).isoformat(),
+                     "action": "processing_started", "seq": i,
+                     "filename": f"scan_{rng.randrange(10 ** 8):08d}.pdf", "padding": "x" * rng.randrange(60, 140)}
+            entries.append(entry)
+            f.write(json.dumps(entry) + "\n")
+    assert os.path.getsize(logs_dir / "audit.jsonl") > 40 * SEEK_MIN_SPAN
+    return str(logs_dir), entries
+
+
+def linear_window(entries, start_date, end_date):
+    return [entry["seq"] for entry in entries
+            if (start_date is None or entry["timestamp"] >= start_date)
+            and (end_date is None or entry["timestamp"] <= end_date)]
+
+
+class TestTimeWindowQueries:
+    """query_audit_logs seeks by binary search; results must match a linear scan."""
+
+    def test_windows_match_linear_filter(self, large_log):
+        logs_dir, entries = large_log
+        first, last = entries[0]["timestamp"], entries[-1]["timestamp"]
+        middle = entries[LOG_LINES // 2]["timestamp"]
+        windows = [
+            (None, None),
+            (first, last),
+            (first, first),  # first entry only
+            (last, last),  # last entry only
+            (None, first),
+            (last, None),
+            ("2023-12-01T00:00:00", "2023-12-31T00:00:00"),  # before the log
+            ("2025-01-01T00:00:00", None),  # after the log
+            (entries[LOG_LINES // 2 - 5]["timestamp"], middle),  # ends at the garbage run
+            (middle, entries[LOG_LINES // 2 + 5]["timestamp"]),  # starts right after it
+            (entries[997]["timestamp"], entries[997 * 3]["timestamp"]),  # garbage at both edges
+            ((LOG_START + LOG_STEP / 2).isoformat(), (LOG_START + LOG_STEP * 3 / 4).isoformat()),  # between entries
+        ]
+        rng = random.Random(11)
+        for _ in range(20):
+            a, b = sorted(rng.randrange(LOG_LINES) for _ in range(2))
+            windows.append((entries[a]["timestamp"], entries[b]["timestamp"]))
+
+        analyzer = LogAnalyzer(logs_dir)
+        for start_date, end_date in windows:
+            found = analyzer.query_audit_logs(LogQuery(start_date=start_date, end_date=end_date))
+            assert [entry["seq"] for entry in found] == linear_window(entries, start_date, end_date), \
+                (start_date, end_date)
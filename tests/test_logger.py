@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for SWNALogger structured (JSONL) logging
+"""
+
+import glob
+import gzip
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from src.log_rotator import LogRotator
+from src.logger import SWNALogger
+
+
+def read_entries(logs_dir):
+    """Every structured entry in the live audit log and its archives."""
+    entries = []
+    for archive_path in glob.glob(os.path.join(logs_dir, "archive", "audit_*.jsonl.gz")):
+        with gzip.open(archive_path, "rt", encoding="utf-8") as f:
+            entries.extend(json.loads(line) for line in f if line.strip())
+    with open(os.path.join(logs_dir, "audit.jsonl"), encoding="utf-8") as f:
+        entries.extend(json.loads(line) for line in f if line.strip())
+    return entries
+
+
+def test_rotation_while_logging_keeps_every_line(tmp_path):
+    logs_dir = str(tmp_path)
+    logger = SWNALogger()
+    logger.audit_log_file = os.path.join(logs_dir, "audit.jsonl")
+    rotator = LogRotator(logs_dir)
+
+    stop = threading.Event()
+    logged = []
+
+    def log_entries():
+        while not stop.is_set():
+            filename = f"scan_{len(logged):06d}.pdf"
+            logger.log_file_processing_start(filename, f"/scans/{filename}")
+            logged.append(filename)
+
+    writer = threading.Thread(target=log_entries)
+    writer.start()
+    try:
+        # Archive names have one-second resolution, so rotations are a second apart
+        rotated = []
+        for _ in range(2):
+            time.sleep(0.5)
+            rotated.append(rotator.rotate_file(logger.audit_log_file, "audit"))
+            time.sleep(0.6)
+    finally:
+        stop.set()
+        writer.join()
+    logger.flush()
+
+    filenames = [entry["filename"] for entry in read_entries(logs_dir)]
+    assert rotated == [True, True]
+    assert len(logged) > 1000
+    assert len(filenames) == len(logged), "no line lost or duplicated"
+    assert sorted(filenames) == logged
+
+
+def test_write_failure_at_exit_reaches_text_log(tmp_path):
+    # The last structured write fails only at interpreter exit; its error must
+    # still be handed to the text log before the listener stops
+    script = (
+        "import os\n"
+        "from src.logger import SWNALogger\n"
+        "logger = SWNALogger()\n"
+        "logger.audit_log_file = os.path.join(os.environ['SWNA_LOGS_DIR'], 'missing', 'audit.jsonl')\n"
+        "logger.log_file_processing_start('scan.pdf', '/scans/scan.pdf')\n"
+    )
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, SWNA_LOGS_DIR=str(tmp_path), PYTHONPATH=repo_root)
+
+    subprocess.run([sys.executable, "-c", script], env=env, cwd=repo_root, check=True, capture_output=True)
+
+    with open(tmp_path / "swna_automation.log", encoding="utf-8") as f:
+        assert "Failed to write structured log" in f.read()
@@ -3,45 +3,14 @@
 Test PDF generator for integration tests
 """
 
+import io
 import os
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from config.settings import AR_ACK_SIGNATURE
 
-def create_test_ar_ack_pdf(client_name, case_id, output_path):
-    """
-    Create a test AR Ack PDF with specific client name and case ID.
-    
-    Args:
-        client_name (str): Client name (e.g., "Test ARACK")
-        case_id (str): Case ID (e.g., "50001234")
-        output_path (str): Full path where PDF should be saved
-    
-    Returns:
-        str: Path to created PDF file
-    """
-    # Create directory if it doesn't exist
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    
-    # Create PDF
-    c = canvas.Canvas(output_path, pagesize=letter)
-    width, height = letter
-    
-    # Add AR Ack content
-    y_position = height - 100
-    
-    # Case ID Number
-    c.drawString(100, y_position, f"Case ID Number: {case_id}")
-    y_position -= 30
-    
-    # Employee Name
-    c.drawString(100, y_position, f"Employee Name: {client_name}")
-    y_position -= 50
-    
-    # AR Ack signature text (use the actual signature from settings)
-    signature_text = AR_ACK_SIGNATURE
-    
-    # Wrap text to fit on page
+def _wrap_signature(signature_text):
+    """Split the AR Ack signature into lines shorter than 80 characters."""
     lines = []
     words = signature_text.split()
     current_line = ""
@@ -54,30 +23,97 @@ def create_test_ar_ack_pdf(client_name, case_id, output_path):
             current_line = word
     if current_line:
         lines.append(current_line)
-    
-    # Draw wrapped text
-    for line in lines:
+    return lines
+
+# AR Ack signature text (the actual signature from settings), wrapped to fit on the page
+_SIGNATURE_LINES = _wrap_signature(AR_ACK_SIGNATURE)
+
+def _draw_signature(c, y_position):
+    """Draw the wrapped AR Ack signature from y_position down; returns the y below it."""
+    for line in _SIGNATURE_LINES:
         c.drawString(100, y_position, line)
         y_position -= 20
-    
-    c.save()
+    return y_position
+
+# Letter heading: the classifier needs an acknowledgment phrase plus an exposure/asbestos
+# mention to type a document as an AR Ack, as real DOL letters carry
+_HEADING_LINES = (
+    "Acknowledgment of Authorized Representative",
+    "Re: Claim for occupational asbestos exposure",
+)
+
+def _draw_heading(c, y_position):
+    """Draw the AR Ack letter heading from y_position down; returns the y below it."""
+    for line in _HEADING_LINES:
+        c.drawString(100, y_position, line)
+        y_position -= 20
+    return y_position - 20
+
+# Rendered PDF bytes by generator arguments; tests reuse them instead of re-running ReportLab
+_pdf_cache = {}
+
+def _write_pdf(output_path, cache_key, draw):
+    """Write the PDF drawn by draw(canvas, width, height), rendering it only on first use."""
+    pdf_bytes = _pdf_cache.get(cache_key)
+    if pdf_bytes is None:
+        buffer = io.BytesIO()
+        c = canvas.Canvas(buffer, pagesize=letter)
+        width, height = letter
+        draw(c, width, height)
+        c.save()
+        pdf_bytes = _pdf_cache[cache_key] = buffer.getvalue()
+    
+    try:
+        f = open(output_path, 'wb')
+    except FileNotFoundError:
+        # Tests write into tmp_path, which exists; create the directory only when it does not
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        f = open(output_path, 'wb')
+    with f:
+        f.write(pdf_bytes)
     return output_path
 
+def create_test_ar_ack_pdf(client_name, case_id, output_path):
+    """
+    Create a test AR Ack PDF with specific client name and case ID.
+    
+    Args:
+        client_name (str): Client name (e.g., "Test ARACK")
+        case_id (str): Case ID (e.g., "50001234")
+        output_path (str): Full path where PDF should be saved
+    
+    Returns:
+        str: Path to created PDF file
+    """
+    def draw(c, width, height):
+        # Add AR Ack content
+        y_position = _draw_heading(c, height - 100)
+        
+        # Case ID Number
+        c.drawString(100, y_position, f"Case ID Number: {case_id}")
+        y_position -= 30
+        
+        # Employee Name
+        c.drawString(100, y_position, f"Employee Name: {client_name}")
+        y_position -= 50
+        
+        # Draw wrapped AR Ack signature
+        _draw_signature(c, y_position)
+    
+    return _write_pdf(output_path, ("ar_ack", client_name, case_id), draw)
+
 def create_invalid_pdf(output_path):
     """
     Create an invalid PDF (not AR Ack) for negative testing.
     """
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    
-    c = canvas.Canvas(output_path, pagesize=letter)
-    width, height = letter
-    
-    y_position = height - 100
-    c.drawString(100, y_position, "This is not an AR Ack document")
-    c.drawString(100, y_position - 30, "It should be ignored by the system")
-    
-    c.save()
-    return output_path
+    def draw(c, width, height):
+        y_position = height - 100
+        c.drawString(100, y_position, "This is not an AR Ack document")
+        c.drawString(100, y_position - 30, "It should be ignored by the system")
+        # Long enough for the embedded text layer to be used (no OCR needed)
+        c.drawString(100, y_position - 60, "It is a general notice with no case details, client names or signatures")
+    
+    return _write_pdf(output_path, ("invalid",), draw)
 
 def create_malformed_ar_ack_pdf(output_path, missing_field="case_id"):
     """
@@ -87,46 +123,24 @@ def create_malformed_ar_ack_pdf(output_path, missing_field="case_id"):
         output_path (str): Path to save PDF
         missing_field (str): Which field to omit ("case_id" or "client_name")
     """
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    
-    c = canvas.Canvas(output_path, pagesize=letter)
-    width, height = letter
-    
-    y_position = height - 100
-    
-    # Add AR Ack signature to make it detectable
-    signature_text = AR_ACK_SIGNATURE
-    lines = []
-    words = signature_text.split()
-    current_line = ""
-    
-    for word in words:
-        if len(current_line + " " + word) < 80:
-            current_line += " " + word if current_line else word
-        else:
-            lines.append(current_line)
-            current_line = word
-    if current_line:
-        lines.append(current_line)
-    
-    # Draw AR Ack signature
-    for line in lines:
-        c.drawString(100, y_position, line)
-        y_position -= 20
-    
-    y_position -= 50
-    
-    # Add fields based on what should be missing
-    if missing_field != "case_id":
-        c.drawString(100, y_position, "Case ID Number: 50001234")
-        y_position -= 30
-    
-    if missing_field != "client_name":
-        c.drawString(100, y_position, "Employee Name: Test Client")
-        y_position -= 30
-    
-    c.save()
-    return output_path
+    def draw(c, width, height):
+        y_position = _draw_heading(c, height - 100)
+        
+        # Draw AR Ack signature to make it detectable
+        y_position = _draw_signature(c, y_position)
+        
+        y_position -= 50
+        
+        # Add fields based on what should be missing
+        if missing_field != "case_id":
+            c.drawString(100, y_position, "Case ID Number: 50001234")
+            y_position -= 30
+        
+        if missing_field != "client_name":
+            c.drawString(100, y_position, "Employee Name: Test Client")
+            y_position -= 30
+    
+    return _write_pdf(output_path, ("malformed", missing_field), draw)
 
 if __name__ == "__main__":
     # Test the generator
@@ -23,21 +23,26 @@ def run_tests():
         print("ERROR: pytest not installed. Install with: pip install pytest")
         return 1
     
-    # Check if reportlab is available (needed for PDF generation)
-    try:
-        import reportlab
-    except ImportError:
-        print("ERROR: reportlab not installed. Install with: pip install reportlab")
-        return 1
-    
     # Run tests
     test_args = [
         "tests/test_integration.py",
         "-v",
         "--tb=short",
-        "-x",  # Stop on first failure
+        "--maxfail=3",  # Stop after a few failures; with -n auto, -x would cut other workers short
+        "--ff",  # Run tests that failed last time first, so --maxfail stops on them sooner
+        "-ra",  # Summarize every non-passing test at the end
+        "--durations=10",  # Show the slowest tests
     ]
     
+    # Spread the tests over all CPUs when pytest-xdist is installed; each test
+    # builds its own mocks and temp files, so they are independent
+    try:
+        import xdist
+    except ImportError:
+        xdist = None
+    if xdist is not None and (os.cpu_count() or 1) > 1:
+        test_args += ["-n", "auto"]
+    
     result = pytest.main(test_args)
     
     print("\n" + "=" * 80)